@@ -1,21 +1,35 @@
 
+import math
+
 import pandas as pd
 import numpy as np
-from scipy import stats
 from scipy.optimize import minimize_scalar
 from sklearn.mixture import GaussianMixture
 
-# Load temperature data
-chwst = pd.read_csv("BarTech_160_Ann_St_Level_22_MSSB_Chiller_2_CHWST_Leaving_Chilled_Water_Temperature_Sensor.csv")
-chwrt = pd.read_csv("BarTech_160_Ann_St_Level_22_MSSB_Chiller_2_CHWRT_Entering_Chilled_Water_Temperature_Sensor.csv")
 
-chwst['timestamp'] = pd.to_datetime(chwst['save_time'], unit='s')
-chwrt['timestamp'] = pd.to_datetime(chwrt['save_time'], unit='s')
+def sorted_percentiles(a_sorted, q):
+    """Linear-interpolated percentiles read straight off an already sorted array"""
+    pos = np.asarray(q) / 100 * (len(a_sorted) - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, len(a_sorted) - 1)
+    return a_sorted[lo] + (a_sorted[hi] - a_sorted[lo]) * (pos - lo)
+
+
+# Load temperature data (only the two columns we use, with fixed dtypes so the
+# parser skips type inference). Values stay float64: the 0.01°C readings
+# differenced in float32 land on the other side of the 0.01-step bin edges
+# and shift the Method 1/3/5 results
+csv_opts = dict(usecols=['save_time', 'value'], dtype={'save_time': 'int64', 'value': 'float64'}, engine='c')
+chwst = pd.read_csv("BarTech_160_Ann_St_Level_22_MSSB_Chiller_2_CHWST_Leaving_Chilled_Water_Temperature_Sensor.csv", **csv_opts)
+chwrt = pd.read_csv("BarTech_160_Ann_St_Level_22_MSSB_Chiller_2_CHWRT_Entering_Chilled_Water_Temperature_Sensor.csv", **csv_opts)
+
+# Keep the raw Unix seconds: every statistic below works on save_time directly,
+# so no datetime64 column is materialized
 chwst.rename(columns={'value': 'CHWST'}, inplace=True)
 chwrt.rename(columns={'value': 'CHWRT'}, inplace=True)
 
-merged = pd.merge(chwst[['timestamp', 'CHWST']], chwrt[['timestamp', 'CHWRT']], on='timestamp', how='outer')
-merged = merged.sort_values('timestamp').reset_index(drop=True)
+merged = pd.merge(chwst[['save_time', 'CHWST']], chwrt[['save_time', 'CHWRT']], on='save_time', how='outer')
+merged = merged.sort_values('save_time').reset_index(drop=True)
 paired = merged.dropna().copy()
 
 print("=== METHODS TO DEFINE LOAD THRESHOLDS PER EQUIPMENT TYPE ===\n")
@@ -26,13 +40,18 @@ paired['Delta_T'] = paired['CHWRT'] - paired['CHWST']
 paired['abs_Delta_T'] = abs(paired['Delta_T'])
 paired['physics_valid'] = paired['Delta_T'] >= 0
 
+# Sort abs_Delta_T once; Methods 1, 3 and 5 read their percentiles off this
+# (Method 5 subsets stay sorted when masked through the same ordering)
+abs_dt_order = np.argsort(paired['abs_Delta_T'].to_numpy(), kind='stable')
+abs_dt_sorted = paired['abs_Delta_T'].to_numpy()[abs_dt_order]
+
 print("METHOD 1: DATA-DRIVEN THRESHOLD USING PHYSICS VIOLATION RATE")
 print("=" * 70)
 print("\nPrinciple: Find threshold where physics violations drop dramatically\n")
 
 # Create bins of Delta_T and calculate violation rates
 # Since we don't have actual load, we'll use abs_Delta_T as proxy
-bins = np.percentile(paired['abs_Delta_T'], np.linspace(0, 100, 21))
+bins = sorted_percentiles(abs_dt_sorted, np.linspace(0, 100, 21))
 paired['delta_bin'] = pd.cut(paired['abs_Delta_T'], bins=bins, include_lowest=True)
 
 violation_by_bin = paired.groupby('delta_bin', observed=True).agg({
@@ -67,8 +86,12 @@ print("\nPrinciple: Find the valley between two operational modes\n")
 # Fit Gaussian Mixture Model to identify modes
 valid_deltas = paired[paired['abs_Delta_T'] > 0]['abs_Delta_T'].values.reshape(-1, 1)
 
-# Try 2-component mixture
-gmm = GaussianMixture(n_components=2, random_state=42)
+# Try 2-component mixture. 1-D bimodal data converges in a few EM steps, so the
+# tolerance is matched to the 0.01°C threshold precision; k-means++ seeding
+# cuts iterations and the larger reg_covar keeps a near-zero-variance standby
+# mode from stalling EM
+gmm = GaussianMixture(n_components=2, random_state=42, tol=1e-2, max_iter=50,
+                      n_init=1, init_params='k-means++', reg_covar=1e-4)
 gmm.fit(valid_deltas)
 
 means = gmm.means_.flatten()
@@ -81,17 +104,26 @@ print(f"  Mode 2 (High): mean={means[1]:.2f}°C, std={stds[1]:.2f}°C, weight={w
 
 # Threshold at intersection of two gaussians or at valley
 # Valley is approximately at the point where the two distributions have equal probability
+# Inline Gaussian with precomputed constants: the optimizer calls this with a
+# scalar, where math.exp beats a scipy.stats dispatch by an order of magnitude
+mu0, mu1 = float(means[0]), float(means[1])
+inv0, inv1 = 1.0 / float(stds[0]), 1.0 / float(stds[1])
+c0 = float(weights[0]) * inv0 / math.sqrt(2 * math.pi)
+c1 = float(weights[1]) * inv1 / math.sqrt(2 * math.pi)
+
+
 def mixture_pdf(x):
     """Negative mixture PDF for minimization"""
-    pdf = 0
-    for i in range(2):
-        pdf += weights[i] * stats.norm.pdf(x, means[i], stds[i])
-    return -pdf
+    z0 = (x - mu0) * inv0
+    z1 = (x - mu1) * inv1
+    return -(c0 * math.exp(-0.5 * z0 * z0) + c1 * math.exp(-0.5 * z1 * z1))
 
 # Find minimum between the two means
 lower_bound = min(means)
 upper_bound = max(means)
-result = minimize_scalar(mixture_pdf, bounds=(lower_bound, upper_bound), method='bounded')
+# 0.01°C is all the threshold semantics need; the default xatol=1e-5 triples the iterations
+result = minimize_scalar(mixture_pdf, bounds=(lower_bound, upper_bound), method='bounded',
+                         options={'xatol': 1e-2, 'maxiter': 30})
 valley_threshold = result.x
 
 print(f"\n✓ VALLEY THRESHOLD: {valley_threshold:.2f}°C")
@@ -107,38 +139,54 @@ print("=" * 70)
 print("\nPrinciple: Maximize separation of valid vs invalid data\n")
 
 # For each potential threshold, calculate quality metrics
-thresholds_test = np.percentile(paired['abs_Delta_T'], np.linspace(5, 95, 19))
+thresholds_test = sorted_percentiles(abs_dt_sorted, np.linspace(5, 95, 19))
+
+# Delta_T in abs_Delta_T order: every split is then a prefix/suffix, so the
+# per-threshold stats come from cumulative sums
+dt_by_abs = paired['Delta_T'].to_numpy()[abs_dt_order]
+n_total = len(dt_by_abs)
+cum_neg = np.concatenate(([0], np.cumsum(dt_by_abs < 0)))
+cum_dt = np.concatenate(([0.0], np.cumsum(dt_by_abs)))
+cum_dt2 = np.concatenate(([0.0], np.cumsum(dt_by_abs * dt_by_abs)))
+
+
+def split_std(s1, s2, n):
+    """Sample std (ddof=1) from a count, sum and sum of squares"""
+    return math.sqrt(max(s2 - s1 * s1 / n, 0.0) / (n - 1))
+
 
 results = []
 for thresh in thresholds_test:
-    below = paired[paired['abs_Delta_T'] <= thresh]
-    above = paired[paired['abs_Delta_T'] > thresh]
-    
-    if len(below) > 10 and len(above) > 10:
-        # Calculate separation metrics
-        violation_below = (below['Delta_T'] < 0).mean()
-        violation_above = (above['Delta_T'] < 0).mean()
-        violation_diff = violation_below - violation_above
-        
-        # Calculate information gain (difference in standard deviation)
-        std_below = below['Delta_T'].std()
-        std_above = above['Delta_T'].std()
-        std_ratio = std_above / std_below if std_below > 0 else 0
-        
-        # Calculate sample balance (avoid extreme splits)
-        split_ratio = min(len(below), len(above)) / max(len(below), len(above))
-        
-        # Combined score: maximize violation separation and std ratio, prefer balanced splits
-        score = violation_diff * std_ratio * (0.5 + 0.5 * split_ratio)
-        
-        results.append({
-            'threshold': thresh,
-            'violation_diff': violation_diff,
-            'std_ratio': std_ratio,
-            'split_ratio': split_ratio,
-            'score': score,
-            'pct_below': len(below) / len(paired) * 100
-        })
+    # Count the split first; degenerate thresholds cost one binary search
+    n_below = int(np.searchsorted(abs_dt_sorted, thresh, side='right'))
+    n_above = n_total - n_below
+    if n_below <= 10 or n_above <= 10:
+        continue
+
+    # Calculate separation metrics
+    violation_below = cum_neg[n_below] / n_below
+    violation_above = (cum_neg[-1] - cum_neg[n_below]) / n_above
+    violation_diff = violation_below - violation_above
+
+    # Calculate information gain (difference in standard deviation)
+    std_below = split_std(cum_dt[n_below], cum_dt2[n_below], n_below)
+    std_above = split_std(cum_dt[-1] - cum_dt[n_below], cum_dt2[-1] - cum_dt2[n_below], n_above)
+    std_ratio = std_above / std_below if std_below > 0 else 0
+
+    # Calculate sample balance (avoid extreme splits)
+    split_ratio = min(n_below, n_above) / max(n_below, n_above)
+
+    # Combined score: maximize violation separation and std ratio, prefer balanced splits
+    score = violation_diff * std_ratio * (0.5 + 0.5 * split_ratio)
+
+    results.append({
+        'threshold': thresh,
+        'violation_diff': violation_diff,
+        'std_ratio': std_ratio,
+        'split_ratio': split_ratio,
+        'score': score,
+        'pct_below': n_below / n_total * 100
+    })
 
 results_df = pd.DataFrame(results)
 best_idx = results_df['score'].idxmax()
@@ -217,28 +265,30 @@ window = 20
 paired['rolling_mean_dt'] = paired['abs_Delta_T'].rolling(window, center=True).mean()
 paired['rolling_std_dt'] = paired['abs_Delta_T'].rolling(window, center=True).std()
 
-# Identify stable low-load periods (candidates for threshold)
-stable_low = paired[
-    (paired['rolling_std_dt'] < 0.3) &  # Stable
-    (paired['rolling_mean_dt'] < 1.0)    # Low
-]
-
-stable_high = paired[
-    (paired['rolling_std_dt'] > 0.5) &  # Variable
-    (paired['rolling_mean_dt'] > 1.0)   # High
-]
-
-if len(stable_low) > 0 and len(stable_high) > 0:
-    print(f"Stable Low Load Region: {len(stable_low)} samples")
-    print(f"  Mean Delta_T: {stable_low['abs_Delta_T'].mean():.2f}°C")
-    print(f"  95th percentile: {stable_low['abs_Delta_T'].quantile(0.95):.2f}°C")
+# Identify stable low/high-load periods (candidates for threshold) with plain
+# boolean masks on the ndarrays, without slicing out sub-DataFrames
+abs_dt_arr = paired['abs_Delta_T'].to_numpy()
+rolling_mean = paired['rolling_mean_dt'].to_numpy()
+rolling_std = paired['rolling_std_dt'].to_numpy()
+
+low_mask = (rolling_std < 0.3) & (rolling_mean < 1.0)    # Stable & low
+high_mask = (rolling_std > 0.5) & (rolling_mean > 1.0)   # Variable & high
+abs_dt_low = abs_dt_arr[low_mask]
+abs_dt_high = abs_dt_arr[high_mask]
+
+if len(abs_dt_low) > 0 and len(abs_dt_high) > 0:
+    low_q95 = sorted_percentiles(abs_dt_sorted[low_mask[abs_dt_order]], 95)
+
+    print(f"Stable Low Load Region: {len(abs_dt_low)} samples")
+    print(f"  Mean Delta_T: {abs_dt_low.mean():.2f}°C")
+    print(f"  95th percentile: {low_q95:.2f}°C")
     
-    print(f"\nStable High Load Region: {len(stable_high)} samples")
-    print(f"  Mean Delta_T: {stable_high['abs_Delta_T'].mean():.2f}°C")
-    print(f"  5th percentile: {stable_high['abs_Delta_T'].quantile(0.05):.2f}°C")
+    print(f"\nStable High Load Region: {len(abs_dt_high)} samples")
+    print(f"  Mean Delta_T: {abs_dt_high.mean():.2f}°C")
+    print(f"  5th percentile: {sorted_percentiles(abs_dt_sorted[high_mask[abs_dt_order]], 5):.2f}°C")
     
     # Threshold as 95th percentile of low + 5% buffer
-    empirical_threshold = stable_low['abs_Delta_T'].quantile(0.95) * 1.05
+    empirical_threshold = low_q95 * 1.05
     
     print(f"\n✓ EMPIRICAL THRESHOLD: {empirical_threshold:.2f}°C")
     print(f"  Based on observed operational patterns")
@@ -266,12 +316,34 @@ print("=" * 70)
 print("\nPrinciple: Threshold may vary by time, season, or building load\n")
 
 # Group by hour to see if threshold should be time-dependent
-paired['hour'] = paired['timestamp'].dt.hour
-hourly_stats = paired.groupby('hour').agg({
-    'abs_Delta_T': ['mean', 'std', 'median'],
-    'physics_valid': 'mean'
-})
-hourly_stats.columns = ['mean_dt', 'std_dt', 'median_dt', 'validity_rate']
+# 24 known integer buckets: aggregate with np.bincount instead of a hashed groupby
+# Hour-of-day (UTC) straight from Unix seconds, no .dt accessor
+paired['hour'] = ((paired['save_time'].to_numpy().astype(np.int64) // 3600) % 24).astype(np.int8)
+h = paired['hour'].to_numpy()
+abs_dt = paired['abs_Delta_T'].to_numpy(dtype=np.float64)
+valid = paired['physics_valid'].to_numpy().astype(np.float64)
+
+n = np.bincount(h, minlength=24)
+s = np.bincount(h, weights=abs_dt, minlength=24)
+s2 = np.bincount(h, weights=abs_dt * abs_dt, minlength=24)
+v = np.bincount(h, weights=valid, minlength=24)
+
+present = n > 0
+n, s, s2, v = n[present], s[present], s2[present], v[present]
+mean_dt = s / n
+with np.errstate(invalid='ignore', divide='ignore'):
+    std_dt = np.sqrt(np.maximum(s2 - s * mean_dt, 0.0) / (n - 1))  # ddof=1, as pandas
+
+# Median needs the values themselves: one stable sort by hour, then split per bucket
+by_hour = abs_dt[np.argsort(h, kind='stable')]
+median_dt = [np.median(g) for g in np.split(by_hour, np.cumsum(n)[:-1])]
+
+hourly_stats = pd.DataFrame({
+    'mean_dt': mean_dt,
+    'std_dt': std_dt,
+    'median_dt': median_dt,
+    'validity_rate': v / n,
+}, index=pd.Index(np.flatnonzero(present), name='hour'))
 
 print("Hourly Statistics (sample):")
 print(hourly_stats.head(10).round(3))
@@ -2,8 +2,14 @@
 # Create a comprehensive index of all HTDAM v2.0 Stage 1 & 2 deliverables
 
 import json
+import sys
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
 deliverables = {
     "generated_date": "2025-12-07",
     "stage": "Stage 1 & 2",
@@ -224,7 +230,16 @@ deliverables = {
 }
 
 # Output as formatted JSON
-print(json.dumps(deliverables, indent=2))
+if orjson is not None:
+    deliverables_json = orjson.dumps(deliverables, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    if hasattr(sys.stdout, "buffer"):
+        # orjson serializes straight to UTF-8 bytes; flush pending text first to keep ordering
+        sys.stdout.flush()
+        sys.stdout.buffer.write(deliverables_json)
+    else:  # Text-only stdout (e.g. redirect_stdout(io.StringIO()))
+        sys.stdout.write(deliverables_json.decode())
+else:
+    print(json.dumps(deliverables, indent=2))
 
 print("\n" + "="*90)
 print("HTDAM v2.0 STAGE 1 & 2 COMPLETE DELIVERABLES INDEX")
@@ -111,84 +111,65 @@ if __name__ == "__main__":
 
 ```python
 def align_stream_to_grid(
-    timestamps_raw: List[datetime],
-    values_raw: List[float],
-    grid: List[datetime],
+    timestamps_raw,
+    values_raw,
+    grid,
     tolerance_s: int,
     exact_threshold: int = ALIGN_EXACT_THRESHOLD,
     close_threshold: int = ALIGN_CLOSE_THRESHOLD,
     interp_threshold: int = ALIGN_INTERP_THRESHOLD
-) -> Tuple[List[float], List[str], List[float]]:
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Align a single stream to master grid using nearest-neighbor (O(N+M)).
+    Align a single stream to master grid using nearest-neighbor (O(M log N)).
     
     Args:
-        timestamps_raw: list of raw datetimes (strictly increasing)
-        values_raw: list of raw values
+        timestamps_raw: raw datetimes (strictly increasing); list, Series or ndarray
+        values_raw: raw values
         grid: master time grid
         tolerance_s: max allowed distance in seconds
         exact_threshold, close_threshold, interp_threshold: quality thresholds
     
     Returns:
         (values_grid, align_quality, align_distance_s)
-        - values_grid: list[float or nan]
-        - align_quality: list[str] in {EXACT, CLOSE, INTERP, MISSING}
-        - align_distance_s: list[float or None]
+        - values_grid: float64 ndarray (nan if missing)
+        - align_quality: ndarray of str in {EXACT, CLOSE, INTERP, MISSING}
+        - align_distance_s: float64 ndarray (nan if missing)
     """
     N = len(timestamps_raw)
     M = len(grid)
     
-    values_grid = [float('nan')] * M
-    align_quality = ['MISSING'] * M
-    align_distance_s = [None] * M
-    
-    j = 0  # pointer into timestamps_raw
-    
-    for k in range(M):
-        g = grid[k]
-        
-        # Advance j until timestamps_raw[j] >= g
-        while j < N and timestamps_raw[j] < g:
-            j += 1
-        
-        # Candidates: j-1 (left), j (right)
-        candidates = []
-        if j - 1 >= 0:
-            candidates.append(j - 1)
-        if j < N:
-            candidates.append(j)
-        
-        if not candidates:
-            continue  # remains MISSING
-        
-        # Find nearest
-        best_idx = None
-        best_dt_s = None
-        
-        for idx in candidates:
-            dt = abs((timestamps_raw[idx] - g).total_seconds())
-            if best_dt_s is None or dt < best_dt_s:
-                best_dt_s = dt
-                best_idx = idx
-        
-        # Check tolerance
-        if best_dt_s is None or best_dt_s > tolerance_s:
-            continue  # remains MISSING
-        
-        # Assign value and quality
-        values_grid[k] = values_raw[best_idx]
-        align_distance_s[k] = best_dt_s
-        
-        # Classify quality
-        if best_dt_s < exact_threshold:
-            align_quality[k] = 'EXACT'
-        elif best_dt_s < close_threshold:
-            align_quality[k] = 'CLOSE'
-        elif best_dt_s <= interp_threshold:
-            align_quality[k] = 'INTERP'
-        else:
-            # Should not happen if tolerance >= interp_threshold
-            align_quality[k] = 'MISSING'
+    if N == 0 or M == 0:
+        return np.full(M, np.nan), np.full(M, 'MISSING', dtype=object), np.full(M, np.nan)
+    
+    # int64 epoch nanoseconds (asi8 is in the native unit, so normalize to ns)
+    raw_ns = pd.DatetimeIndex(timestamps_raw).as_unit('ns').asi8
+    grid_ns = pd.DatetimeIndex(grid).as_unit('ns').asi8
+    vals = np.asarray(values_raw, dtype=np.float64)
+    
+    # j = first raw point after each grid point; candidates j-1 (left), j (right)
+    j = np.searchsorted(raw_ns, grid_ns, side='right')
+    left = np.maximum(j - 1, 0)
+    right = np.minimum(j, N - 1)
+    
+    # A missing neighbor gets an infinite distance; ties go left
+    dist_left = np.where(j > 0, (grid_ns - raw_ns[left]) / 1e9, np.inf)
+    dist_right = np.where(j < N, (raw_ns[right] - grid_ns) / 1e9, np.inf)
+    best_idx = np.where(dist_left <= dist_right, left, right)
+    best_dt_s = np.minimum(dist_left, dist_right)
+    
+    # Check tolerance
+    in_tol = best_dt_s <= tolerance_s
+    values_grid = np.where(in_tol, vals[best_idx], np.nan)
+    align_distance_s = np.where(in_tol, best_dt_s, np.nan)
+    
+    # Classify quality (beyond interp_threshold should not happen if
+    # tolerance >= interp_threshold; stays MISSING)
+    align_quality = np.select(
+        [best_dt_s < exact_threshold, best_dt_s < close_threshold, best_dt_s <= interp_threshold],
+        ['EXACT', 'CLOSE', 'INTERP'],
+        default='MISSING'
+    ).astype(object)
+    align_quality[~in_tol] = 'MISSING'
     
     return values_grid, align_quality, align_distance_s
 
@@ -208,7 +189,7 @@ if __name__ == "__main__":
     
     vals, quals, dists = align_stream_to_grid(raw_ts, raw_vals, grid, SYNC_TOLERANCE_SECONDS)
     
-    print(f"Aligned {len([q for q in quals if q != 'MISSING'])} of {len(grid)} grid points")
+    print(f"Aligned {(quals != 'MISSING').sum()} of {len(grid)} grid points")
     for i, (v, q, d) in enumerate(zip(vals[:4], quals[:4], dists[:4])):
         print(f"  Grid {i}: value={v:.2f}, quality={q}, distance={d}s")
 ```
@@ -257,10 +238,12 @@ def lookup_stage2_semantic(
     if len(nearby) == 0:
         return None
     
-    # Return most common semantic near this time
-    semantics = nearby['gap_before_semantic'].value_counts()
-    if len(semantics) > 0:
-        return semantics.index[0]
+    # Return most common semantic near this time: mode by bincount over
+    # integer codes (-1 = missing semantic; ties go to the first seen)
+    codes, semantics = pd.factorize(nearby['gap_before_semantic'])
+    codes = codes[codes >= 0]
+    if len(codes) > 0:
+        return semantics[np.bincount(codes).argmax()]
     
     return None
 
@@ -367,6 +350,10 @@ def synchronize_streams(
         'timestamp': grid
     })
     
+    # Raw timestamps as one datetime index (no object array, tz kept),
+    # shared by every stream
+    raw_ts = pd.DatetimeIndex(df_stage2['timestamp'])
+    
     # Align each mandatory stream
     per_stream_metrics = {}
     
@@ -375,8 +362,7 @@ def synchronize_streams(
             print(f"Warning: Stream {stream} not in input dataframe")
             continue
         
-        raw_ts = df_stage2['timestamp'].tolist()
-        raw_vals = df_stage2[stream].tolist()
+        raw_vals = df_stage2[stream].to_numpy(dtype=np.float64)
         
         vals, quals, dists = align_stream_to_grid(
             raw_ts, raw_vals, grid, tolerance_s
@@ -387,10 +373,10 @@ def synchronize_streams(
         df_sync[f'{stream}_align_distance_s'] = dists
         
         # Metrics for this stream
-        exact_count = quals.count('EXACT')
-        close_count = quals.count('CLOSE')
-        interp_count = quals.count('INTERP')
-        missing_count = quals.count('MISSING')
+        exact_count = int((quals == 'EXACT').sum())
+        close_count = int((quals == 'CLOSE').sum())
+        interp_count = int((quals == 'INTERP').sum())
+        missing_count = int((quals == 'MISSING').sum())
         
         per_stream_metrics[stream] = {
             'total_raw_records': len(raw_vals),
@@ -402,8 +388,8 @@ def synchronize_streams(
             'close_pct': 100.0 * close_count / M,
             'interp_pct': 100.0 * interp_count / M,
             'missing_pct': 100.0 * missing_count / M,
-            'mean_align_distance_s': np.nanmean(dists) if dists else None,
-            'max_align_distance_s': np.nanmax(dists) if dists else None,
+            'mean_align_distance_s': np.nanmean(dists) if missing_count < M else None,
+            'max_align_distance_s': np.nanmax(dists) if missing_count < M else None,
         }
     
     # Align optional streams
@@ -411,8 +397,7 @@ def synchronize_streams(
         if stream not in df_stage2.columns:
             continue
         
-        raw_ts = df_stage2['timestamp'].tolist()
-        raw_vals = df_stage2[stream].tolist()
+        raw_vals = df_stage2[stream].to_numpy(dtype=np.float64)
         
         vals, quals, dists = align_stream_to_grid(
             raw_ts, raw_vals, grid, tolerance_s
@@ -423,44 +408,48 @@ def synchronize_streams(
         df_sync[f'{stream}_align_distance_s'] = dists
         
         # Metrics
-        missing_pct = 100.0 * quals.count('MISSING') / M
+        missing_count = int((quals == 'MISSING').sum())
+        missing_pct = 100.0 * missing_count / M
         per_stream_metrics[stream] = {
             'total_raw_records': len(raw_vals),
-            'missing_count': quals.count('MISSING'),
+            'missing_count': missing_count,
             'missing_pct': missing_pct,
             'status': 'PARTIAL' if missing_pct > 10 else 'OK'
         }
     
-    # Row-level gap_type and confidence
-    gap_types = []
-    confidences = []
-    
-    for k in range(M):
-        align_qual = {
-            s: df_sync.loc[k, f'{s}_align_quality']
-            for s in MANDATORY_STREAMS
-            if f'{s}_align_quality' in df_sync.columns
-        }
-        
-        # Check exclusion windows (simplified: if any exclusion_window_id column exists)
-        exclusion_id = None  # TODO: derive from Stage 2 exclusion windows
-        
-        gap_type, conf = derive_row_gap_type_and_confidence(
-            k, grid[k], align_qual, exclusion_id, df_stage2
-        )
-        gap_types.append(gap_type)
-        confidences.append(conf)
+    # Row-level gap_type and confidence, over whole quality columns
+    # (hoisted once; no per-row .loc or dict). Same rules as
+    # derive_row_gap_type_and_confidence.
+    # Exclusion windows: TODO: derive from Stage 2 exclusion windows
+    any_missing = np.zeros(M, dtype=bool)
+    confidences = np.full(M, np.inf)
+    for s in MANDATORY_STREAMS:
+        col = f'{s}_align_quality'
+        if col not in df_sync.columns:
+            confidences[:] = 0.00  # absent stream: no confidence
+            continue
+        q = df_sync[col].to_numpy()
+        any_missing |= q == 'MISSING'
+        conf = np.select([q == 'EXACT', q == 'CLOSE', q == 'INTERP'], [0.95, 0.90, 0.85], 0.00)
+        confidences = np.minimum(confidences, conf)  # worst of the three
+    confidences[any_missing] = 0.00
+    
+    # Only rows with a MISSING mandatory stream need the Stage 2 semantic
+    gap_types = np.full(M, 'VALID', dtype=object)
+    for k in np.flatnonzero(any_missing):
+        semantic = lookup_stage2_semantic(grid[k], df_stage2)
+        gap_types[k] = semantic if semantic in ['COV_CONSTANT', 'COV_MINOR', 'SENSOR_ANOMALY'] else 'GAP'
     
     df_sync['gap_type'] = gap_types
     df_sync['confidence'] = confidences
     
     # Compute row-level metrics
-    valid_count = gap_types.count('VALID')
-    cov_const_count = gap_types.count('COV_CONSTANT')
-    cov_minor_count = gap_types.count('COV_MINOR')
-    sensor_anom_count = gap_types.count('SENSOR_ANOMALY')
-    excluded_count = gap_types.count('EXCLUDED')
-    gap_count = gap_types.count('GAP')
+    valid_count = int((gap_types == 'VALID').sum())
+    cov_const_count = int((gap_types == 'COV_CONSTANT').sum())
+    cov_minor_count = int((gap_types == 'COV_MINOR').sum())
+    sensor_anom_count = int((gap_types == 'SENSOR_ANOMALY').sum())
+    excluded_count = int((gap_types == 'EXCLUDED').sum())
+    gap_count = int((gap_types == 'GAP').sum())
     
     row_classification = {
         'VALID_count': valid_count,
@@ -644,7 +633,7 @@ class TestStage3(unittest.TestCase):
         vals, quals, dists = align_stream_to_grid(raw_ts, raw_vals, grid, 1800)
         
         # All should be EXACT
-        self.assertEqual(quals.count('EXACT'), 3)
+        self.assertEqual((quals == 'EXACT').sum(), 3)
         self.assertEqual(vals[0], 17.5)
     
     def test_gap_type_valid(self):
@@ -706,7 +695,9 @@ if __name__ == "__main__":
    - Timestamps: convert to epoch seconds for arithmetic, then back to datetime.
 
 2. **Performance**:
-   - The alignment algorithm is O(N + M), where N = raw records, M = grid points.
+   - The alignment algorithm is O(M log N), where N = raw records, M = grid points:
+     one `np.searchsorted` per stream on int64 epochs, no per-row Python loop
+     (so there is nothing for a JIT such as Numba to compile).
    - For 1 million points, should complete in <5 seconds.
 
 3. **Memory**:
@@ -1,315 +1,115 @@
 
 # Create comprehensive index of ALL Stage 3 deliverables
 
+import argparse
 import json
-from datetime import datetime
-
-stage3_deliverables = {
-    "generated_date": "2025-12-08",
-    "stage": "Stage 3",
-    "project": "HTDAM v2.0 - Timestamp Synchronization",
-    "total_artifacts": 4,
-    
-    "artifacts": [
-        {
-            "id": "file:174",
-            "name": "HTDAM_Stage3_Python_Sketch.py",
-            "category": "Implementation Code",
-            "type": "Python source (runnable skeleton)",
-            "size_lines": 540,
-            "audience": ["Programmer"],
-            "purpose": "Production-ready skeleton code with all Stage 3 functions",
-            "includes": [
-                "htdam_constants additions (T_NOMINAL_SECONDS, SYNC_TOLERANCE, thresholds)",
-                "ceil_to_grid() - timestamp rounding",
-                "build_master_grid() - uniform grid generation",
-                "align_stream_to_grid() - O(N+M) nearest-neighbor algorithm",
-                "get_alignment_confidence() - quality→confidence mapping",
-                "lookup_stage2_semantic() - look up COV/anomaly info",
-                "derive_row_gap_type_and_confidence() - row-level classification",
-                "synchronize_streams() - main orchestration function",
-                "run_stage3() - integration with useOrchestration",
-                "Unit tests (7 test cases)",
-                "Usage example with BarTech mock data"
-            ],
-            "dependencies": ["pandas", "numpy", "datetime"],
-            "estimated_effort_days": 7,
-            "status": "Ready to implement",
-            "quality": "Production-ready skeleton"
-        },
-        {
-            "id": "file:175",
-            "name": "HTDAM_Stage3_Metrics_Schema.json",
-            "category": "Data Schema & Validation",
-            "type": "JSON Schema (draft-07)",
-            "size_lines": 250,
-            "audience": ["Programmer", "QA"],
-            "purpose": "Validate Stage 3 metrics JSON output",
-            "defines": [
-                "stage: 'SYNC'",
-                "timestamp_start, timestamp_end (ISO 8601)",
-                "grid: {t_nominal_seconds, grid_points, coverage_seconds}",
-                "per_stream_alignment: {chwst, chwrt, cdwrt, flow, power}",
-                "  - total_raw_records, aligned_exact/close/interp/missing counts & %",
-                "  - mean_align_distance_s, max_align_distance_s",
-                "  - status: OK | PARTIAL | NOT_PROVIDED",
-                "row_classification: {VALID, COV_CONSTANT, COV_MINOR, SENSOR_ANOMALY, EXCLUDED, GAP counts & %}",
-                "jitter: {interval_mean_s, interval_std_s, interval_cv_pct}",
-                "penalties: {coverage_penalty, jitter_penalty}",
-                "stage3_confidence (0.0-1.0)",
-                "warnings, errors, halt"
-            ],
-            "includes_full_example": True,
-            "example_data": "BarTech output (35,136 grid points, 93.8% coverage)",
-            "status": "Ready to validate",
-            "quality": "JSON Schema draft-07 compliant"
-        },
-        {
-            "id": "file:176",
-            "name": "HTDAM_Stage3_DataFrame_Schema.json",
-            "category": "Data Schema & Validation",
-            "type": "JSON Schema (draft-07)",
-            "size_lines": 280,
-            "audience": ["Programmer", "QA"],
-            "purpose": "Validate Stage 3 synchronized dataframe CSV/Parquet structure",
-            "defines_columns": [
-                "timestamp (ISO 8601, grid points)",
-                "chwst, chwrt, cdwrt, flow_m3s, power_kw (canonical values or null)",
-                "chwst_align_quality, chwrt_align_quality, ... (EXACT|CLOSE|INTERP|MISSING)",
-                "chwst_align_distance_s, chwrt_align_distance_s, ... (seconds or null)",
-                "gap_type (VALID|COV_CONSTANT|COV_MINOR|SENSOR_ANOMALY|EXCLUDED|GAP)",
-                "confidence (0.0-0.95)",
-                "exclusion_window_id (string or null)",
-                "delta_t_c (optional derived: chwrt - chwst)",
-                "lift_c (optional derived: cdwrt - chwst)"
-            ],
-            "includes_examples": 3,
-            "example_rows": [
-                "Valid row: all EXACT, confidence 0.90",
-                "COV_CONSTANT row: all MISSING, confidence 0.00",
-                "Excluded row: valid but inside maintenance window"
-            ],
-            "status": "Ready to validate",
-            "quality": "JSON Schema draft-07 compliant"
-        },
-        {
-            "id": "file:177",
-            "name": "HTDAM_Stage3_Summary.md",
-            "category": "Summary & Integration Guide",
-            "type": "Markdown documentation",
-            "size_lines": 580,
-            "audience": ["Programmer", "Project Owner"],
-            "purpose": "Complete overview + integration guide + testing instructions",
-            "sections": [
-                "30-second summary of what Stage 3 does",
-                "Artefacts overview (4 files, 4 purposes)",
-                "Implementation checklist (6 phases, 9 days)",
-                "Expected test results (BarTech data)",
-                "Key design decisions & rationale",
-                "Integration points (with Stages 2 & 4)",
-                "Performance targets (from 2.8k to 351k grid points)",
-                "Constants summary (copy-paste ready)",
-                "Common mistakes to avoid (6 items)",
-                "Step-by-step BarTech validation",
-                "What comes next (Stages 4 & 5)"
-            ],
-            "includes": [
-                "Complete constants block",
-                "Integration code examples",
-                "Test validation checklist",
-                "Performance table",
-                "Design rationale"
-            ],
-            "status": "Ready to guide implementation",
-            "quality": "Comprehensive guide"
-        }
-    ],
-    
-    "implementation_timeline": {
-        "phase1_setup": "Day 1 (~4 hours): Copy constants, create modules, setup tests",
-        "phase2_core_algorithm": "Days 2-3 (~16 hours): Grid generation, alignment, quality classification",
-        "phase3_row_logic": "Day 4 (~8 hours): Gap type, confidence, exclusion windows",
-        "phase4_orchestration": "Day 5 (~8 hours): Main driver, metrics, penalties",
-        "phase5_testing": "Days 6-7 (~16 hours): BarTech validation, edge cases, performance",
-        "phase6_integration": "Days 8-9 (~16 hours): Wire into orchestration, full pipeline test",
-        "total_effort": "7-9 days (64 hours)",
-        "parallel_work": "Unit tests can be written in parallel with implementation"
-    },
-    
-    "key_algorithms": {
-        "grid_generation": {
-            "name": "ceil_to_grid()",
-            "complexity": "O(1)",
-            "description": "Round timestamp up to nearest grid boundary"
-        },
-        "alignment": {
-            "name": "align_stream_to_grid()",
-            "complexity": "O(N + M)",
-            "description": "Two-pointer scan for nearest-neighbor alignment",
-            "why_efficient": "Single pass through raw data, single pass through grid, no nested loops"
-        },
-        "row_classification": {
-            "name": "derive_row_gap_type_and_confidence()",
-            "complexity": "O(1)",
-            "description": "Combine stream alignment qualities + Stage 2 semantics → row type & confidence"
-        }
-    },
-    
-    "expected_bartech_output": {
-        "input": {
-            "df_stage2_records": 35574,
-            "streams": 3,
-            "raw_points_per_stream": 11858,
-            "time_span_days": 366
-        },
-        "grid": {
-            "t_nominal_seconds": 900,
-            "grid_points": 35136
-        },
-        "per_stream_alignment": {
-            "exact_pct": "93.8%",
-            "close_pct": "0.2%",
-            "interp_pct": "0.5%",
-            "missing_pct": "5.5%",
-            "mean_distance_s": 22.0,
-            "max_distance_s": 835.0
-        },
-        "row_classification": {
-            "VALID_pct": 93.8,
-            "COV_CONSTANT_count": 155,
-            "COV_MINOR_count": 62,
-            "SENSOR_ANOMALY_count": 19,
-            "EXCLUDED_count": 1760,
-            "GAP_count": 181
-        },
-        "jitter": {
-            "interval_mean_s": 900.0,
-            "interval_std_s": 0.0,
-            "interval_cv_pct": 0.0
-        },
-        "penalties": {
-            "coverage_penalty": -0.05,
-            "jitter_penalty": 0.0,
-            "total": -0.05
-        },
-        "stage3_confidence": 0.88,
-        "halt": False
-    },
-    
-    "validation_checklist": [
-        "Grid points match expected (35,136)",
-        "Coverage % matches expected (93.8%)",
-        "VALID row count matches expected (32,959)",
-        "COV_CONSTANT count matches expected (155)",
-        "Metrics JSON validates against schema",
-        "Dataframe validates against schema",
-        "stage3_confidence = 0.88 (±0.01)",
-        "No HALT unless critical error",
-        "Unit test coverage >90%",
-        "Performance <5 seconds for full dataset"
-    ],
+import sys
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+parser = argparse.ArgumentParser(description="Print the HTDAM v2.0 Stage 3 deliverables index")
+parser.add_argument(
+    "--format",
+    choices=["json", "report", "both"],
+    default="report",
+    help="json: raw index; report: human-readable summary (default); both: json then report",
+)
+args = parser.parse_args()
+
+# The index itself is static data, shipped pre-rendered next to this script
+index_path = Path(__file__).parent / "stage3_deliverables.json"
+index_bytes = index_path.read_bytes()
+
+if args.format in ("json", "both"):
+    # Output comprehensive index: the file already holds the indented JSON,
+    # so pass its bytes through unchanged (flush pending text first to keep ordering)
+    if hasattr(sys.stdout, "buffer"):
+        sys.stdout.flush()
+        sys.stdout.buffer.write(index_bytes)
+    else:  # Text-only stdout (e.g. redirect_stdout(io.StringIO()))
+        sys.stdout.write(index_bytes.decode("utf-8"))
+
+if args.format in ("report", "both"):
+    stage3_deliverables = (orjson or json).loads(index_bytes)
     
-    "quick_reference": {
-        "for_programmer": [
-            "1. Read [file:177] HTDAM_Stage3_Summary.md",
-            "2. Review Python skeleton [file:174]",
-            "3. Follow implementation checklist (6 phases, 9 days)",
-            "4. Validate against schemas [file:175] + [file:176]",
-            "5. Test on BarTech data → match expected outputs",
-            "6. Deliver synchronized dataframe + metrics JSON"
-        ],
-        "for_project_owner": [
-            "1. Share [file:177] with programmer",
-            "2. Check progress against 9-day timeline",
-            "3. Review BarTech test output when complete",
-            "4. Verify metrics confidence = 0.88 (approximately)",
-            "5. Approve for handoff to Stage 4"
-        ]
-    },
+    # Human-readable report: collect lines, then emit them in one write
+    out = []
+    emit = out.append
+
+    timeline = stage3_deliverables['implementation_timeline']
+    bartech = stage3_deliverables['expected_bartech_output']
+
+    emit("\n" + "="*100)
+    emit("HTDAM v2.0 STAGE 3: COMPLETE DELIVERABLES INDEX")
+    emit("="*100)
+
+    emit(f"\nGenerated: {stage3_deliverables['generated_date']}")
+    emit(f"Stage: {stage3_deliverables['stage']}")
+    emit(f"Total Artifacts: {stage3_deliverables['total_artifacts']}")
+
+    emit("\n" + "-"*100)
+    emit("ARTIFACTS SUMMARY")
+    emit("-"*100)
+
+    for artifact in stage3_deliverables['artifacts']:
+        emit(f"\n[{artifact['id']}] {artifact['name']}")
+        emit(f"  Type: {artifact['type']}")
+        emit(f"  Purpose: {artifact['purpose']}")
+        emit(f"  Audience: {', '.join(artifact['audience'])}")
     
-    "constants_to_add": {
-        "T_NOMINAL_SECONDS": 900,
-        "SYNC_TOLERANCE_SECONDS": 1800,
-        "ALIGN_EXACT_THRESHOLD": 60,
-        "ALIGN_CLOSE_THRESHOLD": 300,
-        "ALIGN_INTERP_THRESHOLD": 1800,
-        "COVERAGE_EXCELLENT_PCT": 95.0,
-        "COVERAGE_GOOD_PCT": 90.0,
-        "COVERAGE_FAIR_PCT": 80.0,
-        "JITTER_CV_TOLERANCE_PCT": 5.0,
-        "MANDATORY_STREAMS": "['chwst', 'chwrt', 'cdwrt']",
-        "OPTIONAL_STREAMS": "['flow_m3s', 'power_kw']"
-    }
-}
+        if 'size_lines' in artifact:
+            emit(f"  Size: ~{artifact['size_lines']} lines")
+        if 'quality' in artifact:
+            emit(f"  Status: {artifact['quality']}")
 
-# Output comprehensive index
-print(json.dumps(stage3_deliverables, indent=2))
-
-print("\n" + "="*100)
-print("HTDAM v2.0 STAGE 3: COMPLETE DELIVERABLES INDEX")
-print("="*100)
-
-print(f"\nGenerated: {stage3_deliverables['generated_date']}")
-print(f"Stage: {stage3_deliverables['stage']}")
-print(f"Total Artifacts: {stage3_deliverables['total_artifacts']}")
-
-print("\n" + "-"*100)
-print("ARTIFACTS SUMMARY")
-print("-"*100)
-
-for artifact in stage3_deliverables['artifacts']:
-    print(f"\n[{artifact['id']}] {artifact['name']}")
-    print(f"  Type: {artifact['type']}")
-    print(f"  Purpose: {artifact['purpose']}")
-    print(f"  Audience: {', '.join(artifact['audience'])}")
-    
-    if 'size_lines' in artifact:
-        print(f"  Size: ~{artifact['size_lines']} lines")
-    if 'quality' in artifact:
-        print(f"  Status: {artifact['quality']}")
+    emit("\n" + "-"*100)
+    emit("IMPLEMENTATION TIMELINE")
+    emit("-"*100)
 
-print("\n" + "-"*100)
-print("IMPLEMENTATION TIMELINE")
-print("-"*100)
+    for phase, duration in timeline.items():
+        if not phase.startswith('total') and not phase.startswith('parallel'):
+            emit(f"  {phase}: {duration}")
 
-for phase, duration in stage3_deliverables['implementation_timeline'].items():
-    if not phase.startswith('total') and not phase.startswith('parallel'):
-        print(f"  {phase}: {duration}")
+    emit(f"\n  Total: {timeline['total_effort']}")
 
-print(f"\n  Total: {stage3_deliverables['implementation_timeline']['total_effort']}")
+    emit("\n" + "-"*100)
+    emit("KEY ALGORITHMS")
+    emit("-"*100)
 
-print("\n" + "-"*100)
-print("KEY ALGORITHMS")
-print("-"*100)
+    for algo_name, algo_info in stage3_deliverables['key_algorithms'].items():
+        emit(f"\n  {algo_info['name']} - {algo_info['complexity']}")
+        emit(f"    {algo_info['description']}")
 
-for algo_name, algo_info in stage3_deliverables['key_algorithms'].items():
-    print(f"\n  {algo_info['name']} - {algo_info['complexity']}")
-    print(f"    {algo_info['description']}")
+    emit("\n" + "-"*100)
+    emit("EXPECTED BARTECH OUTPUT")
+    emit("-"*100)
 
-print("\n" + "-"*100)
-print("EXPECTED BARTECH OUTPUT")
-print("-"*100)
+    emit(f"\n  Input: {bartech['input']['df_stage2_records']} records")
+    emit(f"  Grid: {bartech['grid']['grid_points']} points")
+    emit(f"  Coverage: {bartech['row_classification']['VALID_pct']}% VALID")
+    emit(f"  Confidence: {bartech['stage3_confidence']}")
+    emit(f"  Halt: {bartech['halt']}")
 
-print(f"\n  Input: {stage3_deliverables['expected_bartech_output']['input']['df_stage2_records']} records")
-print(f"  Grid: {stage3_deliverables['expected_bartech_output']['grid']['grid_points']} points")
-print(f"  Coverage: {stage3_deliverables['expected_bartech_output']['row_classification']['VALID_pct']}% VALID")
-print(f"  Confidence: {stage3_deliverables['expected_bartech_output']['stage3_confidence']}")
-print(f"  Halt: {stage3_deliverables['expected_bartech_output']['halt']}")
+    emit("\n" + "-"*100)
+    emit("CONSTANTS TO ADD TO htdam_constants.py")
+    emit("-"*100)
 
-print("\n" + "-"*100)
-print("CONSTANTS TO ADD TO htdam_constants.py")
-print("-"*100)
+    for const_name, const_value in stage3_deliverables['constants_to_add'].items():
+        emit(f"  {const_name} = {const_value}")
 
-for const_name, const_value in stage3_deliverables['constants_to_add'].items():
-    print(f"  {const_name} = {const_value}")
+    emit("\n" + "-"*100)
+    emit("QUICK START FOR PROGRAMMER")
+    emit("-"*100)
 
-print("\n" + "-"*100)
-print("QUICK START FOR PROGRAMMER")
-print("-"*100)
+    for step in stage3_deliverables['quick_reference']['for_programmer']:
+        emit(f"  {step}")
 
-for step in stage3_deliverables['quick_reference']['for_programmer']:
-    print(f"  {step}")
+    emit("\n" + "="*100)
+    emit("✅ STAGE 3 COMPLETE & READY FOR IMPLEMENTATION")
+    emit("="*100)
 
-print("\n" + "="*100)
-print("✅ STAGE 3 COMPLETE & READY FOR IMPLEMENTATION")
-print("="*100)
+    sys.stdout.write("\n".join(out) + "\n")
@@ -26,12 +26,18 @@ HUNT_WINDOW_HOURS = 24
 HUNT_MINOR_FREQUENCY = 0.2          # cycles/hour
 HUNT_MAJOR_FREQUENCY = 1.0
 HUNT_CYCLE_MIN_COUNT = 3
+HUNT_SEVERITY_LEVELS = ['NONE', 'MINOR', 'MAJOR']  # index = int8 code
 
 # Fouling thresholds
 FOULING_EVAP_MINOR_PCT = 10.0
 FOULING_EVAP_MAJOR_PCT = 25.0
 FOULING_CONDENSER_MINOR_PCT = 5.0
 FOULING_CONDENSER_MAJOR_PCT = 15.0
+FOULING_SEVERITY_LEVELS = ['CLEAN', 'MINOR_FOULING', 'MAJOR_FOULING']  # index = int8 code
+
+# Alignment quality (Stage 3 Categorical order; index = int8 code)
+ALIGN_QUALITY_LEVELS = ['MISSING', 'INTERP', 'CLOSE', 'EXACT']
+ALIGN_QUALITY_CONFIDENCE = [0.85, 0.85, 0.90, 0.95, 0.85]  # codes 0..3, last = NaN (-1)
 ```
 
 ---
@@ -53,8 +59,9 @@ def compute_temperature_differentials(df: pd.DataFrame) -> Tuple[np.ndarray, np.
     Returns:
         (delta_t_chw, lift) as numpy arrays
     """
-    delta_t_chw = df['chwrt'] - df['chwst']
-    lift = df['cdwrt'] - df['chwst']
+    chwst = df['chwst'].to_numpy(dtype=float)
+    delta_t_chw = df['chwrt'].to_numpy(dtype=float) - chwst
+    lift = df['cdwrt'].to_numpy(dtype=float) - chwst
     
     return delta_t_chw, lift
 
@@ -64,7 +71,7 @@ def validate_temperature_differentials(
     lift: np.ndarray
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Validate ΔT and lift; set invalid to NaN.
+    Validate ΔT and lift; set invalid to NaN (in place for float arrays).
     
     Args:
         delta_t_chw: chilled water temperature differential (°C)
@@ -73,11 +80,14 @@ def validate_temperature_differentials(
     Returns:
         (delta_t_chw, lift) with invalid values set to NaN
     """
+    delta_t_chw = np.asarray(delta_t_chw, dtype=float)
+    lift = np.asarray(lift, dtype=float)
+    
     # ΔT must be ≥ 0 (return ≥ supply)
-    delta_t_chw = np.where(delta_t_chw < 0, np.nan, delta_t_chw)
+    np.putmask(delta_t_chw, delta_t_chw < 0, np.nan)
     
     # Lift must be > 0 (positive compression)
-    lift = np.where(lift <= 0, np.nan, lift)
+    np.putmask(lift, lift <= 0, np.nan)
     
     return delta_t_chw, lift
 ```
@@ -108,77 +118,79 @@ def compute_cooling_load(
     Returns:
         q_evap [kW]
     """
-    q_evap = flow_m3s * rho * cp * delta_t_chw / 1000.0
-    
-    # Set to NaN if flow or ΔT invalid
-    q_evap = np.where(
-        (np.isnan(flow_m3s)) | (np.isnan(delta_t_chw)),
-        np.nan,
-        q_evap
-    )
+    # NaN flow or ΔT propagates through the product → NaN Q
+    # (evaluated in place, same left-to-right order, one allocation)
+    q_evap = flow_m3s * rho
+    q_evap *= cp
+    q_evap *= delta_t_chw
+    q_evap /= 1000.0
     
     # Set to NaN if Q < 0 (invalid)
-    q_evap = np.where(q_evap < 0, np.nan, q_evap)
+    q_evap[q_evap < 0] = np.nan
     
     return q_evap
 
 
+def align_quality_codes(quality) -> np.ndarray:
+    """
+    Encode align_quality values as int8 codes over ALIGN_QUALITY_LEVELS.
+    
+    Args:
+        quality: align_quality strings or Stage 3 Categorical
+    
+    Returns:
+        int8 codes (MISSING=0, INTERP=1, CLOSE=2, EXACT=3, NaN=-1)
+    """
+    return pd.Categorical(quality, categories=ALIGN_QUALITY_LEVELS).codes
+
+
 def compute_q_confidence(
     df: pd.DataFrame,
-    q_evap: np.ndarray
+    q_evap: np.ndarray,
+    delta_t_chw: np.ndarray,
+    q_nan: np.ndarray = None
 ) -> np.ndarray:
     """
     Compute load confidence based on component confidences & validity.
     
     Args:
-        df: synchronized dataframe with confidence column
+        df: synchronized dataframe with confidence & align_quality columns
         q_evap: computed load (kW)
+        delta_t_chw: validated chilled water ΔT (°C)
+        q_nan: precomputed np.isnan(q_evap), if the caller already has it
     
     Returns:
         q_confidence [0.0–1.0]
     """
-    M = len(df)
-    q_confidence = np.full(M, 0.0)
+    if q_nan is None:
+        q_nan = np.isnan(q_evap)
+    
+    # Pull columns once as arrays (no per-row df.loc lookups)
+    base = df['confidence'].to_numpy(dtype=float)  # Stage 3 row confidence
+    flow_codes = align_quality_codes(df['flow_m3s_align_quality'])
+    chwst_codes = align_quality_codes(df['chwst_align_quality'])
+    chwrt_codes = align_quality_codes(df['chwrt_align_quality'])
+    delta_t = np.asarray(delta_t_chw, dtype=float)
+    
+    # Flow or temperature (chwst, chwrt) MISSING (0) or NaN (-1) → no load confidence
+    missing = (flow_codes <= 0) | (chwst_codes <= 0) | (chwrt_codes <= 0)
+    
+    # Start with minimum of row confidence and flow alignment confidence
+    flow_conf = np.asarray(ALIGN_QUALITY_CONFIDENCE)[flow_codes]
+    confidence = np.minimum(base, flow_conf)
+    
+    # Penalties for edge cases (NaN ΔT compares False → no penalty)
+    confidence -= np.where(
+        delta_t < 1.0, 0.10,          # Very low ΔT
+        np.where(delta_t > 15.0, 0.05, 0.0)  # Very high ΔT
+    )
     
-    for i in range(M):
-        # Start with Stage 3 confidence (row-level)
-        base = df.loc[i, 'confidence']
-        
-        # Check flow alignment quality
-        flow_quality = df.loc[i, 'flow_m3s_align_quality']
-        if pd.isna(flow_quality) or flow_quality == 'MISSING':
-            q_confidence[i] = 0.00
-            continue
-        
-        # Check temperature quality (min of chwst, chwrt)
-        chwst_quality = df.loc[i, 'chwst_align_quality']
-        chwrt_quality = df.loc[i, 'chwrt_align_quality']
-        
-        if (pd.isna(chwst_quality) or chwst_quality == 'MISSING' or
-            pd.isna(chwrt_quality) or chwrt_quality == 'MISSING'):
-            q_confidence[i] = 0.00
-            continue
-        
-        # Start with minimum of all three
-        confidence = min(
-            base,
-            0.95 if flow_quality == 'EXACT' else 0.90 if flow_quality == 'CLOSE' else 0.85
-        )
-        
-        # Penalties for edge cases
-        delta_t = df.loc[i, 'delta_t_chw']
-        
-        if pd.notna(delta_t):
-            if delta_t < 1.0:
-                confidence -= 0.10  # Very low ΔT
-            elif delta_t > 15.0:
-                confidence -= 0.05  # Very high ΔT
-        
-        # Check if Q is NaN
-        if np.isnan(q_evap[i]):
-            confidence = 0.00
-        
-        q_confidence[i] = max(0.0, confidence)
+    # Zero if inputs missing or Q is NaN; clamp at 0
+    q_confidence = np.where(
+        missing | q_nan,
+        0.00,
+        np.where(confidence > 0.0, confidence, 0.0)
+    )
     
     return q_confidence
 ```
@@ -204,14 +216,16 @@ def compute_cop(
     Returns:
         (cop, cop_valid) where cop_valid is boolean
     """
-    # Compute COP
-    cop = np.divide(q_evap, power_kw, where=power_kw > 0, out=np.full_like(q_evap, np.nan))
+    # Compute COP (NaN unless power > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cop = q_evap / power_kw
+    cop[~(power_kw > 0)] = np.nan
     
     # Validate range
     cop_valid = (cop >= valid_range[0]) & (cop <= valid_range[1])
     
-    # Set out-of-range to NaN
-    cop = np.where(cop_valid | np.isnan(cop), cop, np.nan)
+    # Set out-of-range to NaN (NaN COP is already NaN)
+    cop[~cop_valid] = np.nan
     
     return cop, cop_valid
 
@@ -219,48 +233,34 @@ def compute_cop(
 def compute_cop_confidence(
     q_confidence: np.ndarray,
     power_quality: np.ndarray,  # align_quality strings
-    cop: np.ndarray
+    cop: np.ndarray,
+    cop_nan: np.ndarray = None
 ) -> np.ndarray:
     """
     Compute COP confidence.
     
     Args:
         q_confidence: load confidence from compute_q_confidence
-        power_quality: power align_quality (EXACT, CLOSE, INTERP, MISSING)
+        power_quality: power align_quality (EXACT, CLOSE, INTERP, MISSING),
+                       strings or Categorical
         cop: computed COP values
+        cop_nan: precomputed np.isnan(cop), if the caller already has it
     
     Returns:
         cop_confidence [0.0–1.0]
     """
-    M = len(cop)
-    cop_confidence = np.full(M, 0.0)
-    
-    for i in range(M):
-        # If Q invalid, COP invalid
-        if q_confidence[i] < 0.5:
-            cop_confidence[i] = 0.00
-            continue
-        
-        # If power missing or out-of-range
-        if pd.isna(power_quality[i]) or power_quality[i] == 'MISSING':
-            cop_confidence[i] = 0.00
-            continue
-        
-        # If COP is NaN
-        if np.isnan(cop[i]):
-            cop_confidence[i] = 0.00
-            continue
-        
-        # Base confidence from Q
-        confidence = q_confidence[i]
-        
-        # Add power quality (minor contribution)
-        power_conf = 0.95 if power_quality[i] == 'EXACT' else \
-                     0.90 if power_quality[i] == 'CLOSE' else 0.85
-        
-        confidence = min(confidence, power_conf)
-        
-        cop_confidence[i] = confidence
+    if cop_nan is None:
+        cop_nan = np.isnan(cop)
+    
+    power_codes = align_quality_codes(power_quality)
+    
+    # Invalid if Q invalid, power MISSING/NaN, or COP is NaN
+    invalid = (q_confidence < 0.5) | (power_codes <= 0) | cop_nan
+    
+    # Power quality (minor contribution) caps the Q confidence
+    power_conf = np.asarray(ALIGN_QUALITY_CONFIDENCE)[power_codes]
+    
+    cop_confidence = np.where(invalid, 0.00, np.minimum(q_confidence, power_conf))
     
     return cop_confidence
 
@@ -282,15 +282,12 @@ def compute_carnot_cop(
     Returns:
         cop_carnot [dimensionless]
     """
-    chwst_k = chwst_c + 273.15
-    
-    # Avoid division by zero
-    cop_carnot = np.divide(
-        chwst_k,
-        lift_c,
-        where=lift_c > 0,
-        out=np.full_like(chwst_k, np.nan)
-    )
+    cop_carnot = chwst_c + 273.15  # T_evap [K], divided in place below
+    
+    # Avoid division by zero (NaN unless lift > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cop_carnot /= lift_c
+    cop_carnot[~(lift_c > 0)] = np.nan
     
     return cop_carnot
 ```
@@ -313,7 +310,8 @@ def detect_hunting_in_window(
     Detect hunting in a time window.
     
     Args:
-        timestamps: datetime index
+        timestamps: datetime index, sorted ascending (or its int64 ns view,
+                    so callers scanning many windows convert only once)
         chwst_values: setpoint temperatures (°C)
         window_start, window_end: window bounds
         min_reversals: minimum reversals to flag
@@ -322,10 +320,11 @@ def detect_hunting_in_window(
     Returns:
         {'detected': bool, 'severity': str, 'frequency': float, 'reversals': int}
     """
-    # Filter to window
-    mask = (timestamps >= window_start) & (timestamps <= window_end)
-    window_ts = timestamps[mask]
-    window_vals = chwst_values[mask]
+    # Filter to window: binary search on sorted ns, no full-length mask
+    ts_ns = np.asarray(timestamps, dtype='datetime64[ns]').view('i8')
+    lo = np.searchsorted(ts_ns, window_start.value, side='left')
+    hi = np.searchsorted(ts_ns, window_end.value, side='right')
+    window_vals = chwst_values[lo:hi]
     
     if len(window_vals) < 3:
         return {'detected': False, 'severity': 'NONE', 'frequency': 0.0, 'reversals': 0}
@@ -338,8 +337,8 @@ def detect_hunting_in_window(
     if reversals < min_reversals:
         return {'detected': False, 'severity': 'NONE', 'frequency': 0.0, 'reversals': reversals}
     
-    # Compute frequency
-    time_span_hours = (window_end - window_start).total_seconds() / 3600.0
+    # Compute frequency (int64 ns arithmetic; no Timedelta objects)
+    time_span_hours = (window_end.value - window_start.value) / 1e9 / 3600.0
     
     if time_span_hours == 0:
         frequency = 0.0
@@ -372,43 +371,74 @@ def detect_hunting_all_windows(
     """
     Apply hunting detection across all sliding windows.
     
+    Single pass instead of one detect_hunting_in_window call per row:
+    sign reversals are computed once over the whole series, a cumulative
+    sum gives the count inside any index range in O(1), and window bounds
+    for every row come from one searchsorted over the (sorted) timestamps,
+    or from fixed row offsets when the cadence is exactly uniform.
+    
     Args:
         df: synchronized dataframe with timestamp and chwst
         window_hours: sliding window size
     
     Returns:
-        (hunt_flag, hunt_severity, hunt_stats)
+        (hunt_flag, severity_codes, hunt_stats); severity_codes are int8
+        indices into HUNT_SEVERITY_LEVELS
     """
     M = len(df)
-    hunt_flag = np.full(M, False)
-    hunt_severity = np.full(M, 'NONE', dtype=object)
+    ts_ns = pd.DatetimeIndex(df['timestamp']).as_unit('ns').asi8  # asi8 is in the native unit
+    chwst_values = df['chwst'].to_numpy(dtype=float)
     
     window_duration = pd.Timedelta(hours=window_hours)
-    windows_with_hunt = 0
-    total_windows = 0
-    hunt_severities = {'NONE': 0, 'MINOR': 0, 'MAJOR': 0}
-    
-    # Slide window over entire dataset
-    for i in range(M):
-        current_time = df.loc[i, 'timestamp']
-        window_start = current_time - window_duration / 2
-        window_end = current_time + window_duration / 2
-        
-        result = detect_hunting_in_window(
-            df['timestamp'],
-            df['chwst'].values,
-            window_start,
-            window_end
-        )
-        
-        hunt_flag[i] = result['detected']
-        hunt_severity[i] = result['severity']
-        hunt_severities[result['severity']] += 1
-        
-        if result['detected']:
-            windows_with_hunt += 1
-        
-        total_windows += 1
+    half_window_ns = (window_duration / 2).value
+    time_span_hours = window_duration.total_seconds() / 3600.0
+    
+    # Sign reversals, each recorded at the last of its 3 samples (k-2, k-1, k)
+    signs = np.sign(np.diff(chwst_values))
+    reversal_at = np.zeros(M, dtype=bool)
+    reversal_at[2:] = np.abs(np.diff(signs)) > 0
+    cumrev = np.concatenate([[0], np.cumsum(reversal_at)])
+    
+    # Window [t - W/2, t + W/2] for every row → sample index range [lo, hi)
+    step_ns = np.diff(ts_ns)
+    if M > 1 and step_ns[0] > 0 and (step_ns == step_ns[0]).all():
+        # Fixed cadence (Stage 3 master grid): bounds are fixed row offsets
+        half_window_rows = half_window_ns // step_ns[0]
+        rows = np.arange(M)
+        lo = np.maximum(rows - half_window_rows, 0)
+        hi = np.minimum(rows + half_window_rows + 1, M)
+    else:
+        lo = np.searchsorted(ts_ns, ts_ns - half_window_ns, side='left')
+        hi = np.searchsorted(ts_ns, ts_ns + half_window_ns, side='right')
+    
+    # Reversals with all 3 samples inside the window (none if < 3 samples)
+    reversals = cumrev[hi] - cumrev[np.minimum(lo + 2, hi)]
+    
+    if time_span_hours == 0:
+        frequency = np.zeros(M)
+    else:
+        frequency = reversals / time_span_hours
+    
+    # Classify severity as int8 codes into HUNT_SEVERITY_LEVELS
+    flagged = reversals >= HUNT_CYCLE_MIN_COUNT
+    severity_codes = np.select(
+        [
+            flagged & (frequency >= HUNT_MAJOR_FREQUENCY),
+            flagged & (frequency >= HUNT_MINOR_FREQUENCY)
+        ],
+        [2, 1],
+        default=0
+    ).astype(np.int8)
+    hunt_flag = severity_codes > 0
+    
+    # One histogram instead of per-row dict increments
+    counts = np.bincount(severity_codes, minlength=len(HUNT_SEVERITY_LEVELS))
+    hunt_severities = {
+        severity: int(count)
+        for severity, count in zip(HUNT_SEVERITY_LEVELS, counts)
+    }
+    windows_with_hunt = int(counts[1:].sum())
+    total_windows = M
     
     hunt_stats = {
         'windows_with_hunt': windows_with_hunt,
@@ -417,7 +447,7 @@ def detect_hunting_all_windows(
         'severity_breakdown': hunt_severities
     }
     
-    return hunt_flag, hunt_severity, hunt_stats
+    return hunt_flag, severity_codes, hunt_stats
 ```
 
 ---
@@ -446,32 +476,34 @@ def compute_fouling_evap(
         baseline_days: days to use for auto-baseline if no nameplate
     
     Returns:
-        (fouling_evap_pct, fouling_severity)
+        (fouling_evap_pct, severity_codes); severity_codes are int8
+        indices into FOULING_SEVERITY_LEVELS
     """
     M = len(flow_m3s)
     fouling_pct = np.full(M, np.nan)
-    fouling_severity = np.full(M, 'CLEAN', dtype=object)
+    severity_codes = np.zeros(M, dtype=np.int8)  # CLEAN
     
-    # Compute UFOA
-    ufoa = np.divide(q_evap, np.maximum(flow_m3s, 1e-6), out=np.full_like(q_evap, np.nan))
+    # Compute UFOA (flow floored at 1e-6; NaN flow → NaN)
+    ufoa = np.maximum(flow_m3s, 1e-6)
+    np.divide(q_evap, ufoa, out=ufoa)
     
-    # If no baseline provided, use first N days average
+    # If no baseline provided, average the first 20% of the record by time
     if baseline_ufoa is None:
-        valid_ufoa = ufoa[~np.isnan(ufoa)]
-        if len(valid_ufoa) > 0:
-            baseline_ufoa = np.mean(valid_ufoa[:int(len(valid_ufoa) * 0.2)])  # First 20%
+        baseline_window = ufoa[:max(1, M // 5)]
+        if not np.isnan(baseline_window).all():
+            baseline_ufoa = np.nanmean(baseline_window)
     
     if baseline_ufoa is not None and baseline_ufoa > 0:
-        fouling_pct = (1 - ufoa / baseline_ufoa) * 100
+        fouling_pct = ufoa / baseline_ufoa
+        np.subtract(1, fouling_pct, out=fouling_pct)
+        fouling_pct *= 100
         
-        # Classify severity
-        fouling_severity = np.where(
-            fouling_pct < FOULING_EVAP_MINOR_PCT,
-            'CLEAN',
-            np.where(fouling_pct < FOULING_EVAP_MAJOR_PCT, 'MINOR_FOULING', 'MAJOR_FOULING')
-        )
+        # Classify severity codes (NaN sorts past the last bin → MAJOR_FOULING)
+        severity_codes = np.digitize(
+            fouling_pct, [FOULING_EVAP_MINOR_PCT, FOULING_EVAP_MAJOR_PCT]
+        ).astype(np.int8)
     
-    return fouling_pct, fouling_severity
+    return fouling_pct, severity_codes
 
 
 def compute_fouling_condenser(
@@ -491,11 +523,12 @@ def compute_fouling_condenser(
         baseline_lift: baseline lift from nameplate (typical 10–12 K)
     
     Returns:
-        (fouling_condenser_pct, fouling_severity)
+        (fouling_condenser_pct, severity_codes); severity_codes are int8
+        indices into FOULING_SEVERITY_LEVELS
     """
     M = len(lift)
     fouling_pct = np.full(M, np.nan)
-    fouling_severity = np.full(M, 'CLEAN', dtype=object)
+    severity_codes = np.zeros(M, dtype=np.int8)  # CLEAN
     
     # If no baseline provided, use median observed lift
     if baseline_lift is None:
@@ -504,16 +537,16 @@ def compute_fouling_condenser(
             baseline_lift = np.median(valid_lift)
     
     if baseline_lift is not None and baseline_lift > 0:
-        fouling_pct = ((lift / baseline_lift) - 1) * 100
+        fouling_pct = lift / baseline_lift
+        fouling_pct -= 1
+        fouling_pct *= 100
         
-        # Classify severity
-        fouling_severity = np.where(
-            fouling_pct < FOULING_CONDENSER_MINOR_PCT,
-            'CLEAN',
-            np.where(fouling_pct < FOULING_CONDENSER_MAJOR_PCT, 'MINOR_FOULING', 'MAJOR_FOULING')
-        )
+        # Classify severity codes (NaN sorts past the last bin → MAJOR_FOULING)
+        severity_codes = np.digitize(
+            fouling_pct, [FOULING_CONDENSER_MINOR_PCT, FOULING_CONDENSER_MAJOR_PCT]
+        ).astype(np.int8)
     
-    return fouling_pct, fouling_severity
+    return fouling_pct, severity_codes
 ```
 
 ---
@@ -531,72 +564,110 @@ def signal_preservation_and_cop(df_stage3: pd.DataFrame) -> Tuple[pd.DataFrame,
     Returns:
         (df_stage4, metrics_json)
     """
-    df = df_stage3.copy()
-    M = len(df)
+    M = len(df_stage3)
+    
+    # Pull the raw arrays once (no df.copy(), no repeated .values lookups)
+    chwst = df_stage3['chwst'].to_numpy(dtype=float)
+    cdwrt = df_stage3['cdwrt'].to_numpy(dtype=float)
+    flow_m3s = df_stage3['flow_m3s'].to_numpy(dtype=float)
+    power_kw = df_stage3['power_kw'].to_numpy(dtype=float)
+    
+    # Quality columns as int8-backed Categoricals (no-op for Stage 3 output)
+    quality_columns = {
+        f'{col}_align_quality': df_stage3[f'{col}_align_quality'].astype(
+            pd.CategoricalDtype(ALIGN_QUALITY_LEVELS)
+        )
+        for col in ('chwst', 'chwrt', 'cdwrt', 'flow_m3s', 'power_kw')
+        if f'{col}_align_quality' in df_stage3
+    }
     
     # 1. Compute temperature differentials
-    delta_t_chw, lift = compute_temperature_differentials(df)
+    delta_t_chw, lift = compute_temperature_differentials(df_stage3)
     delta_t_chw, lift = validate_temperature_differentials(delta_t_chw, lift)
     
-    df['delta_t_chw'] = delta_t_chw
-    df['lift'] = lift
-    
     # 2. Compute cooling load
-    q_evap = compute_cooling_load(df['flow_m3s'].values, delta_t_chw)
-    q_confidence = compute_q_confidence(df, q_evap)
-    
-    df['q_evap_kw'] = q_evap
-    df['q_confidence'] = q_confidence
-    df['q_valid'] = ~np.isnan(q_evap)
+    q_evap = compute_cooling_load(flow_m3s, delta_t_chw)
+    q_nan = np.isnan(q_evap)  # Computed once, reused below
+    q_confidence = compute_q_confidence(df_stage3, q_evap, delta_t_chw, q_nan=q_nan)
     
     # 3. Compute COP
-    cop, cop_valid = compute_cop(q_evap, df['power_kw'].values)
+    cop, cop_valid = compute_cop(q_evap, power_kw)
+    cop_nan = np.isnan(cop)  # Computed once, reused below
     cop_confidence = compute_cop_confidence(
         q_confidence,
-        df['power_kw_align_quality'].values,
-        cop
+        quality_columns['power_kw_align_quality'],
+        cop,
+        cop_nan=cop_nan
     )
     
-    df['cop'] = cop
-    df['cop_confidence'] = cop_confidence
-    df['cop_valid'] = cop_valid | np.isnan(cop)  # False only if valid data
-    
     # 4. Compute Carnot COP
-    cop_carnot = compute_carnot_cop(df['chwst'].values, lift)
-    cop_normalized = np.divide(cop, cop_carnot, where=cop_carnot > 0, out=np.full_like(cop, np.nan))
-    
-    df['cop_carnot'] = cop_carnot
-    df['cop_normalized'] = cop_normalized
+    cop_carnot = compute_carnot_cop(chwst, lift)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cop_normalized = cop / cop_carnot
+    cop_normalized[~(cop_carnot > 0)] = np.nan
     
     # 5. Detect hunting
-    hunt_flag, hunt_severity, hunt_stats = detect_hunting_all_windows(df)
+    hunt_flag, hunt_severity_codes, hunt_stats = detect_hunting_all_windows(df_stage3)
     hunt_confidence = np.where(
         hunt_flag, 0.95,
         np.where(hunt_stats['hunt_pct'] > 1.0, 0.50, 0.00)
     )
     
-    df['hunt_flag'] = hunt_flag
-    df['hunt_severity'] = hunt_severity
-    df['hunt_confidence'] = hunt_confidence
-    
     # 6. Compute fouling
-    fouling_evap_pct, fouling_evap_severity = compute_fouling_evap(
-        df['flow_m3s'].values,
+    fouling_evap_pct, fouling_evap_codes = compute_fouling_evap(
+        flow_m3s,
         q_evap
     )
-    fouling_cond_pct, fouling_cond_severity = compute_fouling_condenser(
-        df['cdwrt'].values,
-        df['chwst'].values,
+    fouling_cond_pct, fouling_cond_codes = compute_fouling_condenser(
+        cdwrt,
+        chwst,
         lift
     )
     
-    df['fouling_evap_pct'] = fouling_evap_pct
-    df['fouling_evap_severity'] = fouling_evap_severity
-    df['fouling_condenser_pct'] = fouling_cond_pct
-    df['fouling_condenser_severity'] = fouling_cond_severity
-    
     fouling_confidence = np.full(M, 0.60)  # Base low confidence
-    df['fouling_confidence'] = fouling_confidence
+    
+    # Validity flags as numpy bool_ arrays; counts via np.count_nonzero
+    q_valid = ~q_nan
+    cop_present = ~cop_nan
+    q_valid_count = np.count_nonzero(q_valid)
+    cop_valid_count = np.count_nonzero(cop_present)
+    
+    # Compact valid values once; mean/std reuse them (no per-stat NaN scans)
+    q_values = q_evap[q_valid]
+    cop_values = cop[cop_present]
+    
+    # Assemble output once: Stage 3 columns + Stage 4 results
+    df = pd.DataFrame(
+        {
+            **{col: df_stage3[col] for col in df_stage3.columns},
+            **quality_columns,
+            'delta_t_chw': delta_t_chw,
+            'lift': lift,
+            'q_evap_kw': q_evap,
+            'q_confidence': q_confidence,
+            'q_valid': q_valid,
+            'cop': cop,
+            'cop_confidence': cop_confidence,
+            'cop_valid': cop_valid | cop_nan,  # False only if valid data
+            'cop_carnot': cop_carnot,
+            'cop_normalized': cop_normalized,
+            'hunt_flag': hunt_flag,
+            'hunt_severity': pd.Categorical.from_codes(
+                hunt_severity_codes, categories=HUNT_SEVERITY_LEVELS
+            ),
+            'hunt_confidence': hunt_confidence,
+            'fouling_evap_pct': fouling_evap_pct,
+            'fouling_evap_severity': pd.Categorical.from_codes(
+                fouling_evap_codes, categories=FOULING_SEVERITY_LEVELS
+            ),
+            'fouling_condenser_pct': fouling_cond_pct,
+            'fouling_condenser_severity': pd.Categorical.from_codes(
+                fouling_cond_codes, categories=FOULING_SEVERITY_LEVELS
+            ),
+            'fouling_confidence': fouling_confidence,
+        },
+        index=df_stage3.index
+    )
     
     # 7. Compute metrics
     metrics = {
@@ -605,17 +676,17 @@ def signal_preservation_and_cop(df_stage3: pd.DataFrame) -> Tuple[pd.DataFrame,
         'timestamp_end': str(df['timestamp'].max()),
         'total_rows': M,
         'load_analysis': {
-            'q_valid_count': int(df['q_valid'].sum()),
-            'q_valid_pct': 100.0 * df['q_valid'].sum() / M,
-            'q_mean_kw': float(df['q_evap_kw'].mean()),
-            'q_std_kw': float(df['q_evap_kw'].std()),
+            'q_valid_count': q_valid_count,
+            'q_valid_pct': 100.0 * q_valid_count / M if M > 0 else 0.0,
+            'q_mean_kw': float(q_values.mean()) if q_valid_count > 0 else np.nan,
+            'q_std_kw': float(q_values.std(ddof=1)) if q_valid_count > 1 else np.nan,
             'q_confidence_mean': float(q_confidence.mean())
         },
         'cop_analysis': {
-            'cop_valid_count': int((~np.isnan(cop)).sum()),
-            'cop_valid_pct': 100.0 * (~np.isnan(cop)).sum() / M,
-            'cop_mean': float(np.nanmean(cop)),
-            'cop_std': float(np.nanstd(cop)),
+            'cop_valid_count': cop_valid_count,
+            'cop_valid_pct': 100.0 * cop_valid_count / M if M > 0 else 0.0,
+            'cop_mean': float(cop_values.mean()) if cop_valid_count > 0 else np.nan,
+            'cop_std': float(cop_values.std()) if cop_valid_count > 0 else np.nan,
             'cop_normalized_median': float(np.nanmedian(cop_normalized)),
             'cop_confidence_mean': float(cop_confidence.mean())
         },
@@ -1,357 +1,123 @@
 
 # Create comprehensive summary of Stage 4 deliverables
 
-summary = """
-╔════════════════════════════════════════════════════════════════════════════════════════════════════╗
-║                                                                                                    ║
-║                     HTDAM v2.0 STAGE 4 COMPLETE DELIVERY PACKAGE                                  ║
-║                                                                                                    ║
-║                        Signal Preservation & COP Calculation                                      ║
-║                                                                                                    ║
-║                                Generated: 2025-12-08                                              ║
-║                                Status: ✅ READY FOR IMPLEMENTATION                               ║
-║                                                                                                    ║
-╚════════════════════════════════════════════════════════════════════════════════════════════════════╝
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📦 STAGE 4 ARTIFACTS (4 FILES)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-[file:179] HTDAM_Stage4_Impl_Guide.md
-├─ Status: ✅ COMPLETE
-├─ Size: 11 sections (~8,000 words)
-├─ Purpose: Complete algorithm specification for your programmer
-├─ Contents:
-│  ├─ Stage 4 overview (goals, inputs, outputs)
-│  ├─ Core calculations (temperature, load, COP, Carnot)
-│  ├─ Hunting detection algorithm (sliding window, reversals, frequency)
-│  ├─ Fouling analysis (evaporator UFOA, condenser lift)
-│  ├─ Component-level confidence scoring (Q, COP, hunt, fouling)
-│  ├─ Output format (dataframe columns + metrics JSON)
-│  ├─ Edge cases & troubleshooting (7 scenarios)
-│  ├─ Implementation checklist (14 items)
-│  ├─ Expected BarTech outputs
-│  ├─ FAQ (6 questions)
-│  └─ Constants summary (copy-paste ready)
-└─ Use: READ FIRST before implementation
-
-[file:180] HTDAM_Stage4_Python_Sketch.py
-├─ Status: ✅ COMPLETE
-├─ Size: 400+ lines, production-ready skeleton
-├─ Language: Python 3.8+
-├─ Purpose: 90% complete implementation; programmer extends
-├─ Includes:
-│  ├─ Constants block (copy into htdam_constants.py)
-│  ├─ compute_temperature_differentials() [2.1]
-│  ├─ validate_temperature_differentials() [2.1]
-│  ├─ compute_cooling_load() [2.2]
-│  ├─ compute_q_confidence() [2.2]
-│  ├─ compute_cop() [2.3]
-│  ├─ compute_cop_confidence() [2.3]
-│  ├─ compute_carnot_cop() [2.4]
-│  ├─ detect_hunting_in_window() [5.1]
-│  ├─ detect_hunting_all_windows() [5.1]
-│  ├─ compute_fouling_evap() [6.1]
-│  ├─ compute_fouling_condenser() [6.2]
-│  ├─ signal_preservation_and_cop() [main orchestration]
-│  ├─ run_stage4() [integration with useOrchestration]
-│  └─ Docstrings and type hints throughout
-└─ Use: COPY & IMPLEMENT functions
-
-[file:181] HTDAM_Stage4_Metrics_Schema.json
-├─ Status: ✅ COMPLETE
-├─ Type: JSON Schema (draft-07 compliant)
-├─ Size: Full schema with example
-├─ Purpose: Validate metrics output
-├─ Validates:
-│  ├─ stage = "SPOC" (Signal Preservation & COP)
-│  ├─ timestamp bounds (ISO 8601)
-│  ├─ Load analysis (Q valid count, mean, std, confidence)
-│  ├─ COP analysis (COP valid count, mean, normalized, confidence)
-│  ├─ Hunt analysis (windows analyzed, detected, severity breakdown)
-│  ├─ Fouling analysis (evaporator %, condenser %)
-│  ├─ Power integration (coverage %, missing %)
-│  ├─ Overall statistics (component confidences)
-│  ├─ stage4_confidence (0.78–0.85 typical)
-│  ├─ Warnings, errors, halt flag
-│  └─ Full BarTech example included
-└─ Use: VALIDATE output in tests
-
-[file:182] HTDAM_Stage4_Summary.md
-├─ Status: ✅ COMPLETE
-├─ Type: Integration & Testing Guide
-├─ Size: 350 lines (~5,000 words)
-├─ Purpose: Comprehensive overview, checklist, testing
-├─ Includes:
-│  ├─ Executive summary (60 seconds)
-│  ├─ Artifacts overview (this table)
-│  ├─ What your programmer gets (checklist)
-│  ├─ Key design decisions & rationale (5 decisions)
-│  ├─ Implementation checklist (6 phases, 10 days)
-│  ├─ Expected BarTech outputs (metrics & values)
-│  ├─ Integration points (input/output, useOrchestration wiring)
-│  ├─ Common mistakes to avoid (6 items)
-│  ├─ Performance targets (<10 seconds for 35k rows)
-│  ├─ FAQ (5 questions)
-│  ├─ What comes next (Stage 5)
-│  ├─ Success criteria (10 checkpoints)
-│  └─ Timeline summary (9–13 days)
-└─ Use: REFERENCE during implementation & testing
-
-
-UPDATED MASTER INDEX:
-
-[file:183] HTDAM_Master_Index_v2.md
-├─ Status: ✅ COMPLETE
-├─ Type: Project Master Index
-├─ Updates: Added Stage 4 (was Stage 1–3 only)
-├─ Contains:
-│  ├─ Complete inventory of all 19 artifacts
-│  ├─ Stage 1–4 specifications (11 artifacts)
-│  ├─ Foundation & handoff documents (4 artifacts)
-│  ├─ Combined timeline (28–42 days total)
-│  ├─ Success criteria for all 4 stages
-│  ├─ Updated file structure for handoff
-│  └─ Quick reference links
-└─ Use: MASTER REFERENCE for entire project
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🎯 STAGE 4 KEY SPECIFICATIONS
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-COOLING LOAD CALCULATION:
-  Q [kW] = flow [m³/s] × 1000 [kg/m³] × 4.186 [kJ/kg·K] × ΔT [K] / 1000
-         = flow × 4.186 × ΔT
-
-COP CALCULATION:
-  COP [dimensionless] = Q [kW] / Power [kW]
-  Valid range: 2.0–7.0 (centrifugal chillers)
-
-CARNOT EFFICIENCY (THEORETICAL MAXIMUM):
-  COP_carnot = (T_evap [K]) / (T_condenser [K] − T_evap [K])
-             = (chwst + 273.15) / lift [K]
-
-TEMPERATURE DIFFERENTIALS:
-  ΔT_chw = chwrt − chwst [°C]  (chilled water effectiveness)
-  Lift = cdwrt − chwst [°C]    (compressor work requirement)
-
-HUNTING DETECTION:
-  ├─ Method: Sliding 24-hour window, count setpoint reversals
-  ├─ Frequency: cycles/hour = reversals / time_span_hours
-  ├─ MINOR: 0.2–1.0 cycles/hour
-  ├─ MAJOR: ≥1.0 cycles/hour
-  └─ Confidence: 0.95 (detected), 0.50 (borderline), 0.00 (not detected)
-
-FOULING DETECTION:
-  ├─ Evaporator: UFOA change (fouling % = (1 − UFOA_current/UFOA_baseline) × 100)
-  ├─ Condenser: Lift change (fouling % = ((lift_current/lift_baseline) − 1) × 100)
-  ├─ Severity thresholds:
-  │  ├─ CLEAN: <10% (evap), <5% (condenser)
-  │  ├─ MINOR_FOULING: 10–25% (evap), 5–15% (condenser)
-  │  └─ MAJOR_FOULING: >25% (evap), >15% (condenser)
-  └─ Confidence: 0.60 base (inherently lower; hard to measure)
-
-COMPONENT-LEVEL CONFIDENCE SCORES:
-  ├─ q_confidence [0.0–1.0]      = stage 3 base × (1 − penalties)
-  ├─ cop_confidence [0.0–1.0]    = q_confidence × power_confidence
-  ├─ hunt_confidence [0.0–1.0]   = 0.95 (detected) or 0.00 (not)
-  └─ fouling_confidence [0.0–1.0] = 0.60 base + adjustments
-
-STAGE 4 FINAL CONFIDENCE:
-  stage4_confidence = mean(q_confidence, cop_confidence, hunt_confidence, fouling_confidence)
-                    − penalties (power coverage, observation period, etc.)
-  Expected (BarTech): 0.78 (±0.05)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📋 IMPLEMENTATION TIMELINE (STAGE 4)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Phase 1: Setup
-├─ Days: 1
-├─ Tasks: Create module, copy constants, set up test fixtures
-└─ Status: ✅ Ready
-
-Phase 2: Temperature & Load
-├─ Days: 2–3
-├─ Tasks: ΔT/lift, load calculation, Q confidence
-└─ Status: ✅ Skeleton provided
-
-Phase 3: COP Calculation
-├─ Days: 2
-├─ Tasks: COP, COP confidence, Carnot efficiency
-└─ Status: ✅ Skeleton provided
-
-Phase 4: Hunting & Fouling
-├─ Days: 2–3
-├─ Tasks: Hunt detection, fouling analysis, severity classification
-└─ Status: ✅ Skeleton provided
-
-Phase 5: Orchestration & Metrics
-├─ Days: 1–2
-├─ Tasks: Main function, dataframe assembly, metrics JSON
-└─ Status: ✅ Skeleton provided
-
-Phase 6: Testing & Validation
-├─ Days: 1–2
-├─ Tasks: BarTech validation, schema validation, edge cases
-└─ Status: ✅ Expected outputs provided
-
-TOTAL: 9–13 days (with some overlap possible)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📊 EXPECTED BARTECH OUTPUTS (STAGE 4)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Input:  35,136 grid rows (from Stage 3)
-Output: 35,136 rows (with 14+ new columns)
-
-LOAD ANALYSIS:
-├─ q_valid_pct: 93.8% (±2%)
-├─ q_mean_kw: 45.2 (±5)
-├─ q_std_kw: 12.5
-├─ delta_t_mean_c: 4.2
-└─ q_confidence_mean: 0.85
-
-COP ANALYSIS:
-├─ cop_valid_pct: 81.0% (±2%)     ← Power coverage gap
-├─ cop_mean: 4.5 (±0.3)
-├─ cop_std: 0.8
-├─ cop_normalized_median: 0.40 (±0.03)
-└─ cop_confidence_mean: 0.78
-
-HUNT ANALYSIS:
-├─ hunt_windows_analyzed: 366
-├─ hunt_detected_windows: 18
-├─ hunt_pct: 4.9% (±1%)
-├─ Severity breakdown:
-│  ├─ NONE: 348
-│  ├─ MINOR: 15
-│  └─ MAJOR: 3
-└─ hunt_confidence_mean: 0.70
-
-FOULING ANALYSIS:
-├─ evaporator_fouling_mean_pct: 8.2% (±2%)
-├─ evaporator_severity:
-│  ├─ CLEAN: 280
-│  ├─ MINOR_FOULING: 80
-│  └─ MAJOR_FOULING: 6
-├─ condenser_fouling_mean_pct: 12.5% (±3%)
-├─ condenser_severity:
-│  ├─ CLEAN: 250
-│  ├─ MINOR_FOULING: 100
-│  └─ MAJOR_FOULING: 16
-└─ fouling_confidence_mean: 0.55
-
-OVERALL:
-├─ component_confidence_mean: 0.72
-├─ stage4_confidence: 0.78 (±0.05)
-├─ penalty: −0.10
-├─ halt: false
-└─ warnings: ["Power coverage only 81%", "Fouling confidence reduced"]
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✅ COMPLETE PROJECT TIMELINE (ALL 4 STAGES)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Stage 1: Unit Verification          3–5 days
-Stage 2: Gap Detection              4–7 days
-Stage 3: Timestamp Synchronization  7–9 days
-Stage 4: Signal & COP              7–9 days
-─────────────────────────────────────────
-Integration & Testing              2–3 days
-─────────────────────────────────────────
-TOTAL:                             28–42 days (6–8 weeks)
-
-Parallel execution possible (Stages 1 & 2 can overlap):
-  Optimized path: 4–5 weeks with overlapping work
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🎓 WHAT YOUR PROGRAMMER GETS (STAGE 4)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✅ Complete algorithm specifications (zero ambiguity)
-✅ 400+ lines of production-ready Python skeleton
-✅ JSON schema for metrics validation
-✅ 7 edge cases pre-solved with solutions
-✅ Expected BarTech outputs (exact values)
-✅ Unit test cases
-✅ Integration pattern (useOrchestration wiring)
-✅ Performance targets (<10 seconds for 35k rows)
-✅ 6-phase implementation checklist
-✅ Common mistakes guide
-✅ Constants copy-paste ready
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🔗 HOW TO USE THIS PACKAGE
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-FOR PROJECT OWNER:
-1. Read [file:183] Master Index (5-minute overview of all 4 stages)
-2. Share [file:172] Handoff guide + [file:155] Physics foundation with programmer
-3. Provide BarTech CSV test data
-4. Track progress weekly (timeline: 28–42 days total)
-5. Verify test outputs match expected values
-6. Approve for Stage 5 after Stage 4 complete
-
-FOR PROGRAMMER:
-1. Read [file:183] Master Index (understand full context)
-2. For Stage 4 specifically:
-   a. Read [file:179] HTDAM_Stage4_Impl_Guide.md (complete spec)
-   b. Review [file:180] HTDAM_Stage4_Python_Sketch.py (skeleton code)
-   c. Follow [file:182] HTDAM_Stage4_Summary.md (checklist & testing)
-   d. Validate against [file:181] HTDAM_Stage4_Metrics_Schema.json
-3. Implement 6 phases over 9–13 days
-4. Test on BarTech data (expected outputs provided)
-5. Deliver dataframe + metrics JSON + clean code
-6. Request Stage 5 spec when ready
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✨ WHAT MAKES STAGE 4 SPECIAL
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✅ COP is your key energy metric (% savings = (1 − COP_new/COP_baseline) × 100)
-✅ Fouling detection drives maintenance strategy
-✅ Hunting detection identifies control instability
-✅ Component-level confidence allows downstream (Stage 5) precision use
-✅ Graceful degradation (no HALT on power missing; reduce confidence instead)
-✅ Production code provided (not pseudocode; 90% complete)
-✅ All edge cases covered (power missing, fouling baseline absent, etc.)
-✅ Metrics validated via JSON schema (not approximate)
-✅ BarTech outputs specified exactly (test to known values)
-✅ Implementation checklist prevents missed steps
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-╔════════════════════════════════════════════════════════════════════════════════════════════════════╗
-║                                                                                                    ║
-║                        ✅ STAGE 4 READY FOR IMPLEMENTATION                                       ║
-║                                                                                                    ║
-║                      All 4 artifacts delivered (19 total project files)                            ║
-║                    Your programmer can start immediately (Phase 1: Day 1)                         ║
-║                                                                                                    ║
-║                      Expected delivery: 9–13 days (Stage 4), 28–42 days (all)                    ║
-║                                                                                                    ║
-╚════════════════════════════════════════════════════════════════════════════════════════════════════╝
-
-Generated: 2025-12-08
-Status: ✅ COMPLETE & PRODUCTION-READY
-Quality: Physics-correct, edge-case aware, test-validated
-"""
-
-print(summary)
+import argparse
+import json
+import shutil
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+# The summary is static text, shipped pre-rendered next to this script
+SUMMARY_PATH = Path(__file__).parent / "stage4_summary.txt"
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """One Stage 4 deliverable, as listed in the summary."""
+    file_id: int
+    name: str
+    status: str
+    size: Optional[str]
+    purpose: Optional[str]
+    use: str
+
+
+# Machine-readable manifest of the artifacts described in stage4_summary.txt
+ARTIFACTS: Tuple[Artifact, ...] = (
+    Artifact(
+        file_id=179,
+        name="HTDAM_Stage4_Impl_Guide.md",
+        status="COMPLETE",
+        size="11 sections (~8,000 words)",
+        purpose="Complete algorithm specification for your programmer",
+        use="READ FIRST before implementation",
+    ),
+    Artifact(
+        file_id=180,
+        name="HTDAM_Stage4_Python_Sketch.py",
+        status="COMPLETE",
+        size="400+ lines, production-ready skeleton",
+        purpose="90% complete implementation; programmer extends",
+        use="COPY & IMPLEMENT functions",
+    ),
+    Artifact(
+        file_id=181,
+        name="HTDAM_Stage4_Metrics_Schema.json",
+        status="COMPLETE",
+        size="Full schema with example",
+        purpose="Validate metrics output",
+        use="VALIDATE output in tests",
+    ),
+    Artifact(
+        file_id=182,
+        name="HTDAM_Stage4_Summary.md",
+        status="COMPLETE",
+        size="350 lines (~5,000 words)",
+        purpose="Comprehensive overview, checklist, testing",
+        use="REFERENCE during implementation & testing",
+    ),
+    Artifact(
+        file_id=183,
+        name="HTDAM_Master_Index_v2.md",
+        status="COMPLETE",
+        size=None,
+        purpose=None,
+        use="MASTER REFERENCE for entire project",
+    ),
+)
+
+
+def manifest() -> dict:
+    """Stage 4 deliverables as plain data (no banner rendering)."""
+    return {
+        "stage": 4,
+        "name": "Signal Preservation & COP Calculation",
+        "generated_date": "2025-12-08",
+        "artifacts": [asdict(artifact) for artifact in ARTIFACTS],
+    }
+
+
+def render() -> str:
+    """Human-readable Stage 4 summary banner."""
+    return SUMMARY_PATH.read_text(encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the HTDAM v2.0 Stage 4 deliverables summary")
+    parser.add_argument(
+        "--format",
+        choices=["json", "report", "both"],
+        default="report",
+        help="json: artifact manifest; report: human-readable summary (default); both: json then report",
+    )
+    args = parser.parse_args()
+
+    # Text-only stdout (redirect_stdout(io.StringIO()), pytest's capsys) has
+    # no byte buffer; write decoded text there instead
+    buffer = getattr(sys.stdout, "buffer", None)
+
+    # Flush pending text first so byte writes keep ordering
+    sys.stdout.flush()
+
+    if args.format in ("json", "both"):
+        manifest_json = json.dumps(manifest(), indent=2, ensure_ascii=False) + "\n"
+        if buffer is None:
+            sys.stdout.write(manifest_json)
+        else:
+            buffer.write(manifest_json.encode("utf-8"))
+
+    if args.format in ("report", "both"):
+        if buffer is None:
+            sys.stdout.write(SUMMARY_PATH.read_text(encoding="utf-8"))
+        else:
+            # Stream the banner's bytes straight to stdout
+            with SUMMARY_PATH.open("rb") as summary:
+                shutil.copyfileobj(summary, buffer)
+
+    if buffer is not None:
+        buffer.flush()
+
+if __name__ == "__main__":
+    main()
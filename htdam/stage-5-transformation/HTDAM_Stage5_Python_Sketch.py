@@ -3,8 +3,8 @@
 
 **Date**: 2025-12-08  
 **Status**: Production-ready skeleton code  
-**Language**: Python 3.8+  
-**Dependencies**: pandas, numpy, json
+**Language**: Python 3.9+ (asyncio.to_thread)  
+**Dependencies**: pandas, numpy, json, pyarrow (Parquet export), orjson (optional, metrics JSON)
 
 ---
 
@@ -25,10 +25,15 @@ QUALITY_TIER_B = 0.80      # Suitable for analysis
 QUALITY_TIER_C = 0.70      # Use with caution
 QUALITY_TIER_D = 0.60      # Limited use
 QUALITY_TIER_F = 0.00      # Do not use
+QUALITY_TIER_LEVELS = ['TIER_A', 'TIER_B', 'TIER_C', 'TIER_D', 'TIER_F']
 
 # Export Formats
 EXPORT_FORMATS = ['CSV', 'PARQUET', 'JSON']
-DEFAULT_EXPORT_FORMAT = 'CSV'
+DEFAULT_EXPORT_FORMAT = 'PARQUET'  # CSV is opt-in (slower, ~6x larger)
+CSV_LARGE_EXPORT_ROWS = 1_000_000   # Warn when CSV is chosen above this
+CSV_CHUNK_ROWS = 200_000            # Rows serialized per CSV write
+PARQUET_ROW_GROUP_SIZE = 100_000    # Rows converted & written per chunk
+CATEGORY_MAX_UNIQUE_RATIO = 0.01    # String columns below this → category
 
 # Data Quality Row Thresholds
 HIGH_QUALITY_ROW_THRESHOLD = 0.80
@@ -48,9 +53,13 @@ HUNT_MAJOR_THRESHOLD_PCT = 10.0
 ## 2. Final Confidence Calculation
 
 ```python
+import bisect
+import re
+import types
+import warnings
 import numpy as np
 import pandas as pd
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
 def calculate_final_confidence(
     stage1_confidence: float,
@@ -93,6 +102,11 @@ def calculate_final_confidence(
     return round(final, 4)
 
 
+# Ascending tier floors above TIER_F and the tier reached at each bisect index
+_TIER_THRESHOLDS = (QUALITY_TIER_D, QUALITY_TIER_C, QUALITY_TIER_B, QUALITY_TIER_A)
+_TIER_NAMES = ('TIER_F', 'TIER_D', 'TIER_C', 'TIER_B', 'TIER_A')
+
+
 def assign_quality_tier(confidence: float) -> str:
     """
     Assign quality tier based on confidence score.
@@ -103,28 +117,24 @@ def assign_quality_tier(confidence: float) -> str:
     Returns:
         Tier string (TIER_A, TIER_B, TIER_C, TIER_D, TIER_F)
     """
-    if confidence >= QUALITY_TIER_A:
-        return "TIER_A"
-    elif confidence >= QUALITY_TIER_B:
-        return "TIER_B"
-    elif confidence >= QUALITY_TIER_C:
-        return "TIER_C"
-    elif confidence >= QUALITY_TIER_D:
-        return "TIER_D"
-    else:
+    if confidence != confidence:  # NaN would bisect past every floor
         return "TIER_F"
+    return _TIER_NAMES[bisect.bisect_right(_TIER_THRESHOLDS, confidence)]
+
+
+# Read-only, built once at import (not per call)
+_TIER_INTERPRETATIONS = types.MappingProxyType({
+    'TIER_A': "Production-ready, high confidence",
+    'TIER_B': "Suitable for analysis, monitor edge cases",
+    'TIER_C': "Use with caution, verify key metrics",
+    'TIER_D': "Limited use, significant gaps present",
+    'TIER_F': "Do not use without expert review"
+})
 
 
 def get_tier_interpretation(tier: str) -> str:
     """Get human-readable interpretation of quality tier."""
-    interpretations = {
-        'TIER_A': "Production-ready, high confidence",
-        'TIER_B': "Suitable for analysis, monitor edge cases",
-        'TIER_C': "Use with caution, verify key metrics",
-        'TIER_D': "Limited use, significant gaps present",
-        'TIER_F': "Do not use without expert review"
-    }
-    return interpretations.get(tier, "Unknown tier")
+    return _TIER_INTERPRETATIONS.get(tier, "Unknown tier")
 ```
 
 ---
@@ -132,6 +142,9 @@ def get_tier_interpretation(tier: str) -> str:
 ## 3. Stage 5 Column Addition
 
 ```python
+_COLUMN_NAME_INVALID = re.compile(r'[^a-z0-9_]')  # Compiled once at import
+
+
 def add_stage5_columns(
     df: pd.DataFrame,
     quality_tier: str,
@@ -140,89 +153,176 @@ def add_stage5_columns(
     """
     Add Stage 5 derived columns to dataframe.
     
+    Mutates df in place (no copy of the wide Stage 4 frame) and returns it;
+    use add_stage5_columns_copy() if the caller still needs the input.
+    
     Args:
-        df: Stage 4 dataframe (35+ columns)
+        df: Stage 4 dataframe (35+ columns); mutated
         quality_tier: From assign_quality_tier()
         baseline_cop: Nameplate COP (typical 4.5)
     
     Returns:
-        Extended dataframe with Stage 5 columns
+        Extended dataframe with Stage 5 columns (same object as df)
     """
-    df = df.copy()
+    # Input columns as a set: O(1) membership instead of an Index scan per test
+    cols = set(df.columns)
     
     # Optional: COP vs baseline
-    if 'cop' in df.columns:
+    if 'cop' in cols:
         df['cop_vs_baseline_pct'] = np.where(
             (df['cop'].notna()) & (baseline_cop > 0),
             ((df['cop'] / baseline_cop) - 1) * 100,
             np.nan
         )
     
-    # Optional: Maintenance flags
-    if 'fouling_evap_severity' in df.columns:
-        df['needs_cleaning'] = df['fouling_evap_severity'] == 'MAJOR_FOULING'
+    # Optional: Maintenance flags (numpy compares → 1-byte bool_ columns,
+    # never object; written as Parquet BOOLEAN)
+    if 'fouling_evap_severity' in cols:
+        df['needs_cleaning'] = df['fouling_evap_severity'].to_numpy() == 'MAJOR_FOULING'
     
-    if 'hunt_severity' in df.columns:
-        df['needs_investigation'] = (
-            (df['hunt_flag'] == True) & (df['hunt_severity'] == 'MAJOR')
+    if 'hunt_severity' in cols:
+        df['needs_investigation'] = np.logical_and(
+            df['hunt_flag'].to_numpy() == True,  # NaN/None → False
+            df['hunt_severity'].to_numpy() == 'MAJOR'
         )
     
     # Data quality row score (average of 3 component confidences)
     quality_cols = ['q_confidence', 'cop_confidence', 'fouling_confidence']
-    if all(col in df.columns for col in quality_cols):
-        df['data_row_quality'] = df[quality_cols].mean(axis=1)
-        df['is_high_quality_row'] = df['data_row_quality'] >= HIGH_QUALITY_ROW_THRESHOLD
-        df['is_usable_row'] = df['data_row_quality'] >= USABLE_ROW_THRESHOLD
-    
-    # Pipeline meta
-    df['final_confidence'] = float(
-        list(df['confidence'].values)[0]
-        if 'confidence' in df.columns
+    if cols.issuperset(quality_cols):
+        # One (M, 3) array and np.nanmean, not a row-wise pandas reduction;
+        # all-NaN rows give NaN (as skipna mean does) without the warning
+        qarr = np.stack([df[col].to_numpy(dtype=float) for col in quality_cols], axis=1)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            row_quality = np.nanmean(qarr, axis=1)
+        df['data_row_quality'] = row_quality
+        df['is_high_quality_row'] = row_quality >= HIGH_QUALITY_ROW_THRESHOLD
+        df['is_usable_row'] = row_quality >= USABLE_ROW_THRESHOLD
+    
+    # Pipeline meta (scalar broadcast; iat[0] reads one value, no list copy)
+    df['final_confidence'] = np.float32(
+        df['confidence'].iat[0]
+        if 'confidence' in cols
         else 0.85  # Expected BarTech value
     )
-    df['quality_tier'] = quality_tier
+    # Scalar tier as int8 codes over the fixed tier set, not N string refs
+    df['quality_tier'] = pd.Categorical.from_codes(
+        np.full(len(df), QUALITY_TIER_LEVELS.index(quality_tier), dtype=np.int8),
+        categories=QUALITY_TIER_LEVELS
+    )
     
     return df
 
 
+def add_stage5_columns_copy(
+    df: pd.DataFrame,
+    quality_tier: str,
+    baseline_cop: float = BASELINE_COP_TYPICAL
+) -> pd.DataFrame:
+    """add_stage5_columns() on a copy, leaving the input dataframe untouched."""
+    return add_stage5_columns(df.copy(), quality_tier, baseline_cop)
+
+
 def cleanup_for_export(df: pd.DataFrame) -> pd.DataFrame:
     """
     Final data cleanup before export.
     
+    Mutates df in place (column names, timestamp, rounding) before the
+    final sort; no defensive copy of the frame.
+    
     Args:
-        df: Stage 5 dataframe with all columns
+        df: Stage 5 dataframe with all columns; mutated
     
     Returns:
         Clean dataframe ready for export
     """
-    df = df.copy()
-    
-    # Standardize column names (snake_case)
-    df.columns = (
-        df.columns.str.lower()
-        .str.replace(' ', '_')
-        .str.replace('[^a-z0-9_]', '', regex=True)
-    )
-    
-    # Ensure timestamp is ISO 8601 string
+    # Standardize column names (snake_case); skip reassignment if already clean
+    columns = [
+        _COLUMN_NAME_INVALID.sub('', col.lower().replace(' ', '_'))
+        for col in df.columns
+    ]
+    if columns != list(df.columns):
+        df.columns = columns
+    
+    # Keep timestamp as native datetime64[ns, UTC] (Parquet TIMESTAMP);
+    # text exports stringify via _stringify_timestamps_for_text()
     if 'timestamp' in df.columns:
-        df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-    
-    # Round numeric columns to 4 decimal places
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    df[numeric_cols] = df[numeric_cols].round(4)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+    
+    # Column dtypes read once (post-rename); rounding and the category
+    # pass below both select from this instead of select_dtypes scans
+    dtypes = df.dtypes
+    
+    # Round numeric columns to 4 decimal places: one 2-D array per float
+    # dtype, rounded in place with the same ×1e4 → rint → ÷1e4 as round(4)
+    # (integer columns are already exact)
+    float_dtypes = dtypes[[d.kind == 'f' for d in dtypes]]
+    for dtype in float_dtypes.unique():
+        cols = float_dtypes.index[float_dtypes == dtype]
+        values = df[cols].to_numpy()
+        scale = values.dtype.type(1e4)
+        np.multiply(values, scale, out=values)
+        np.rint(values, out=values)
+        np.divide(values, scale, out=values)
+        df[cols] = values
+    
+    # Low-cardinality string columns (severities, quality labels) → category:
+    # int8 codes + small dictionary in memory, reused as the Parquet dictionary
+    for col in dtypes.index[(dtypes == object).to_numpy()]:
+        if df[col].nunique() < CATEGORY_MAX_UNIQUE_RATIO * len(df):
+            df[col] = df[col].astype('category')
     
     # Verify critical columns are not entirely NaN
-    critical_cols = ['timestamp', 'chwst', 'chwrt', 'cdwrt', 'flow_m3s']
-    for col in critical_cols:
-        if col in df.columns and df[col].isna().all():
-            raise ValueError(f"Critical column '{col}' is entirely NaN")
+    check_critical_columns(df)
     
     # Sort by timestamp (ensure temporal order)
     if 'timestamp' in df.columns:
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        df = df.sort_values('timestamp', kind='stable', ignore_index=True)
     
     return df
+
+
+def check_critical_columns(df: pd.DataFrame) -> None:
+    """
+    Raise ValueError if a critical column present in df is entirely NaN.
+    
+    Read-only, so transformation_and_export can run it before any in-place step.
+    """
+    critical_cols = ['timestamp', 'chwst', 'chwrt', 'cdwrt', 'flow_m3s']
+    present = [col for col in critical_cols if col in df.columns]
+    all_nan = df[present].isna().all(axis=0)  # One batched pass
+    if all_nan.any():
+        col = all_nan.index[all_nan.to_numpy()][0]  # First in critical order
+        raise ValueError(f"Critical column '{col}' is entirely NaN")
+
+
+def _iso_utc_strings(timestamps) -> np.ndarray:
+    """
+    ISO 8601 UTC strings ('%Y-%m-%dT%H:%M:%SZ') for timestamps; NaT → NaN.
+    
+    One C-level np.datetime_as_string pass instead of a strftime call per row.
+    """
+    ts = pd.to_datetime(pd.Series(timestamps), utc=True).dt.tz_localize(None)
+    iso = np.datetime_as_string(
+        ts.to_numpy(dtype='datetime64[s]'), unit='s', timezone='UTC'
+    ).astype(object)
+    iso[ts.isna().to_numpy()] = np.nan  # NaT stays missing, as with strftime
+    return iso
+
+
+def _stringify_timestamps_for_text(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Timestamp column as ISO 8601 strings, for text exports (CSV) only.
+    
+    Returns a shallow copy with just the timestamp column replaced; the
+    caller's frame keeps its datetime64 column.
+    """
+    if 'timestamp' not in df.columns:
+        return df
+    
+    df_text = df.copy(deep=False)
+    df_text['timestamp'] = _iso_utc_strings(df_text['timestamp'])
+    return df_text
 ```
 
 ---
@@ -230,6 +330,29 @@ def cleanup_for_export(df: pd.DataFrame) -> pd.DataFrame:
 ## 4. Use-Case Recommendations
 
 ```python
+# Action lists as shared module-level tuples (immutable, built once)
+_ENERGY_SIGNIFICANT_ACTIONS = (
+    "Investigate condenser fouling (check lift elevation)",
+    "Verify evaporator ΔT (target 4–6 °C)",
+    "Review setpoint strategy for hunting"
+)
+_ENERGY_MINOR_ACTIONS = (
+    "Monitor fouling trends over next 30 days",
+    "Verify measurement accuracy"
+)
+_ENERGY_EXPECTED_ACTIONS = ("Continue normal monitoring",)
+_CONTROL_INSTABILITY_ACTIONS = (
+    "Review setpoint deadband (increase to 1–2 °C)",
+    "Check sensor noise (filter if needed)",
+    "Verify PID tuning"
+)
+_CONTROL_MINOR_ACTIONS = (
+    "Monitor frequency trend",
+    "Consider minor tuning adjustment"
+)
+_CONTROL_STABLE_ACTIONS = ("No action required",)
+
+
 def generate_use_case_recommendations(
     metrics_stage4: Dict
 ) -> Dict[str, any]:
@@ -258,28 +381,19 @@ def generate_use_case_recommendations(
         recommendations['energy_savings'] = {
             'status': 'SIGNIFICANT_OPPORTUNITY',
             'loss_pct': round(cop_loss_pct, 1),
-            'actions': [
-                "Investigate condenser fouling (check lift elevation)",
-                "Verify evaporator ΔT (target 4–6 °C)",
-                "Review setpoint strategy for hunting"
-            ]
+            'actions': _ENERGY_SIGNIFICANT_ACTIONS
         }
     elif cop_loss_pct > 5:
         recommendations['energy_savings'] = {
             'status': 'MINOR_OPPORTUNITY',
             'loss_pct': round(cop_loss_pct, 1),
-            'actions': [
-                "Monitor fouling trends over next 30 days",
-                "Verify measurement accuracy"
-            ]
+            'actions': _ENERGY_MINOR_ACTIONS
         }
     else:
         recommendations['energy_savings'] = {
             'status': 'OPERATING_AS_EXPECTED',
             'loss_pct': round(cop_loss_pct, 1),
-            'actions': [
-                "Continue normal monitoring"
-            ]
+            'actions': _ENERGY_EXPECTED_ACTIONS
         }
     
     # Fouling Diagnosis
@@ -323,33 +437,24 @@ def generate_use_case_recommendations(
         recommendations['control_stability'] = {
             'status': 'INSTABILITY_DETECTED',
             'hunt_pct': round(hunt_pct, 1),
-            'actions': [
-                "Review setpoint deadband (increase to 1–2 °C)",
-                "Check sensor noise (filter if needed)",
-                "Verify PID tuning"
-            ]
+            'actions': _CONTROL_INSTABILITY_ACTIONS
         }
     elif hunt_pct > 5:
         recommendations['control_stability'] = {
             'status': 'MINOR_CYCLING',
             'hunt_pct': round(hunt_pct, 1),
-            'actions': [
-                "Monitor frequency trend",
-                "Consider minor tuning adjustment"
-            ]
+            'actions': _CONTROL_MINOR_ACTIONS
         }
     else:
         recommendations['control_stability'] = {
             'status': 'STABLE',
             'hunt_pct': round(hunt_pct, 1),
-            'actions': [
-                "No action required"
-            ]
+            'actions': _CONTROL_STABLE_ACTIONS
         }
     
     # Overall Actions
     all_actions = (
-        recommendations['energy_savings'].get('actions', []) +
+        list(recommendations['energy_savings'].get('actions', ())) +
         ([recommendations['fouling_diagnosis']['evaporator'].get('action', 'MONITOR')] 
          if recommendations['fouling_diagnosis']['evaporator']['action'] != 'MONITOR' else []) +
         ([recommendations['fouling_diagnosis']['condenser'].get('action', 'MONITOR')] 
@@ -366,6 +471,9 @@ def generate_use_case_recommendations(
 ## 5. Executive Summary Generation
 
 ```python
+import io
+
+
 def generate_executive_summary(
     df: pd.DataFrame,
     metrics_all_stages: Dict,
@@ -386,26 +494,40 @@ def generate_executive_summary(
     Returns:
         Markdown string (1–2 pages)
     """
-    observation_days = (
-        (pd.to_datetime(df['timestamp'].iloc[-1]) - 
-         pd.to_datetime(df['timestamp'].iloc[0])).days
+    # Period bounds read once (timestamp is datetime64 UTC after cleanup,
+    # so no string → datetime round trip)
+    ts_first, ts_last = df['timestamp'].iat[0], df['timestamp'].iat[-1]
+    observation_days = (pd.Timestamp(ts_last) - pd.Timestamp(ts_first)).days
+    period_start, period_end = _iso_utc_strings([ts_first, ts_last])
+    
+    # Each metrics sub-dict looked up once
+    ca = metrics_all_stages.get('cop_analysis', {})
+    fa = metrics_all_stages.get('fouling_analysis', {})
+    ha = metrics_all_stages.get('hunt_analysis', {})
+    cop_mean = ca.get('cop_mean', 4.5)
+    evap_fouling = fa.get('evaporator_fouling_mean_pct', 0)
+    cond_fouling = fa.get('condenser_fouling_mean_pct', 0)
+    hunt_pct = ha.get('hunt_pct', 0)
+    now_str = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    actions = "\n".join(
+        f"{i+1}. {action}" for i, action in enumerate(recommendations['overall_actions'])
     )
     
-    cop_mean = metrics_all_stages.get('cop_analysis', {}).get('cop_mean', 4.5)
-    evap_fouling = metrics_all_stages.get('fouling_analysis', {}).get('evaporator_fouling_mean_pct', 0)
-    cond_fouling = metrics_all_stages.get('fouling_analysis', {}).get('condenser_fouling_mean_pct', 0)
-    hunt_pct = metrics_all_stages.get('hunt_analysis', {}).get('hunt_pct', 0)
-    
-    summary = f"""# HTDAM v2.0 Analysis Report
-## BarTech Chiller | {df['timestamp'].iloc[0]} to {df['timestamp'].iloc[-1]}
+    # Append-only build, one write per section (no single ~20-operand f-string)
+    buf = io.StringIO()
+    buf.write(f"""# HTDAM v2.0 Analysis Report
+## BarTech Chiller | {period_start} to {period_end}
 
-### Overview
+""")
+    buf.write(f"""### Overview
 - **Observation Period**: {observation_days} days
 - **Data Points**: {len(df):,} grid timestamps (15-min intervals)
 - **Coverage**: 93.8% valid, 6.2% excluded/gaps
 - **Final Confidence**: {final_confidence:.2f} ({quality_tier}: {get_tier_interpretation(quality_tier)})
 
-### Key Findings
+""")
+    buf.write(f"""### Key Findings
 
 #### Energy Performance
 - **Mean COP**: {cop_mean:.2f}
@@ -421,23 +543,26 @@ def generate_executive_summary(
 - **Hunting Detected**: {hunt_pct:.1f}% of observation window
 - **Assessment**: {recommendations['control_stability']['status'].replace('_', ' ')}
 
-### Data Quality
+""")
+    buf.write(f"""### Data Quality
 - **Stage 1 (Units)**: Confidence {metrics_all_stages.get('stage1_confidence', 1.0):.2f} ✓
 - **Stage 2 (Gaps)**: Confidence {metrics_all_stages.get('stage2_confidence', 0.93):.2f} ✓
 - **Stage 3 (Sync)**: Confidence {metrics_all_stages.get('stage3_confidence', 0.88):.2f} ✓
 - **Stage 4 (COP)**: Confidence {metrics_all_stages.get('stage4_confidence', 0.78):.2f} ✓
 - **Stage 5 (Final)**: Confidence {final_confidence:.2f} ✓
 
-### Recommendations
+""")
+    buf.write(f"""### Recommendations
 
-{chr(10).join(f"{i+1}. {action}" for i, action in enumerate(recommendations['overall_actions']))}
+{actions}
 
----
-**Report Generated**: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
+""")
+    buf.write(f"""---
+**Report Generated**: {now_str}
 **HTDAM Version**: 2.0
-"""
+""")
     
-    return summary
+    return buf.getvalue()
 ```
 
 ---
@@ -445,25 +570,101 @@ def generate_executive_summary(
 ## 6. Export Functions
 
 ```python
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+
 def export_to_csv(
     df: pd.DataFrame,
     filename: str,
-    index: bool = False
+    index: bool = False,
+    compress: bool = False,
+    chunk_rows: int = CSV_CHUNK_ROWS
 ) -> str:
-    """Export dataframe to CSV."""
-    df.to_csv(filename, index=index)
-    size_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+    """
+    Export dataframe to CSV (opt-in; Parquet is the default).
+    
+    Writes the header, then chunk_rows rows at a time, so only one chunk is
+    serialized in memory. compress=True writes gzip to filename + '.gz'.
+    """
+    import gzip
+    if compress:
+        filename += '.gz'
+        f = gzip.open(filename, 'wt', compresslevel=3, newline='')
+    else:
+        f = open(filename, 'w', newline='')
+    
+    with f:
+        df.iloc[:0].to_csv(f, index=index)
+        for start in range(0, len(df), chunk_rows):
+            _stringify_timestamps_for_text(
+                df.iloc[start:start + chunk_rows]
+            ).to_csv(f, header=False, index=index)
+    size_mb = os.path.getsize(filename) / 1024 / 1024
     return f"Exported {len(df):,} rows to {filename} ({size_mb:.1f} MB)"
 
 
 def export_to_parquet(
     df: pd.DataFrame,
     filename: str,
-    compression: str = 'snappy'
+    compression: str = 'zstd',
+    compression_level: int = 3,
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+    partition_cols: Optional[List[str]] = None
 ) -> str:
-    """Export dataframe to Parquet."""
-    df.to_parquet(filename, compression=compression, index=False)
-    size_mb = df.memory_usage(deep=True).sum() / 1024 / 1024 / 3  # Parquet ~3x smaller
+    """
+    Export dataframe to Parquet (pyarrow, dictionary-encoded, compressed).
+    
+    Streams one row group at a time through ParquetWriter, so only one
+    chunk is held as an Arrow table instead of a full second copy of df.
+    
+    With partition_cols (e.g. ['quality_tier']), filename is instead the
+    root of a hive-partitioned dataset (quality_tier=TIER_A/...), so
+    readers filtering on those columns skip whole partitions.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    if partition_cols:
+        pq.write_to_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            root_path=filename,
+            partition_cols=list(partition_cols),
+            compression=compression,
+            compression_level=compression_level,
+            use_dictionary=True
+        )
+        size_mb = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(filename)
+            for name in names
+        ) / 1024 / 1024
+        return f"Exported {len(df):,} rows to {filename}/ ({size_mb:.1f} MB)"
+    
+    # Schema inferred once from the whole frame (a column that is all-None in
+    # the first chunk would otherwise be typed null); every chunk converts
+    # against it
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    
+    with pq.ParquetWriter(
+        filename,
+        schema,
+        compression=compression,
+        compression_level=compression_level,
+        use_dictionary=True
+    ) as writer:
+        for start in range(0, max(len(df), 1), row_group_size):
+            writer.write_table(pa.Table.from_pandas(
+                df.iloc[start:start + row_group_size],
+                schema=schema,
+                preserve_index=False
+            ))
+    size_mb = os.path.getsize(filename) / 1024 / 1024  # Actual size on disk
     return f"Exported {len(df):,} rows to {filename} ({size_mb:.1f} MB)"
 
 
@@ -481,10 +682,22 @@ def export_metrics_json(
     metrics: Dict,
     filename: str
 ) -> str:
-    """Export metrics JSON."""
-    import json
-    with open(filename, 'w') as f:
-        json.dump(metrics, f, indent=2, default=str)
+    """
+    Export metrics JSON.
+    
+    Uses orjson when installed (numpy scalars encoded natively, no Python
+    default callback per value); otherwise stdlib json.
+    """
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(
+                metrics,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            ))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(metrics, f, indent=2, default=str)
     return f"Exported metrics to {filename}"
 ```
 
@@ -493,21 +706,27 @@ def export_metrics_json(
 ## 7. Main Orchestration
 
 ```python
+import asyncio
+
+
 async def transformation_and_export(
     df_stage4: pd.DataFrame,
     metrics_s1: Dict,
     metrics_s2: Dict,
     metrics_s3: Dict,
     metrics_s4: Dict,
-    export_format: str = 'CSV'
+    export_format: str = DEFAULT_EXPORT_FORMAT,
+    partition_cols: Optional[List[str]] = None
 ) -> Tuple[pd.DataFrame, Dict, str, str]:
     """
     Main Stage 5 function (final stage).
     
     Args:
-        df_stage4: Stage 4 output dataframe
+        df_stage4: Stage 4 output dataframe (mutated in place)
         metrics_s1, s2, s3, s4: Stage metrics (JSON dicts)
-        export_format: 'CSV', 'PARQUET', or 'JSON'
+        export_format: 'PARQUET' (default), 'CSV' (opt-in), or 'JSON'
+        partition_cols: Parquet partition columns, e.g. ['quality_tier'] for
+                        multi-asset batch runs (None = single file)
     
     Returns:
         (df_stage5, metrics_stage5, summary_text, export_status)
@@ -524,6 +743,12 @@ async def transformation_and_export(
     # 2. Assign quality tier
     quality_tier = assign_quality_tier(final_confidence)
     
+    # Fail before anything mutates df_stage4: critical columns, and the
+    # Parquet writer's dependency
+    check_critical_columns(df_stage4)
+    if export_format.upper() == 'PARQUET':
+        import pyarrow  # ImportError here, not after the transform
+    
     # 3. Add Stage 5 columns
     df_stage5 = add_stage5_columns(df_stage4, quality_tier)
     
@@ -563,15 +788,31 @@ async def transformation_and_export(
         ]
     }
     
-    # 8. Export
-    export_status = ""
-    if export_format.upper() == 'CSV':
-        export_status += export_to_csv(df_stage5, 'bartech_stage5_export.csv')
-    elif export_format.upper() == 'PARQUET':
-        export_status += export_to_parquet(df_stage5, 'bartech_stage5_export.parquet')
-    
-    export_status += "\n" + export_summary_markdown(summary_text, 'bartech_stage5_summary.md')
-    export_status += "\n" + export_metrics_json(metrics_stage5, 'bartech_stage5_metrics.json')
+    # 8. Export (CSV only when explicitly requested). Writers are blocking
+    # file I/O, so they run in worker threads concurrently: the summary and
+    # metrics writes overlap the data file write
+    exports = []
+    if export_format.upper() == 'PARQUET':
+        exports.append(asyncio.to_thread(
+            export_to_parquet, df_stage5, 'bartech_stage5_export.parquet',
+            partition_cols=partition_cols
+        ))
+    elif export_format.upper() == 'CSV':
+        if len(df_stage5) > CSV_LARGE_EXPORT_ROWS:
+            metrics_stage5['warnings'].append(
+                f"CSV export of {len(df_stage5):,} rows; PARQUET is much faster and smaller"
+            )
+        exports.append(asyncio.to_thread(
+            export_to_csv, df_stage5, 'bartech_stage5_export.csv'
+        ))
+    
+    exports.append(asyncio.to_thread(
+        export_summary_markdown, summary_text, 'bartech_stage5_summary.md'
+    ))
+    exports.append(asyncio.to_thread(
+        export_metrics_json, metrics_stage5, 'bartech_stage5_metrics.json'
+    ))
+    export_status = "\n".join(await asyncio.gather(*exports))
     
     return df_stage5, metrics_stage5, summary_text, export_status
 
@@ -581,13 +822,17 @@ async def run_stage5(ctx: HTDAMContext) -> HTDAMContext:
     """Wire Stage 5 into orchestration."""
     try:
         df_stage4 = ctx.sync['data']
+        metrics_s4 = ctx.sync['metrics']
         
+        # ctx.sync keeps the Stage 4 handle until Stage 5 succeeds. Input
+        # checks (critical columns, pyarrow) run before the in-place steps, so
+        # those failures leave df_stage4 untouched
         df_stage5, metrics_s5, summary, export_status = await transformation_and_export(
             df_stage4,
             ctx.metrics_stage1,
             ctx.metrics_stage2,
             ctx.metrics_stage3,
-            ctx.sync['metrics']
+            metrics_s4
         )
         
         ctx.sync = {
@@ -1,418 +1,24 @@
 
 # Generate final comprehensive summary
 
-summary = """
-╔════════════════════════════════════════════════════════════════════════════════════════════════════╗
-║                                                                                                    ║
-║              HTDAM v2.0 COMPLETE PIPELINE: STAGES 1–5 FINAL DELIVERY PACKAGE                    ║
-║                                                                                                    ║
-║                              All Specifications Complete                                          ║
-║                          Ready for Immediate Implementation                                       ║
-║                                                                                                    ║
-║                                  Generated: 2025-12-08                                           ║
-║                                  Status: ✅ PRODUCTION-READY                                     ║
-║                                                                                                    ║
-╚════════════════════════════════════════════════════════════════════════════════════════════════════╝
+import functools
+from pathlib import Path
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+from summary_output import emit_summary
 
-📦 FINAL COMPLETE ARTIFACTS INVENTORY (23 FILES)
+# The summary is static text, shipped pre-rendered next to this script
+SUMMARY_PATH = Path(__file__).parent / "stage5_summary.txt"
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-STAGE 1: UNIT VERIFICATION & PHYSICS CHECKS (2 artifacts)
-─────────────────────────────────────────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=1)
+def summary_text() -> str:
+    """The summary as text for programmatic callers; read once per process."""
+    return SUMMARY_PATH.read_text(encoding="utf-8")
 
-[file:166] HTDAM_Stage1_Impl_Guide.md
-  ├─ Type: Implementation Guide
-  ├─ Size: 9 sections, ~5,000 words
-  ├─ Contents: Physics ranges, conversions, confidence, penalties, output format
-  └─ Status: ✅ COMPLETE
 
-[chart:167] Stage 1 Reference Chart
-  ├─ Type: Quick Reference
-  ├─ Size: 3 tables
-  ├─ Contents: Physics ranges, penalty matrix, confidence thresholds
-  └─ Status: ✅ COMPLETE
+def main():
+    emit_summary(SUMMARY_PATH)
 
-STAGE 2: GAP DETECTION & CLASSIFICATION (4 artifacts)
-─────────────────────────────────────────────────────────────────────────────────────────────────
 
-[file:168] HTDAM_Stage2_Impl_Guide.md
-  ├─ Type: Implementation Guide
-  ├─ Size: 10 sections, ~6,500 words
-  ├─ Contents: Gap algorithms, COV semantics, exclusion windows, confidence
-  └─ Status: ✅ COMPLETE
-
-[chart:169] Stage 2 Reference Chart
-  ├─ Type: Quick Reference
-  ├─ Size: 4 tables
-  ├─ Contents: Gap thresholds, semantics matrix, penalties
-  └─ Status: ✅ COMPLETE
-
-[file:170] HTDAM_Stage2_EdgeCases.md
-  ├─ Type: Troubleshooting Guide
-  ├─ Size: 15 scenarios, ~4,000 words
-  ├─ Contents: Real-world edge cases with solutions
-  └─ Status: ✅ COMPLETE
-
-[file:171] HTDAM_Stage2_Summary.md
-  ├─ Type: Summary & Integration
-  ├─ Size: 8 sections, ~3,000 words
-  ├─ Contents: Overview, checklist, expected outputs, FAQ
-  └─ Status: ✅ COMPLETE
-
-STAGE 3: TIMESTAMP SYNCHRONIZATION (4 artifacts)
-─────────────────────────────────────────────────────────────────────────────────────────────────
-
-[file:174] HTDAM_Stage3_Python_Sketch.py
-  ├─ Type: Implementation Code
-  ├─ Size: 540 lines, production-ready
-  ├─ Contents: All functions, unit tests, orchestration
-  └─ Status: ✅ COMPLETE
-
-[file:175] HTDAM_Stage3_Metrics_Schema.json
-  ├─ Type: JSON Schema (draft-07)
-  ├─ Size: 250 lines
-  ├─ Contents: Metrics validation (alignment, jitter, coverage)
-  └─ Status: ✅ COMPLETE
-
-[file:176] HTDAM_Stage3_DataFrame_Schema.json
-  ├─ Type: JSON Schema (draft-07)
-  ├─ Size: 280 lines
-  ├─ Contents: Dataframe column validation
-  └─ Status: ✅ COMPLETE
-
-[file:177] HTDAM_Stage3_Summary.md
-  ├─ Type: Summary & Integration
-  ├─ Size: 580 lines, ~8,000 words
-  ├─ Contents: Complete guide, checklist, testing, rationale
-  └─ Status: ✅ COMPLETE
-
-STAGE 4: SIGNAL PRESERVATION & COP CALCULATION (4 artifacts)
-─────────────────────────────────────────────────────────────────────────────────────────────────
-
-[file:179] HTDAM_Stage4_Impl_Guide.md
-  ├─ Type: Implementation Spec
-  ├─ Size: 11 sections, ~8,000 words
-  ├─ Contents: Load, COP, Carnot, hunting, fouling, confidence, edge cases
-  └─ Status: ✅ COMPLETE
-
-[file:180] HTDAM_Stage4_Python_Sketch.py
-  ├─ Type: Implementation Code
-  ├─ Size: 400+ lines, production-ready
-  ├─ Contents: All functions, unit tests, orchestration
-  └─ Status: ✅ COMPLETE
-
-[file:181] HTDAM_Stage4_Metrics_Schema.json
-  ├─ Type: JSON Schema (draft-07)
-  ├─ Size: Full spec with example
-  ├─ Contents: Load, COP, hunt, fouling metrics validation
-  └─ Status: ✅ COMPLETE
-
-[file:182] HTDAM_Stage4_Summary.md
-  ├─ Type: Summary & Integration
-  ├─ Size: 350 lines, ~5,000 words
-  ├─ Contents: Overview, checklist, testing, integration
-  └─ Status: ✅ COMPLETE
-
-STAGE 5: TRANSFORMATION & EXPORT (3 artifacts - FINAL STAGE)
-─────────────────────────────────────────────────────────────────────────────────────────────────
-
-[file:184] HTDAM_Stage5_Impl_Guide.md
-  ├─ Type: Implementation Spec
-  ├─ Size: 12 sections, ~10,000 words
-  ├─ Contents: Confidence calculation, export formats, recommendations, summary
-  └─ Status: ✅ COMPLETE (FINAL STAGE)
-
-[file:185] HTDAM_Stage5_Python_Sketch.py
-  ├─ Type: Implementation Code
-  ├─ Size: 350+ lines, production-ready
-  ├─ Contents: All functions, orchestration, export
-  └─ Status: ✅ COMPLETE (FINAL STAGE)
-
-[file:186] HTDAM_Stage5_Summary.md
-  ├─ Type: Summary & Integration
-  ├─ Size: 350 lines, ~5,000 words
-  ├─ Contents: Overview, checklist, expected outputs, what's next
-  └─ Status: ✅ COMPLETE (FINAL STAGE)
-
-FOUNDATION & HANDOFF (3 artifacts)
-─────────────────────────────────────────────────────────────────────────────────────────────────
-
-[file:155] Minimum-Bare-Data-for-Proving-the-Baseline-Hypothe.md
-  ├─ Type: Physics Foundation
-  ├─ Size: 6 sections, ~3,000 words
-  ├─ Contents: Why 5 measurements, COP formula, thermodynamic verification
-  └─ Status: ✅ REFERENCE
-
-[file:172] HTDAM_Stages1-2_Handoff.md
-  ├─ Type: Handoff Guide
-  ├─ Size: 11 sections, ~4,000 words
-  ├─ Contents: Package overview, checklist, folder structure, timeline
-  └─ Status: ✅ REFERENCE
-
-[file:173] Executive_Summary_Owner.md
-  ├─ Type: Executive Summary
-  ├─ Size: 9 sections, ~1,500 words
-  ├─ Contents: 2-minute overview for project owner
-  └─ Status: ✅ REFERENCE
-
-[file:183] HTDAM_Master_Index_v2.md
-  ├─ Type: Master Index (Stages 1–4)
-  ├─ Size: ~5,000 words
-  ├─ Contents: Complete inventory, timeline, success criteria
-  └─ Status: ✅ REFERENCE
-
-[file:187] HTDAM_Complete_Master_Index.md
-  ├─ Type: Master Index (ALL 5 STAGES - FINAL)
-  ├─ Size: ~8,000 words
-  ├─ Contents: Complete inventory, timeline, all 23 artifacts, success criteria
-  └─ Status: ✅ THIS DOCUMENT
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📊 DELIVERY STATISTICS
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Total Artifacts:              23 files
-Total Documentation:          70,000+ words
-Total Code (Production):      1,500+ lines Python
-Total Schemas:                4 JSON (draft-07 compliant)
-Total Reference Charts:       2 visual guides
-
-By Category:
-  ├─ Implementation Guides:   5 (Stages 1–5)
-  ├─ Implementation Code:     5 (Stages 1–5, 90% complete skeletons)
-  ├─ JSON Schemas:            4 (validation-ready)
-  ├─ Reference Charts:        2 (pinnable)
-  ├─ Edge Cases Guides:       1 (Stage 2, 15 scenarios)
-  ├─ Summaries:               5 (all stages)
-  ├─ Handoff Documents:       3 (guides, executive summary)
-  └─ Foundation:              1 (physics specification)
-
-By Stage:
-  ├─ Stage 1:   2 artifacts (guide + chart)
-  ├─ Stage 2:   4 artifacts (guide + chart + edge cases + summary)
-  ├─ Stage 3:   4 artifacts (code + 2 schemas + summary)
-  ├─ Stage 4:   4 artifacts (guide + code + schema + summary)
-  ├─ Stage 5:   3 artifacts (guide + code + summary) ← FINAL STAGE
-  └─ Foundation: 4 artifacts (physics + handoff docs + master index)
-
-Total:                       23 artifacts, 100% complete specification
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-⏱️ COMPLETE PROJECT TIMELINE
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Sequential Execution:
-  Stage 1: 3–5 days          (Unit Verification)
-  Stage 2: 4–7 days          (Gap Detection)
-  Stage 3: 7–9 days          (Timestamp Sync)
-  Stage 4: 7–9 days          (Signal & COP)
-  Stage 5: 7–10 days         (Export & Summary) ← FINAL
-  ──────────────────────
-  TOTAL: 28–42 days (6–8 weeks)
-
-Parallel Execution (Stages 1–2 overlap):
-  Stages 1+2: 7–10 days      (both in parallel)
-  Stage 3:    7–9 days       (after 1–2)
-  Stage 4:    7–9 days       (after 3)
-  Stage 5:    7–10 days      (after 4) ← FINAL
-  ──────────────────────
-  TOTAL: 25–35 days (5–7 weeks)
-
-Optimized Path (max overlap):
-  Setup & Constant Definition: 1–2 days
-  Stages 1–4 implementation:   18–26 days (with heavy overlap)
-  Stage 5 export:             7–10 days
-  Testing & Integration:      1–3 days
-  ──────────────────────
-  TOTAL: 20–28 days (4–5 weeks optimized)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🎯 EXPECTED BARTECH OUTPUTS (ALL 5 STAGES)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Stage 1:    confidence = 1.00 ✅ (all units canonical, no violations)
-Stage 2:    confidence = 0.93 ✅ (155 COV_CONSTANT, 62 COV_MINOR, 19 ANOMALY)
-Stage 3:    confidence = 0.88 ✅ (35,136 grid points, 93.8% coverage)
-Stage 4:    confidence = 0.78 ✅ (COP 4.5, fouling 8.2%/12.5%, hunt 4.9%)
-Stage 5:    confidence = 0.85 ✅ (TIER_B, 23 artifacts exported, recommendations)
-
-Pipeline Final Confidence: 0.85 (TIER_B - Suitable for Analysis)
-
-Exported Files:
-  ├─ CSV Export: ~8.5 MB (35,136 rows × 40 columns)
-  ├─ Executive Summary: markdown (1–2 pages)
-  ├─ Metrics JSON: all 5 stage scores + recommendations
-  └─ Optional: Parquet (~2 MB) or JSON (~25 MB)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✅ IMPLEMENTATION READINESS
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-FOR PROGRAMMER:
-
-✅ Complete algorithm specifications for all 5 stages (zero ambiguity)
-✅ Python skeleton code (1,500+ lines, 90% complete)
-✅ JSON schemas for validation (4 schemas, draft-07)
-✅ Edge cases pre-solved (30+ scenarios)
-✅ Unit test cases (7+ per stage)
-✅ Constants (copy-paste ready, all stages)
-✅ Integration patterns (useOrchestration wiring)
-✅ Expected BarTech outputs (exact values, all stages)
-✅ Performance targets (<10 seconds for all 35k rows)
-✅ Implementation checklists (6 phases per stage)
-
-Timeline: 28–42 days sequential, or 20–28 days optimized
-
-FOR PROJECT OWNER:
-
-✅ Executive summary [file:173] (2-min read)
-✅ Handoff guide [file:172] (5-min read)
-✅ Master index [file:187] (complete overview)
-✅ Expected test results (BarTech outputs for all 5 stages)
-✅ Implementation checklist (track progress)
-✅ Success criteria (what to verify, all stages)
-✅ Timeline (20–42 days depending on execution)
-
-Timeline: 4–8 weeks oversight
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📋 FINAL SUCCESS CRITERIA (ALL 5 STAGES)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-After all 5 stages complete, verify:
-
-Stage 1:
-- [ ] Confidence = 1.00
-- [ ] All units canonical (°C, m³/s, kW)
-- [ ] No physics violations
-- [ ] Metrics JSON validates
-
-Stage 2:
-- [ ] Confidence = 0.93 (±0.02)
-- [ ] Gap breakdown: 155 COV_CONSTANT, 62 COV_MINOR, 19 ANOMALY
-- [ ] Exclusion window: 2025-08-26 to 2025-09-06 (11 days)
-- [ ] Metrics JSON validates
-
-Stage 3:
-- [ ] Confidence = 0.88 (±0.02)
-- [ ] Grid = 35,136 points (uniform 900s)
-- [ ] Coverage = 93.8% VALID
-- [ ] Metrics JSON validates
-
-Stage 4:
-- [ ] Confidence = 0.78 (±0.05)
-- [ ] Load: q_mean = 45.2 kW, q_confidence = 0.85
-- [ ] COP: cop_mean = 4.5, cop_confidence = 0.78
-- [ ] Hunt: hunt_pct = 4.9%, hunt_confidence = 0.70
-- [ ] Fouling: evap = 8.2%, cond = 12.5%
-- [ ] Metrics JSON validates
-
-Stage 5 (FINAL):
-- [ ] Final confidence = 0.85 (±0.03)
-- [ ] Quality tier = TIER_B
-- [ ] Executive summary generated (1–2 pages)
-- [ ] Recommendations array has 3+ items
-- [ ] Export file correct format (CSV default)
-- [ ] Metrics JSON validates
-- [ ] Data export: 40 columns, 35,136 rows
-- [ ] No data loss between stages
-- [ ] Timestamps in ISO 8601 format
-- [ ] Spot-check: 10 rows match expected values
-
-Full Pipeline:
-- [ ] All 5 stages run without error
-- [ ] Context flows correctly through all stages
-- [ ] Confidence degrades predictably (1.00 → 0.93 → 0.88 → 0.78 → 0.85)
-- [ ] Code is clean, documented, tested
-- [ ] Constants centralized
-- [ ] Ready for deployment
-
-Total: 40+ checkpoints across all 5 stages
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🔗 HOW TO GET STARTED
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-FOR PROJECT OWNER:
-
-1. Read [file:187] this master index (10 minutes)
-2. Read [file:173] Executive Summary (2 minutes)
-3. Share [file:172] Handoff Guide + [file:155] Physics Foundation with programmer
-4. Provide BarTech CSV test data
-5. Track progress weekly (against timelines)
-6. Verify test outputs match expected values
-7. Approve after Stage 5 complete
-
-FOR PROGRAMMER:
-
-1. Read [file:187] Master Index (understand full context)
-2. Start with Stage 1:
-   a. Read [file:166] HTDAM_Stage1_Impl_Guide.md
-   b. Review [chart:167] reference chart
-   c. Implement (3–5 days)
-   d. Test on BarTech (1–2 days)
-3. Continue to Stages 2–5 (same pattern)
-4. Each stage: guide → code → test → integrate
-5. Final Stage 5: export + summary + metrics
-6. Deliver clean code + all outputs
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✨ KEY HIGHLIGHTS
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✅ Physics-First: All ranges tied to ASHRAE & thermodynamics
-✅ Zero Ambiguity: Every threshold, formula, output specified
-✅ Edge Cases: 30+ real-world scenarios pre-solved
-✅ Production Code: Python skeletons 90% complete
-✅ Validation Built-In: JSON schemas, not approximations
-✅ Test Data Ready: BarTech outputs specified exactly
-✅ Integration Mapped: How each stage connects
-✅ Complete Package: 23 artifacts, 100% specification
-✅ Ready Now: Programmer can start immediately
-✅ Timeline Clear: 28–42 days sequential, 20–28 days optimized
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-╔════════════════════════════════════════════════════════════════════════════════════════════════════╗
-║                                                                                                    ║
-║                         ✅ COMPLETE SPECIFICATION DELIVERED                                       ║
-║                                                                                                    ║
-║                       All 5 Stages Ready for Implementation                                       ║
-║                      Your programmer can start immediately (Day 1)                                ║
-║                                                                                                    ║
-║                        Expected delivery: 4–8 weeks (28–42 days)                                 ║
-║                            Optimized: 4–5 weeks (20–28 days)                                    ║
-║                                                                                                    ║
-║                             23 Artifacts | 70,000+ Words                                         ║
-║                    1,500+ Lines Code | 4 JSON Schemas | 100% Specified                          ║
-║                                                                                                    ║
-╚════════════════════════════════════════════════════════════════════════════════════════════════════╝
-
-Generated: 2025-12-08
-Status: ✅ PRODUCTION-READY
-Quality: Physics-correct, edge-case aware, test-validated
-Completeness: 100% (Stages 1–5 FINAL)
-
-Stage 5 is the final stage of HTDAM v2.0.
-No stages remain to specify.
-Complete pipeline ready for deployment.
-"""
-
-print(summary)
+if __name__ == "__main__":
+    main()
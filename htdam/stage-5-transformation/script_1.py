@@ -1,388 +1,24 @@
 
 # Create a final comprehensive summary
 
-final_summary = """
-╔══════════════════════════════════════════════════════════════════════════════════════════╗
-║                                                                                          ║
-║                 ✅ HTDAM v2.0 STAGE 5 COMPLETE - FULL PIPELINE READY                   ║
-║                                                                                          ║
-║                           All 5 Stages Ready for Implementation                         ║
-║                         23 Artifacts | 70,000+ Words | 1,500+ Lines Code               ║
-║                                                                                          ║
-╚══════════════════════════════════════════════════════════════════════════════════════════╝
+import functools
+from pathlib import Path
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+from summary_output import emit_summary
 
-📊 WHAT YOU RECEIVED TODAY (Stage 5)
+# The summary is static text, shipped pre-rendered next to this script
+SUMMARY_PATH = Path(__file__).parent / "stage5_final_summary.txt"
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-3 NEW ARTIFACTS FOR STAGE 5 (FINAL STAGE):
+@functools.lru_cache(maxsize=1)
+def final_summary_text() -> str:
+    """The summary as text for programmatic callers; read once per process."""
+    return SUMMARY_PATH.read_text(encoding="utf-8")
 
-1. [file:184] HTDAM_Stage5_Impl_Guide.md (10,000 words)
-   ├─ Complete specification
-   ├─ Final confidence formula
-   ├─ Export format options (CSV, Parquet, JSON)
-   ├─ Use-case recommendations
-   ├─ Executive summary generation
-   └─ Quality tiers (A–F)
 
-2. [file:185] HTDAM_Stage5_Python_Sketch.py (350+ lines)
-   ├─ Production-ready skeleton
-   ├─ All functions pre-stubbed
-   ├─ 90% complete, ready to extend
-   ├─ Integration patterns
-   └─ Export functions
+def main():
+    emit_summary(SUMMARY_PATH)
 
-3. [file:186] HTDAM_Stage5_Summary.md (5,000 words)
-   ├─ Integration guide
-   ├─ Implementation checklist
-   ├─ Expected BarTech outputs
-   ├─ Success criteria
-   └─ Timeline (7–10 days)
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🎯 COMPLETE PIPELINE STATUS
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-ALL 5 STAGES NOW COMPLETE:
-
-Stage 1: Unit Verification
-  ├─ Confidence: 1.00 ✅
-  ├─ Artifacts: 2 (guide + chart)
-  ├─ Effort: 3–5 days
-  └─ Status: COMPLETE
-
-Stage 2: Gap Detection
-  ├─ Confidence: 0.93 ✅
-  ├─ Artifacts: 4 (guide + chart + edge cases + summary)
-  ├─ Effort: 4–7 days
-  └─ Status: COMPLETE
-
-Stage 3: Timestamp Sync
-  ├─ Confidence: 0.88 ✅
-  ├─ Artifacts: 4 (code + 2 schemas + summary)
-  ├─ Effort: 7–9 days
-  └─ Status: COMPLETE
-
-Stage 4: COP Analysis
-  ├─ Confidence: 0.78 ✅
-  ├─ Artifacts: 4 (guide + code + schema + summary)
-  ├─ Effort: 7–9 days
-  └─ Status: COMPLETE
-
-Stage 5: Export & Summary (NEW - FINAL)
-  ├─ Final Confidence: 0.85 ✅
-  ├─ Quality Tier: TIER_B ✅
-  ├─ Artifacts: 3 (guide + code + summary)
-  ├─ Effort: 7–10 days
-  └─ Status: COMPLETE ← FINAL STAGE
-
-Foundation & Support:
-  ├─ Physics foundation: ✅
-  ├─ Handoff guides: ✅
-  ├─ Executive summary: ✅
-  ├─ Master index: ✅
-  └─ Total: 6 artifacts
-
-TOTAL: 23 artifacts, 100% complete specification
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-⏱️ TIMELINE (ALL 5 STAGES)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-SEQUENTIAL (One After Another):
-  Stage 1:     3–5 days
-  Stage 2:     4–7 days
-  Stage 3:     7–9 days
-  Stage 4:     7–9 days
-  Stage 5:     7–10 days (NEW)
-  ─────────────────────
-  TOTAL: 28–42 days (6–8 weeks) ← READY NOW
-
-PARALLEL OPTIMIZED:
-  Stages 1+2:  7–10 days
-  Stage 3:     7–9 days
-  Stage 4:     7–9 days
-  Stage 5:     7–10 days (NEW)
-  ─────────────────────
-  TOTAL: 25–35 days (5–7 weeks)
-
-MAXIMUM COMPRESSION:
-  Setup:       1–2 days
-  Stages 1–4:  18–26 days (heavy overlap)
-  Stage 5:     7–10 days (NEW)
-  Testing:     1–3 days
-  ─────────────────────
-  TOTAL: 20–28 days (4–5 weeks)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📋 WHAT STAGE 5 DOES
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-INPUT:
-  ├─ Stage 4 dataframe (35,136 rows, 35+ columns)
-  ├─ Confidence scores from all prior stages
-  └─ BarTech test data
-
-PROCESSING:
-  ├─ Calculate final confidence (weighted average)
-  │   = (1.00 × 0.10) + (0.93 × 0.15) + (0.88 × 0.25) + (0.78 × 0.50)
-  │   = 0.85 (TIER_B)
-  ├─ Assign quality tier (A/B/C/D/F)
-  ├─ Add optional derived columns
-  ├─ Clean data for export (ISO 8601 timestamps, etc.)
-  ├─ Generate use-case recommendations
-  │   ├─ Energy savings analysis
-  │   ├─ Fouling diagnosis
-  │   └─ Control stability assessment
-  └─ Create executive summary (1–2 pages)
-
-OUTPUT:
-  ├─ CSV Export (8.5 MB, universal format)
-  ├─ Parquet Export (optional, 2 MB compressed)
-  ├─ JSON Export (optional, 25 MB flexible)
-  ├─ Executive Summary (markdown, 1–2 pages)
-  ├─ Metrics JSON (all 5 stage scores + recommendations)
-  └─ Quality metadata (tier, confidence, coverage)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✨ EXPECTED OUTPUTS (BARTECH)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-bartech_stage5_export.csv
-  ├─ Format: CSV (8.5 MB)
-  ├─ Rows: 35,136 (uniform 15-min intervals)
-  ├─ Columns: 40 (all stages + Stage 5 additions)
-  └─ Ready for: Excel, Python, R, SQL, BI tools
-
-bartech_stage5_summary.md
-  ├─ Format: Markdown (2 pages)
-  ├─ Sections:
-  │   ├─ Overview (dates, coverage, confidence)
-  │   ├─ Key findings (COP, fouling, hunting)
-  │   ├─ Data quality assessment
-  │   └─ Specific recommendations
-  └─ Audience: Project owner, stakeholders
-
-bartech_stage5_metrics.json
-  ├─ Format: JSON (50 KB)
-  ├─ Contents:
-  │   ├─ Final confidence: 0.85
-  │   ├─ Quality tier: TIER_B
-  │   ├─ All 5 stage scores
-  │   ├─ Data coverage statistics
-  │   ├─ Energy & fouling analysis
-  │   ├─ Recommendations array
-  │   └─ No errors, halt = false
-  └─ Audience: Programmer, systems integrator
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🔧 FOR YOUR PROGRAMMER
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-YOU HAVE:
-  ✅ Complete algorithm specification
-  ✅ Python skeleton (350+ lines, 90% complete)
-  ✅ All function signatures pre-stubbed
-  ✅ Expected BarTech outputs documented
-  ✅ Integration pattern provided
-  ✅ Constants for copy-paste
-
-YOU NEED TO:
-  → Read [file:184] HTDAM_Stage5_Impl_Guide.md (complete spec)
-  → Review [file:185] HTDAM_Stage5_Python_Sketch.py (skeleton)
-  → Follow [file:186] HTDAM_Stage5_Summary.md (integration)
-  → Implement the 6 main functions
-  → Test on BarTech data (1–2 days)
-  → Verify all outputs match expected
-
-TIMELINE:
-  → 7–10 days total
-  → 5–7 days implementation
-  → 1–2 days testing
-  → 1 day integration
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🎯 KEY METRICS
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-FINAL CONFIDENCE CALCULATION:
-
-Formula:
-  final_confidence = (S1 × 0.10) + (S2 × 0.15) + (S3 × 0.25) + (S4 × 0.50)
-
-BarTech Example:
-  = (1.00 × 0.10) + (0.93 × 0.15) + (0.88 × 0.25) + (0.78 × 0.50)
-  = 0.10 + 0.1395 + 0.22 + 0.39
-  = 0.8495
-  ≈ 0.85 ✅
-
-QUALITY TIERS:
-  TIER_A: ≥ 0.90 → Production-ready
-  TIER_B: ≥ 0.80 → Suitable for analysis (BarTech here: 0.85)
-  TIER_C: ≥ 0.70 → Use with caution
-  TIER_D: ≥ 0.60 → Limited use
-  TIER_F: < 0.60 → Do not use
-
-INTERPRETATION:
-  ✅ TIER_B = Suitable for Analysis
-     - Use for internal decisions
-     - Monitor edge cases
-     - Track trends
-     - Suitable for MoAE baseline testing
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📚 ALL ARTIFACTS (Quick Reference)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-STAGES 1–4 (Previously Delivered):
-  [file:166] Stage 1 Impl Guide + [chart:167] Reference Chart
-  [file:168] Stage 2 Impl Guide + [chart:169] Chart + [file:170] Edge Cases + [file:171] Summary
-  [file:174] Stage 3 Code + [file:175–176] Schemas + [file:177] Summary
-  [file:179] Stage 4 Impl Guide + [file:180] Code + [file:181] Schema + [file:182] Summary
-
-STAGE 5 (TODAY - NEW):
-  ✅ [file:184] Stage 5 Impl Guide (10,000 words)
-  ✅ [file:185] Stage 5 Python Sketch (350+ lines)
-  ✅ [file:186] Stage 5 Summary (5,000 words)
-
-FOUNDATION & SUPPORT:
-  [file:155] Physics Foundation
-  [file:172] Handoff Guide
-  [file:173] Executive Summary
-  [file:187] Master Index (all 23 artifacts)
-  [file:188] Stage 5 FINAL Summary (this document)
-
-TOTAL: 23 artifacts + this document = complete package
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✅ SUCCESS CHECKLIST (For Your Programmer)
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-After implementing Stage 5, verify:
-
-☐ Final confidence = 0.85 (±0.03)
-☐ Quality tier = TIER_B
-☐ Executive summary generated (markdown, 1–2 pages)
-☐ Recommendations array has 3+ actionable items
-☐ Export file format correct (CSV ~8.5 MB)
-☐ Parquet export optional (~2 MB)
-☐ JSON export optional (~25 MB)
-☐ CSV has exactly 40 columns
-☐ CSV has exactly 35,136 rows
-☐ No data loss from Stage 4
-☐ Timestamps in ISO 8601 format
-☐ Numeric precision: 4 decimal places
-☐ Metrics JSON validates against schema
-☐ Spot-check 10 random rows (values correct)
-☐ All functions documented
-☐ All tests pass
-
-Full Pipeline:
-☐ All 5 stages run end-to-end without error
-☐ Confidence degrades predictably (1.00 → 0.93 → 0.88 → 0.78 → 0.85)
-☐ Code is clean, documented, tested
-☐ Constants centralized in single file
-☐ Ready for production deployment
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🎁 DELIVERABLES SUMMARY
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-YOU RECEIVE:
-
-Artifacts:         23 files (complete package)
-Documentation:     70,000+ words (specs, guides, examples)
-Code:              1,500+ lines Python (90% complete skeletons)
-Schemas:           4 JSON (draft-07 validated)
-References:        2 pinnable quick-reference charts
-Edge Cases:        30+ real-world scenarios with solutions
-Expected Outputs:  All 5 stages documented (BarTech specifics)
-Physics:           50+ formulas, 100+ constants
-Timeline:          28–42 days sequential, 20–28 days optimized
-
-STATUS:            ✅ 100% COMPLETE SPECIFICATION
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🚀 NEXT STEPS
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-FOR YOU (PROJECT OWNER):
-
-1. Read [file:187] Master Index (15 min) ← Start here
-2. Read [file:173] Executive Summary (2 min)
-3. Share with your programmer:
-   ├─ [file:187] Master Index
-   ├─ [file:155] Physics Foundation
-   ├─ [file:172] Handoff Guide
-   └─ All 23 artifacts
-4. Provide BarTech CSV test data
-5. Track progress weekly (expect 6–8 weeks)
-6. Verify outputs match expected values
-7. Approve after Stage 5 complete
-
-FOR YOUR PROGRAMMER:
-
-1. Read [file:187] Master Index (15 min) ← Start here
-2. Start Stage 1:
-   ├─ Read [file:166] Implementation Guide
-   ├─ Review [chart:167] Reference Chart
-   ├─ Implement (3–5 days)
-   ├─ Test on BarTech (1–2 days)
-3. Continue Stages 2–4 (same pattern)
-4. End with Stage 5 (NEW):
-   ├─ Read [file:184] Implementation Guide
-   ├─ Review [file:185] Python Skeleton
-   ├─ Implement (5–7 days)
-   ├─ Test on BarTech (1–2 days)
-5. Deliver all outputs
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-╔══════════════════════════════════════════════════════════════════════════════════════════╗
-║                                                                                          ║
-║                        ✅ STAGE 5 COMPLETE - FINAL STAGE DELIVERED                     ║
-║                                                                                          ║
-║                  All 5 Stages Ready | 23 Artifacts | 100% Specified                    ║
-║                   Your Programmer Can Start Day 1 | Expected: 4–8 Weeks                ║
-║                                                                                          ║
-║                              Final Confidence: 0.85 (TIER_B)                           ║
-║                          Suitable for Analysis | Ready for Deployment                   ║
-║                                                                                          ║
-╚══════════════════════════════════════════════════════════════════════════════════════════╝
-
-Generated: 2025-12-08
-Status: ✅ PRODUCTION-READY
-Quality: Physics-correct, edge-case aware, fully tested
-Completeness: 100% (All 5 Stages)
-
-Stage 5 is the FINAL stage.
-No more stages to specify.
-Complete pipeline ready to implement.
-Complete pipeline ready to deploy.
-
-YOUR HTDAM v2.0 PROJECT IS COMPLETE.
-"""
-
-print(final_summary)
+if __name__ == "__main__":
+    main()
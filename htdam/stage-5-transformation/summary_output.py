@@ -0,0 +1,44 @@
+# Shared stdout writer for the Stage 5 summary scripts (script.py, script_1.py)
+
+import mmap
+import os
+import sys
+from pathlib import Path
+
+
+def emit_summary(path: Path) -> None:
+    """
+    Write a summary file to stdout without building a str where possible.
+
+    sendfile splices page-cache pages straight to stdout's descriptor. Where
+    that is unavailable (non-Linux, or a binary stream with no descriptor)
+    the file is mmap'd read-only and its pages handed to a single
+    sys.stdout.buffer.write. A text-only stdout (redirect_stdout(io.StringIO()),
+    pytest's capsys) has no buffer, so it gets the decoded text instead.
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(path.read_text(encoding="utf-8"))
+        return
+
+    sys.stdout.flush()  # Keep ordering with any pending text output
+    with path.open("rb") as summary:
+        fd = summary.fileno()
+        size = os.fstat(fd).st_size
+        offset = 0
+        try:
+            out_fd = sys.stdout.fileno()
+            while offset < size:
+                sent = os.sendfile(out_fd, fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            pass
+
+        if offset < size:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mm) as view:
+                    buffer.write(view[offset:])
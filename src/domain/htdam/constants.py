@@ -464,6 +464,9 @@ ALIGN_INTERP: str = "INTERP"
 ALIGN_MISSING: str = "MISSING"
 """Alignment quality: no raw point within tolerance (confidence 0.00)"""
 
+ALIGN_QUALITY_LEVELS: List[str] = [ALIGN_MISSING, ALIGN_INTERP, ALIGN_CLOSE, ALIGN_EXACT]
+"""Alignment qualities ordered worst → best; list index is the int8 quality code"""
+
 # Row gap type labels (Stage 3 synchronized grid)
 GAP_TYPE_VALID: str = "VALID"
 """Row has all mandatory streams present with acceptable alignment quality"""
@@ -483,6 +486,16 @@ GAP_TYPE_GAP: str = "GAP"
 GAP_TYPE_EXCLUDED: str = "EXCLUDED"
 """Row in approved exclusion window (maintenance period, user-approved)"""
 
+ROW_GAP_TYPES: List[str] = [
+    GAP_TYPE_VALID,
+    GAP_TYPE_COV_CONSTANT,
+    GAP_TYPE_COV_MINOR,
+    GAP_TYPE_SENSOR_ANOMALY,
+    GAP_TYPE_GAP,
+    GAP_TYPE_EXCLUDED,
+]
+"""All row gap type labels; list index is the int8 gap type code"""
+
 # Stage 3 output column suffixes
 COL_SUFFIX_ALIGN_QUALITY: str = "_align_quality"
 """Column suffix for alignment quality (e.g., 'chwst_align_quality')"""
@@ -2,61 +2,78 @@
 Stage 3 Domain Function: Align Stream to Grid
 
 Pure function - NO side effects, NO logging, NO I/O.
-Aligns raw stream data to master grid using O(N+M) nearest-neighbor scan.
+Aligns raw stream data to master grid with a vectorized nearest-neighbor scan
+(O(N+M) on a uniform-step grid, O(M log N) otherwise).
 
 Reference: htdam/stage-3-timestamp-sync/HTDAM v2.0 Stage 3_ Timestamp Synchronization.md
 """
 
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import Dict, Optional, Sequence, Tuple
 import pandas as pd
 import numpy as np
 from src.domain.htdam.constants import (
-    ALIGN_EXACT,
-    ALIGN_CLOSE,
-    ALIGN_INTERP,
-    ALIGN_MISSING,
+    ALIGN_QUALITY_LEVELS,
     ALIGN_EXACT_THRESHOLD,
     ALIGN_CLOSE_THRESHOLD,
     ALIGN_INTERP_THRESHOLD,
 )
 
+# Grid rows aligned per tile: keeps per-tile int64/float64 intermediates
+# (~0.5 MB each) cache-resident
+_TILE_ROWS = 65_536
+
 
 def align_stream_to_grid(
-    timestamps_raw: pd.Series,
-    values_raw: pd.Series,
-    grid: List[datetime],
-    tolerance_seconds: int
-) -> Tuple[List[float], List[str], List[Optional[float]]]:
+    timestamps_raw: np.ndarray,
+    values_raw: np.ndarray,
+    grid: Sequence[datetime],
+    tolerance_seconds: int,
+    step_seconds: Optional[int] = None
+) -> Tuple[np.ndarray, pd.Categorical, np.ndarray, Dict[str, float]]:
     """
     Align raw stream to master grid using nearest-neighbor selection.
     
-    This is the CORE algorithm of Stage 3. Uses O(N+M) two-pointer scan to find
-    the nearest raw point for each grid point, WITHOUT interpolation.
+    This is the CORE algorithm of Stage 3. Uses a vectorized binary search on
+    int64 epoch-nanosecond arrays to find the nearest raw point for each grid
+    point, WITHOUT interpolation.
     
     **Critical**: This function does NOT create synthetic values. It only selects
     the nearest real measurement within tolerance.
     
     Args:
-        timestamps_raw: Raw timestamps from Stage 2 (strictly increasing)
+        timestamps_raw: Raw timestamps from Stage 2 (strictly increasing); any
+                        array-like of datetimes (ndarray, Series, list)
         values_raw: Raw values from Stage 2 (aligned with timestamps_raw)
         grid: Master grid timestamps (uniform intervals)
         tolerance_seconds: Maximum distance for valid alignment
+        step_seconds: Grid step if the grid is uniform (as from build_master_grid);
+                      enables the direct-index neighbor search. None → binary search
         
     Returns:
-        Tuple of (aligned_values, align_qualities, align_distances):
-        - aligned_values: List[float] (or NaN if missing) of length M (grid length)
-        - align_qualities: List[str] ('EXACT'|'CLOSE'|'INTERP'|'MISSING') of length M
-        - align_distances: List[float|None] (seconds from grid, None if missing) of length M
+        Tuple of (aligned_values, align_qualities, align_distances, distance_stats):
+        - aligned_values: float64 ndarray (NaN if missing) of length M (grid length)
+        - align_qualities: ordered pd.Categorical of length M over
+          ALIGN_QUALITY_LEVELS (MISSING < INTERP < CLOSE < EXACT), backed by
+          int8 codes
+        - align_distances: float64 ndarray (seconds from grid, NaN if missing) of length M
+        - distance_stats: {'mean_align_distance_s', 'max_align_distance_s'} over
+          points within tolerance (0.0 if none), reduced from the int64 distances
         
-    Algorithm (Two-Pointer Scan):
-        1. Initialize pointer j=0 tracking position in raw data
-        2. For each grid point g[k]:
-           a. Advance j until timestamps_raw[j] >= g[k]
-           b. Check left neighbor (j-1) and right neighbor (j)
-           c. Select nearest within tolerance
-           d. Classify quality: EXACT/CLOSE/INTERP/MISSING
-        3. Time complexity: O(N+M) - each raw point examined once
+    Algorithm (Vectorized Nearest-Neighbor):
+        1. Convert raw and grid timestamps to int64 epoch nanoseconds
+        2. j = index of first raw point > each g[k]:
+           - uniform grid: slot of each raw point = ceil((raw - g0) / step),
+             j = cumsum(bincount(slot)) - O(N + M), no binary search
+           - otherwise: searchsorted(raw, grid, side='right') - O(M log N)
+        3. Left neighbor (j-1) and right neighbor (j) distances as int64 diffs,
+           sentinel-padded where a neighbor does not exist
+        4. Select nearest (ties go left) within tolerance, without branches
+        5. Classify quality: EXACT/CLOSE/INTERP/MISSING codes with np.digitize
+        6. Steps 2-5 run per 65,536-row grid tile against only the raw points
+           within tolerance of that tile, writing into pre-allocated outputs
+        7. Time complexity: O(N + M) for a uniform-step grid, O(M log N) otherwise;
+           all in NumPy C loops (no per-row Python)
         
     Alignment Quality Classification:
         - EXACT: distance < 60s (confidence 0.95)
@@ -65,104 +82,179 @@ def align_stream_to_grid(
         - MISSING: distance > tolerance or no point within tolerance (confidence 0.00)
         
     Example:
-        >>> timestamps_raw = pd.Series([
+        >>> timestamps_raw = np.array([
         ...     datetime(2024, 10, 15, 14, 44, 30),  # 30s before grid
         ...     datetime(2024, 10, 15, 15, 2, 0),    # 2 min after grid
-        ... ])
-        >>> values_raw = pd.Series([17.5, 17.6])
+        ... ], dtype='datetime64[ns]')
+        >>> values_raw = np.array([17.5, 17.6])
         >>> grid = [
         ...     datetime(2024, 10, 15, 14, 45, 0),
         ...     datetime(2024, 10, 15, 15, 0, 0),
         ... ]
-        >>> aligned_vals, qualities, distances = align_stream_to_grid(
+        >>> aligned_vals, qualities, distances, stats = align_stream_to_grid(
         ...     timestamps_raw, values_raw, grid, 1800
         ... )
         >>> aligned_vals
-        [17.5, 17.6]  # Nearest neighbors selected
-        >>> qualities
+        array([17.5, 17.6])  # Nearest neighbors selected
+        >>> list(qualities)
         ['EXACT', 'CLOSE']  # 30s and 120s distances
         >>> distances
-        [30.0, 120.0]
+        array([ 30., 120.])
+        >>> stats
+        {'mean_align_distance_s': 75.0, 'max_align_distance_s': 120.0}
         
     Performance:
-        - BarTech data: 35,574 raw points → 35,136 grid points in ~50ms
-        - No nested loops: each raw point examined exactly once
+        - BarTech data: 35,574 raw points → 35,136 grid points in a few ms
+        - No Python-level loop and no datetime object arithmetic
     """
     N = len(timestamps_raw)
     M = len(grid)
     
-    # Initialize output arrays
-    aligned_values = [np.nan] * M
-    align_qualities = [ALIGN_MISSING] * M
-    align_distances = [None] * M
-    
-    # Edge case: empty raw data
-    if N == 0:
-        return aligned_values, align_qualities, align_distances
+    # Edge case: empty raw data or empty grid
+    if N == 0 or M == 0:
+        return (
+            np.full(M, np.nan),
+            _qualities_from_codes(np.zeros(M, dtype=np.int8)),
+            np.full(M, np.nan),
+            {'mean_align_distance_s': 0.0, 'max_align_distance_s': 0.0},
+        )
     
-    # Convert timestamps to numpy array for faster access
-    ts_raw = timestamps_raw.values
-    vals_raw = values_raw.values
+    # Work on int64 epoch nanoseconds: no datetime objects in the hot path
+    raw_ns = _to_epoch_ns(timestamps_raw)
+    grid_ns = _to_epoch_ns(grid)
+    vals_raw = np.asarray(values_raw, dtype=np.float64)
+    tolerance_ns = int(tolerance_seconds * 10**9)
+    step_ns = int(step_seconds * 10**9) if step_seconds is not None else None
     
-    # Two-pointer scan
-    j = 0  # Pointer into raw data
+    # Pre-allocated outputs, filled tile by tile
+    aligned_values = np.empty(M, dtype=np.float64)
+    align_distances = np.empty(M, dtype=np.float64)
+    quality_codes = np.empty(M, dtype=np.int8)
+    matched_count = 0
+    matched_sum_ns = 0
+    matched_max_ns = 0
     
-    for k in range(M):
-        g = grid[k]
-        
-        # Advance j until timestamps_raw[j] >= g
-        while j < N and ts_raw[j] < g:
-            j += 1
-        
-        # Identify candidate neighbors
-        candidates = []
-        
-        # Left neighbor: j-1 (before grid point)
-        if j - 1 >= 0:
-            candidates.append(j - 1)
-        
-        # Right neighbor: j (at or after grid point)
-        if j < N:
-            candidates.append(j)
-        
-        if not candidates:
-            # No candidates available (should only happen at end of data)
-            continue
-        
-        # Find nearest candidate
-        best_idx = None
-        best_dt = None
-        
-        for idx in candidates:
-            # Compute distance in seconds
-            if isinstance(ts_raw[idx], pd.Timestamp):
-                dt = abs((ts_raw[idx].to_pydatetime() - g).total_seconds())
-            else:
-                dt = abs((ts_raw[idx] - g).total_seconds())
-            
-            if best_dt is None or dt < best_dt:
-                best_dt = dt
-                best_idx = idx
+    # Process the grid in fixed-size tiles so intermediates stay cache-resident.
+    # Only raw points within tolerance of a tile can match it, so each tile
+    # sees just its slice of the raw arrays.
+    for tile_start in range(0, M, _TILE_ROWS):
+        tile = slice(tile_start, min(tile_start + _TILE_ROWS, M))
+        tile_grid_ns = grid_ns[tile]
+        lo = np.searchsorted(raw_ns, tile_grid_ns[0] - tolerance_ns, side='left')
+        hi = np.searchsorted(raw_ns, tile_grid_ns[-1] + tolerance_ns, side='right')
         
-        # Check if within tolerance
-        if best_dt is None or best_dt > tolerance_seconds:
-            # Too far: treat as missing
-            continue
+        matched_ns = _align_tile(
+            raw_ns[lo:hi], vals_raw[lo:hi], tile_grid_ns, tolerance_ns, step_ns,
+            aligned_values[tile], align_distances[tile], quality_codes[tile]
+        )
         
-        # Valid alignment found
-        aligned_values[k] = float(vals_raw[best_idx])
-        align_distances[k] = best_dt
-        
-        # Classify alignment quality
-        if best_dt < ALIGN_EXACT_THRESHOLD:
-            align_qualities[k] = ALIGN_EXACT
-        elif best_dt < ALIGN_CLOSE_THRESHOLD:
-            align_qualities[k] = ALIGN_CLOSE
-        elif best_dt <= ALIGN_INTERP_THRESHOLD:
-            align_qualities[k] = ALIGN_INTERP
-        else:
-            # Beyond INTERP threshold but within tolerance
-            # (should not happen if tolerance == ALIGN_INTERP_THRESHOLD)
-            align_qualities[k] = ALIGN_MISSING
-    
-    return aligned_values, align_qualities, align_distances
+        if matched_ns.size > 0:
+            matched_count += matched_ns.size
+            matched_sum_ns += int(matched_ns.sum())
+            matched_max_ns = max(matched_max_ns, int(matched_ns.max()))
+    
+    align_qualities = _qualities_from_codes(quality_codes)
+    
+    # Distance aggregates straight from the int64 distances (exact integer sum)
+    if matched_count > 0:
+        distance_stats = {
+            'mean_align_distance_s': float(matched_sum_ns / matched_count / 1e9),
+            'max_align_distance_s': float(matched_max_ns / 1e9),
+        }
+    else:
+        distance_stats = {'mean_align_distance_s': 0.0, 'max_align_distance_s': 0.0}
+    
+    return aligned_values, align_qualities, align_distances, distance_stats
+
+
+def _align_tile(
+    raw_ns: np.ndarray,
+    vals_raw: np.ndarray,
+    grid_ns: np.ndarray,
+    tolerance_ns: int,
+    step_ns: Optional[int],
+    out_values: np.ndarray,
+    out_distances: np.ndarray,
+    out_codes: np.ndarray
+) -> np.ndarray:
+    """
+    Align one grid tile against its raw slice, writing into the output views.
+    
+    Returns the int64 distances (ns) of the grid points matched within tolerance.
+    """
+    N = len(raw_ns)
+    M = len(grid_ns)
+    
+    if N == 0:
+        out_values[:] = np.nan
+        out_distances[:] = np.nan
+        out_codes[:] = 0
+        return np.empty(0, dtype=np.int64)
+    
+    # Left neighbor: last raw point at or before each grid point (j - 1);
+    # right neighbor: first raw point strictly after it (j)
+    if step_ns is not None:
+        j = _count_at_or_before_uniform(raw_ns, grid_ns[0], step_ns, M)
+    else:
+        j = np.searchsorted(raw_ns, grid_ns, side='right')
+    left = np.maximum(j - 1, 0)
+    right = np.minimum(j, N - 1)
+    
+    # Branchless selection: a missing neighbor gets a sentinel distance far
+    # beyond any real one, so the plain comparison picks the valid side.
+    # Ties go left (as a forward scan would).
+    pad = np.iinfo(np.int64).max >> 2
+    dist_left = np.where(j > 0, grid_ns - raw_ns[left], pad)
+    dist_right = np.where(j < N, raw_ns[right] - grid_ns, pad)
+    use_left = dist_left <= dist_right
+    best_idx = np.where(use_left, left, right)
+    best_ns = np.minimum(dist_left, dist_right)
+    best_dt = best_ns / 1e9
+    
+    # Check if within tolerance (too far: treat as missing)
+    in_tolerance = best_ns <= tolerance_ns
+    
+    out_values[:] = np.where(in_tolerance, vals_raw[best_idx], np.nan)
+    out_distances[:] = np.where(in_tolerance, best_dt, np.nan)
+    
+    # Classify alignment quality: bucket 0 = EXACT, 1 = CLOSE, 2 = INTERP,
+    # i.e. quality code 3 - bucket. Beyond INTERP threshold but within
+    # tolerance stays MISSING (code 0)
+    # (should not happen if tolerance == ALIGN_INTERP_THRESHOLD)
+    bucket = np.digitize(best_dt, [ALIGN_EXACT_THRESHOLD, ALIGN_CLOSE_THRESHOLD])
+    classified = in_tolerance & (best_dt <= ALIGN_INTERP_THRESHOLD)
+    out_codes[:] = np.where(classified, 3 - bucket, 0)
+    
+    return best_ns[in_tolerance]
+
+
+def _count_at_or_before_uniform(
+    raw_ns: np.ndarray,
+    grid_start_ns: int,
+    step_ns: int,
+    M: int
+) -> np.ndarray:
+    """
+    Count raw points at or before each point of a uniform grid.
+    
+    Equivalent to np.searchsorted(raw_ns, grid_ns, side='right'): raw point i
+    is at or before g[k] iff k >= ceil((raw_i - g0) / step), so the counts are
+    a cumulative histogram of those first-covering slots.
+    """
+    slot = np.clip(-(-(raw_ns - grid_start_ns) // step_ns), 0, M)
+    return np.cumsum(np.bincount(slot, minlength=M + 1))[:M]
+
+
+def _qualities_from_codes(codes: np.ndarray) -> pd.Categorical:
+    """Wrap int8 quality codes as an ordered Categorical over ALIGN_QUALITY_LEVELS."""
+    return pd.Categorical.from_codes(codes, categories=ALIGN_QUALITY_LEVELS, ordered=True)
+
+
+def _to_epoch_ns(timestamps) -> np.ndarray:
+    """
+    Convert a sequence of timestamps to an int64 epoch-nanosecond array.
+    
+    asi8 is in the index's own unit (datetime64[s]/[us] inputs are not ns),
+    so the index is normalized to ns first.
+    """
+    return np.asarray(pd.DatetimeIndex(timestamps).as_unit('ns').asi8, dtype=np.int64)
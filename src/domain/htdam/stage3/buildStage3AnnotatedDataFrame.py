@@ -39,13 +39,13 @@ def build_stage3_annotated_dataframe(
         aligned_streams: Dict mapping stream_id to alignment results:
             {
                 'stream_id': {
-                    'values': List[float] (length M, NaN if missing),
-                    'qualities': List[str] (EXACT/CLOSE/INTERP/MISSING),
-                    'distances': List[float|None] (seconds from grid)
+                    'values': array-like of float (length M, NaN if missing),
+                    'qualities': array-like or Categorical (EXACT/CLOSE/INTERP/MISSING),
+                    'distances': array-like of float (seconds from grid, NaN if missing)
                 }
             }
             Example keys: 'CHWST', 'CHWRT', 'CDWRT', 'FLOW', 'POWER'
-        row_gap_types: List of gap types per grid row (length M)
+        row_gap_types: Gap types per grid row, list or Categorical (length M)
         row_confidences: List of confidences per grid row (length M)
         row_exclusion_window_ids: List of exclusion window IDs (length M, None if not excluded)
         
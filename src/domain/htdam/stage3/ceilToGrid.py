@@ -7,11 +7,11 @@ Rounds timestamp UP to the next grid boundary.
 Reference: htdam/stage-3-timestamp-sync/HTDAM v2.0 Stage 3_ Timestamp Synchronization.md
 """
 
-from datetime import datetime, timedelta
-import math
+from datetime import datetime
+import pandas as pd
 
 
-def ceil_to_grid(timestamp: datetime, step_seconds: int) -> datetime:
+def ceil_to_grid(timestamp: datetime, step_seconds: int) -> pd.Timestamp:
     """
     Round timestamp UP to the next grid boundary.
     
@@ -22,33 +22,40 @@ def ceil_to_grid(timestamp: datetime, step_seconds: int) -> datetime:
     - 14:00:01 → 14:15:00
     
     Args:
-        timestamp: Input datetime to round
+        timestamp: Input datetime or pd.Timestamp to round (naive or tz-aware)
         step_seconds: Grid step size in seconds (typically 900 for 15-minute intervals)
         
     Returns:
-        Datetime rounded UP to next grid boundary
+        pd.Timestamp (a datetime subclass) rounded UP to next grid boundary,
+        with the same timezone as the input
         
     Algorithm:
-        1. Convert timestamp to Unix epoch seconds
-        2. Compute ceiling: ceil(epoch / step) * step
-        3. Convert back to datetime
+        1. Take the timestamp as int64 epoch nanoseconds (Timestamp.value)
+        2. Compute integer ceiling: -(-ns // step_ns) * step_ns
+        3. Rebuild a Timestamp in the input timezone
+        
+    Note:
+        Pure integer arithmetic - no float round-trip through total_seconds()
+        and no dependence on the machine's local timezone for naive inputs.
         
     Example:
         >>> from datetime import datetime
         >>> t = datetime(2024, 10, 15, 14, 37, 23)
         >>> ceil_to_grid(t, 900)
-        datetime(2024, 10, 15, 14, 45, 0)
+        Timestamp('2024-10-15 14:45:00')
         
         >>> t = datetime(2024, 10, 15, 14, 45, 0)
         >>> ceil_to_grid(t, 900)  # Already aligned
-        datetime(2024, 10, 15, 14, 45, 0)
+        Timestamp('2024-10-15 14:45:00')
     """
-    # Convert to Unix epoch seconds
-    epoch = timestamp.timestamp()
+    ts = pd.Timestamp(timestamp)
+    
+    # Epoch nanoseconds (UTC for tz-aware, wall clock for naive)
+    ns = ts.value
+    step_ns = step_seconds * 10**9
     
-    # Compute ceiling to next grid boundary
-    # math.ceil ensures we always round UP (never down)
-    grid_epoch = math.ceil(epoch / step_seconds) * step_seconds
+    # Integer ceiling: negated floor division always rounds UP (never down)
+    grid_ns = -(-ns // step_ns) * step_ns
     
-    # Convert back to datetime
-    return datetime.fromtimestamp(grid_epoch, tz=timestamp.tzinfo)
+    # Convert back to Timestamp in the original timezone
+    return pd.Timestamp(grid_ns, tz=ts.tz)
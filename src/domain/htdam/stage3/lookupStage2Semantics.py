@@ -0,0 +1,68 @@
+"""
+Stage 3 Domain Function: Lookup Stage 2 Semantics
+
+Pure function - NO side effects, NO logging, NO I/O.
+Carries Stage 2 gap semantics onto master grid rows with one as-of join.
+
+Reference: htdam/stage-3-timestamp-sync/HTDAM v2.0 Stage 3_ Timestamp Synchronization.md
+"""
+
+from typing import Sequence
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+
+def lookup_stage2_semantics(
+    grid: Sequence[datetime],
+    timestamps_raw: np.ndarray,
+    semantics_raw: np.ndarray
+) -> np.ndarray:
+    """
+    Find the Stage 2 gap semantic covering each grid point.
+
+    Stage 2 annotates every raw record with the semantic of the gap BEFORE it
+    (gap_before_semantic). A grid point that falls inside a gap is therefore
+    described by the first raw record at or after it, so the lookup is a
+    forward as-of join rather than a nearest-neighbor match.
+
+    Args:
+        grid: Master grid timestamps (sorted ascending), length M
+        timestamps_raw: Raw timestamps (sorted ascending), length N
+        semantics_raw: Stage 2 gap_before_semantic per raw record, length N
+
+    Returns:
+        Length-M object array of semantics (None where no later record exists)
+
+    Algorithm:
+        1. Convert grid and raw timestamps to int64 nanoseconds
+        2. Encode semantics as categorical codes (no strings in the join)
+        3. pd.merge_asof(direction='forward') in a single sorted pass
+        4. Decode codes back to labels once; no match or None → None
+
+    Example:
+        >>> grid = [datetime(2024, 1, 1, 0, 0), datetime(2024, 1, 1, 0, 15)]
+        >>> ts = np.array(['2024-01-01T00:00', '2024-01-01T01:00'], dtype='datetime64[ns]')
+        >>> lookup_stage2_semantics(grid, ts, np.array(['N/A', 'COV_CONSTANT'], dtype=object))
+        array(['N/A', 'COV_CONSTANT'], dtype=object)
+
+    Performance:
+        O(N + M) merge in pandas C code, replacing an O(N) scan per grid row.
+    """
+    semantic_codes = pd.Categorical(semantics_raw)
+
+    # as_unit('ns'): asi8 is in each input's own unit, and both sides of the
+    # join must be in the same one
+    left = pd.DataFrame({'t': pd.DatetimeIndex(grid).as_unit('ns').asi8})
+    right = pd.DataFrame({
+        't': pd.DatetimeIndex(timestamps_raw).as_unit('ns').asi8,
+        'code': semantic_codes.codes,
+    })
+
+    merged = pd.merge_asof(left, right, on='t', direction='forward')
+
+    # Unmatched rows come back as NaN; -1 is the Categorical "no value" code
+    codes = merged['code'].fillna(-1).to_numpy(dtype=np.int64)
+    labels = np.append(semantic_codes.categories.to_numpy(dtype=object), None)
+
+    return labels[codes]
@@ -10,7 +10,7 @@ Reference: htdam/stage-3-timestamp-sync/HTDAM v2.0 Stage 3_ Timestamp Synchroniz
 import logging
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 
@@ -19,18 +19,20 @@ from src.domain.htdam.constants import (
     SYNC_TOLERANCE_SECONDS,
     MANDATORY_STREAMS,
     OPTIONAL_STREAMS,
-    ALIGN_EXACT,
-    ALIGN_CLOSE,
-    ALIGN_INTERP,
     ALIGN_MISSING,
+    ALIGN_QUALITY_LEVELS,
     GAP_TYPE_VALID,
+    GAP_TYPE_EXCLUDED,
+    ROW_GAP_TYPES,
     JITTER_CV_TOLERANCE_PCT,
+    COL_GAP_BEFORE_SEMANTIC,
 )
 
 # Import domain functions
 from src.domain.htdam.stage3.buildMasterGrid import build_master_grid
 from src.domain.htdam.stage3.alignStreamToGrid import align_stream_to_grid
-from src.domain.htdam.stage3.deriveRowGapTypeAndConfidence import derive_row_gap_type_and_confidence
+from src.domain.htdam.stage3.deriveRowGapTypesAndConfidences import derive_row_gap_types_and_confidences
+from src.domain.htdam.stage3.lookupStage2Semantics import lookup_stage2_semantics
 from src.domain.htdam.stage3.computeCoveragePenalty import compute_coverage_penalty
 from src.domain.htdam.stage3.buildStage3AnnotatedDataFrame import build_stage3_annotated_dataframe
 from src.domain.htdam.stage3.buildStage3Metrics import build_stage3_metrics
@@ -75,8 +77,8 @@ def use_stage3_synchronizer(
         1. Validate inputs (mandatory streams present, valid time range)
         2. Determine time span across all streams
         3. Build master grid
-        4. For each stream: align to grid using nearest-neighbor
-        5. For each grid row: derive gap type and confidence
+        4. Align all streams to grid concurrently using nearest-neighbor
+        5. For each grid row: look up Stage 2 gap semantic, derive gap type and confidence
         6. Compute jitter statistics
         7. Compute coverage penalty
         8. Build synchronized DataFrame
@@ -239,9 +241,41 @@ def use_stage3_synchronizer(
     
     aligned_streams = {}
     per_stream_stats = {}
+    stage2_semantics_raw = {}
     
     all_streams = MANDATORY_STREAMS + OPTIONAL_STREAMS
     
+    # Prepare inputs for every provided stream
+    stream_inputs = {}
+    for stream_id in all_streams:
+        if stream_id not in signals:
+            continue
+        
+        df_stream = signals[stream_id]
+        
+        # Convert timestamps once (int64-backed index, reused by every lookup)
+        timestamps_raw = pd.DatetimeIndex(df_stream[timestamp_col])
+        
+        # Stage 2 output is already sorted: check in one pass, sort only if not
+        if not timestamps_raw.is_monotonic_increasing:
+            logger.warning(f"  {stream_id}: timestamps not sorted, sorting")
+            df_stream = df_stream.iloc[np.argsort(timestamps_raw.asi8, kind='stable')]
+            timestamps_raw = pd.DatetimeIndex(df_stream[timestamp_col])
+        
+        values_raw = df_stream[value_col].to_numpy(dtype=np.float64)
+        stream_inputs[stream_id] = (df_stream, timestamps_raw, values_raw)
+    
+    # Align streams concurrently: they are independent, and align_stream_to_grid
+    # spends its time in NumPy C loops that release the GIL
+    with ThreadPoolExecutor(max_workers=max(1, len(stream_inputs))) as executor:
+        alignment_futures = {
+            stream_id: executor.submit(
+                align_stream_to_grid, timestamps_raw, values_raw, grid, tolerance,
+                step_seconds=t_nominal  # build_master_grid output is uniform
+            )
+            for stream_id, (_, timestamps_raw, values_raw) in stream_inputs.items()
+        }
+    
     for stream_id in all_streams:
         if stream_id not in signals:
             # Stream not provided
@@ -261,22 +295,15 @@ def use_stage3_synchronizer(
             }
             continue
         
-        df_stream = signals[stream_id]
+        df_stream, timestamps_raw, _ = stream_inputs[stream_id]
         N = len(df_stream)
         
-        logger.info(f"  Aligning {stream_id}: {N} raw points → {M} grid points")
-        
-        # Sort by timestamp (should already be sorted from Stage 2)
-        df_stream = df_stream.sort_values(timestamp_col).reset_index(drop=True)
-        
-        # Extract timestamps and values
-        timestamps_raw = df_stream[timestamp_col]
-        values_raw = df_stream[value_col]
+        logger.info(f"  Aligned {stream_id}: {N} raw points → {M} grid points")
         
-        # Call domain function: align_stream_to_grid
+        # Collect result of domain function: align_stream_to_grid
         try:
-            aligned_values, align_qualities, align_distances = align_stream_to_grid(
-                timestamps_raw, values_raw, grid, tolerance
+            aligned_values, align_qualities, align_distances, distance_stats = (
+                alignment_futures[stream_id].result()
             )
         except Exception as e:
             error_msg = f"Alignment failed for {stream_id}: {str(e)}"
@@ -291,21 +318,17 @@ def use_stage3_synchronizer(
             'distances': align_distances
         }
         
-        # Compute alignment statistics
-        quality_counts = Counter(align_qualities)
-        exact_count = quality_counts.get(ALIGN_EXACT, 0)
-        close_count = quality_counts.get(ALIGN_CLOSE, 0)
-        interp_count = quality_counts.get(ALIGN_INTERP, 0)
-        missing_count = quality_counts.get(ALIGN_MISSING, 0)
+        # Keep Stage 2 gap semantics for the row-level lookup in Step 5
+        if COL_GAP_BEFORE_SEMANTIC in df_stream.columns:
+            stage2_semantics_raw[stream_id] = (
+                timestamps_raw,
+                df_stream[COL_GAP_BEFORE_SEMANTIC].to_numpy(dtype=object)
+            )
         
-        # Compute distances statistics (excluding None)
-        valid_distances = [d for d in align_distances if d is not None]
-        if valid_distances:
-            mean_distance = np.mean(valid_distances)
-            max_distance = np.max(valid_distances)
-        else:
-            mean_distance = 0.0
-            max_distance = 0.0
+        # Compute alignment statistics (one bincount over int8 quality codes)
+        missing_count, interp_count, close_count, exact_count = (
+            int(c) for c in np.bincount(align_qualities.codes, minlength=len(ALIGN_QUALITY_LEVELS))
+        )
         
         # Determine status
         missing_pct = (missing_count / M) * 100.0
@@ -328,8 +351,8 @@ def use_stage3_synchronizer(
             'close_pct': round((close_count / M) * 100.0, 1),
             'interp_pct': round((interp_count / M) * 100.0, 1),
             'missing_pct': round(missing_pct, 1),
-            'mean_align_distance_s': round(mean_distance, 1),
-            'max_align_distance_s': round(max_distance, 1)
+            'mean_align_distance_s': round(distance_stats['mean_align_distance_s'], 1),
+            'max_align_distance_s': round(distance_stats['max_align_distance_s'], 1)
         }
         
         logger.info(f"    EXACT: {exact_count} ({per_stream_stats[stream_id]['exact_pct']}%)")
@@ -342,49 +365,46 @@ def use_stage3_synchronizer(
     # ========================================================================
     logger.info("Step 5: Deriving row-level gap types and confidence...")
     
-    row_gap_types = []
-    row_confidences = []
-    row_exclusion_window_ids = []
-    
-    # Create exclusion window lookup (grid_time → window_id)
-    exclusion_lookup = {}
+    # Mark grid rows inside exclusion windows (later windows take precedence)
+    row_exclusion_window_ids = np.full(M, None, dtype=object)
     for window in exclusion_windows:
-        start_ts = window['start_ts']
-        end_ts = window['end_ts']
-        window_id = window['window_id']
-        
-        for k, g in enumerate(grid):
-            if start_ts <= g <= end_ts:
-                exclusion_lookup[k] = window_id
-    
-    for k in range(M):
-        # Build align_qualities dict for this row
-        align_qualities_row = {}
-        for stream_id in all_streams:
-            if stream_id in aligned_streams:
-                align_qualities_row[stream_id] = aligned_streams[stream_id]['qualities'][k]
-        
-        # Check exclusion window
-        exclusion_id = exclusion_lookup.get(k, None)
+        in_window = (grid >= window['start_ts']) & (grid <= window['end_ts'])
+        row_exclusion_window_ids[np.asarray(in_window)] = window['window_id']
+    
+    # Stage 2 semantic per row: taken from the first missing mandatory stream
+    row_stage2_semantics = np.full(M, None, dtype=object)
+    for stream_id in MANDATORY_STREAMS:
+        if stream_id not in aligned_streams or stream_id not in stage2_semantics_raw:
+            continue
         
-        # Call domain function: derive_row_gap_type_and_confidence
-        gap_type, confidence = derive_row_gap_type_and_confidence(
-            align_qualities_row,
-            exclusion_id,
-            stage2_semantic=None  # TODO: lookup from Stage 2 if needed
+        unresolved = (
+            (aligned_streams[stream_id]['qualities'] == ALIGN_MISSING)
+            & pd.isna(row_stage2_semantics)
         )
-        
-        row_gap_types.append(gap_type)
-        row_confidences.append(confidence)
-        row_exclusion_window_ids.append(exclusion_id)
+        if unresolved.any():
+            # Call domain function: lookup_stage2_semantics
+            stream_semantics = lookup_stage2_semantics(grid, *stage2_semantics_raw[stream_id])
+            row_stage2_semantics[unresolved] = stream_semantics[unresolved]
+    
+    # Call domain function: derive_row_gap_types_and_confidences
+    row_gap_types, row_confidences = derive_row_gap_types_and_confidences(
+        {stream_id: aligned['qualities'] for stream_id, aligned in aligned_streams.items()},
+        row_exclusion_window_ids,
+        stage2_semantics=row_stage2_semantics
+    )
     
-    # Count row classifications
-    row_classification_counts = Counter(row_gap_types)
+    # Count row classifications (one bincount over int8 gap type codes)
+    gap_type_counts = np.bincount(row_gap_types.codes, minlength=len(ROW_GAP_TYPES))
+    row_classification_counts = {
+        gap_type: int(count)
+        for gap_type, count in zip(ROW_GAP_TYPES, gap_type_counts)
+        if count > 0
+    }
     valid_count = row_classification_counts.get(GAP_TYPE_VALID, 0)
     coverage_pct = (valid_count / M) * 100.0
     
     logger.info(f"Row classification summary:")
-    for gap_type, count in row_classification_counts.most_common():
+    for gap_type, count in sorted(row_classification_counts.items(), key=lambda kv: kv[1], reverse=True):
         pct = (count / M) * 100.0
         logger.info(f"  {gap_type}: {count} ({pct:.1f}%)")
     logger.info(f"Coverage: {coverage_pct:.1f}% VALID")
@@ -394,16 +414,12 @@ def use_stage3_synchronizer(
     # ========================================================================
     logger.info("Step 6: Computing jitter statistics...")
     
-    # Grid should have perfectly uniform intervals
+    # Grid is uniform by construction (build_master_grid steps by t_nominal),
+    # so interval statistics are known without scanning it
     if M > 1:
-        intervals = []
-        for i in range(1, M):
-            dt = (grid[i] - grid[i-1]).total_seconds()
-            intervals.append(dt)
-        
-        interval_mean = np.mean(intervals)
-        interval_std = np.std(intervals)
-        interval_cv_pct = (interval_std / interval_mean * 100.0) if interval_mean > 0 else 0.0
+        interval_mean = float(t_nominal)
+        interval_std = 0.0
+        interval_cv_pct = 0.0
     else:
         interval_mean = 0.0
         interval_std = 0.0
@@ -442,7 +458,7 @@ def use_stage3_synchronizer(
         halt = True
     
     # Check if entire dataset excluded
-    excluded_count = row_classification_counts.get('EXCLUDED', 0)
+    excluded_count = row_classification_counts.get(GAP_TYPE_EXCLUDED, 0)
     if excluded_count == M:
         error_msg = "HALT: Entire dataset excluded by exclusion windows"
         logger.critical(error_msg)
@@ -490,7 +506,7 @@ def use_stage3_synchronizer(
         grid_points=M,
         t_nominal_seconds=t_nominal,
         per_stream_stats=per_stream_stats,
-        row_classification_counts=dict(row_classification_counts),
+        row_classification_counts=row_classification_counts,
         total_grid_points=M,
         jitter_stats=jitter_stats,
         coverage_penalty=coverage_penalty,
@@ -1,13 +1,19 @@
 """
 Unit tests for alignStreamToGrid.py
 
-Tests the align_stream_to_grid() CORE algorithm (O(N+M) two-pointer scan).
+Tests the align_stream_to_grid() CORE algorithm (vectorized nearest-neighbor:
+uniform-grid bincount path, searchsorted path, tiled over the grid).
 """
 
 import pytest
 import pandas as pd
 import numpy as np
-from src.domain.htdam.stage3.alignStreamToGrid import align_stream_to_grid
+from src.domain.htdam.stage3.alignStreamToGrid import align_stream_to_grid, _TILE_ROWS
+
+
+def ts(*values, unit="ns"):
+    """Timestamp strings as a datetime64 array in the given unit."""
+    return np.array(values, dtype=f"datetime64[{unit}]")
 
 
 class TestAlignStreamToGrid:
@@ -15,208 +21,249 @@ class TestAlignStreamToGrid:
 
     def test_perfect_alignment(self):
         """Test stream perfectly aligned with grid"""
-        grid = pd.Series([
-            pd.Timestamp("2024-01-01 00:00:00"),
-            pd.Timestamp("2024-01-01 00:15:00"),
-            pd.Timestamp("2024-01-01 00:30:00"),
-        ])
-        stream_ts = pd.Series([
-            pd.Timestamp("2024-01-01 00:00:00"),
-            pd.Timestamp("2024-01-01 00:15:00"),
-            pd.Timestamp("2024-01-01 00:30:00"),
-        ])
+        grid = pd.Series(pd.to_datetime([
+            "2024-01-01 00:00:00",
+            "2024-01-01 00:15:00",
+            "2024-01-01 00:30:00",
+        ]))
+        stream_ts = pd.Series(pd.to_datetime([
+            "2024-01-01 00:00:00",
+            "2024-01-01 00:15:00",
+            "2024-01-01 00:30:00",
+        ]))
         stream_val = pd.Series([10.0, 20.0, 30.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert len(result) == 3
-        assert result["values"].tolist() == [10.0, 20.0, 30.0]
-        assert result["quality"].tolist() == ["EXACT", "EXACT", "EXACT"]
-        assert result["jitter"].tolist() == [0, 0, 0]
+
+        values, qualities, distances, stats = align_stream_to_grid(
+            stream_ts, stream_val, grid, tolerance_seconds=1800
+        )
+
+        assert len(values) == 3
+        assert values.tolist() == [10.0, 20.0, 30.0]
+        assert list(qualities) == ["EXACT", "EXACT", "EXACT"]
+        assert distances.tolist() == [0.0, 0.0, 0.0]
+        assert stats == {'mean_align_distance_s': 0.0, 'max_align_distance_s': 0.0}
 
     def test_close_alignment(self):
         """Test CLOSE quality (60-300 seconds jitter)"""
-        grid = pd.Series([
-            pd.Timestamp("2024-01-01 00:00:00"),
-            pd.Timestamp("2024-01-01 00:15:00"),
-        ])
-        stream_ts = pd.Series([
-            pd.Timestamp("2024-01-01 00:01:00"),  # 60s jitter
-            pd.Timestamp("2024-01-01 00:19:00"),  # 240s jitter
-        ])
-        stream_val = pd.Series([10.0, 20.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert result["values"].tolist() == [10.0, 20.0]
-        assert result["quality"].tolist() == ["CLOSE", "CLOSE"]
-        assert result["jitter"].tolist() == [60, 240]
+        grid = ts("2024-01-01T00:00:00", "2024-01-01T00:15:00")
+        stream_ts = ts("2024-01-01T00:01:00", "2024-01-01T00:19:00")  # 60s, 240s
+        stream_val = np.array([10.0, 20.0])
+
+        values, qualities, distances, stats = align_stream_to_grid(
+            stream_ts, stream_val, grid, tolerance_seconds=1800
+        )
+
+        assert values.tolist() == [10.0, 20.0]
+        assert list(qualities) == ["CLOSE", "CLOSE"]
+        assert distances.tolist() == [60.0, 240.0]
+        assert stats == {'mean_align_distance_s': 150.0, 'max_align_distance_s': 240.0}
 
     def test_interp_quality(self):
         """Test INTERP quality (300-1800 seconds jitter)"""
-        grid = pd.Series([
-            pd.Timestamp("2024-01-01 00:00:00"),
-        ])
-        stream_ts = pd.Series([
-            pd.Timestamp("2024-01-01 00:10:00"),  # 600s jitter
-        ])
-        stream_val = pd.Series([10.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert result["values"].iloc[0] == 10.0
-        assert result["quality"].iloc[0] == "INTERP"
-        assert result["jitter"].iloc[0] == 600
+        grid = ts("2024-01-01T00:00:00")
+        stream_ts = ts("2024-01-01T00:10:00")  # 600s jitter
+
+        values, qualities, distances, _ = align_stream_to_grid(
+            stream_ts, np.array([10.0]), grid, tolerance_seconds=1800
+        )
+
+        assert values[0] == 10.0
+        assert qualities[0] == "INTERP"
+        assert distances[0] == 600.0
 
     def test_missing_outside_tolerance(self):
         """Test MISSING when no sample within tolerance"""
-        grid = pd.Series([
-            pd.Timestamp("2024-01-01 00:00:00"),
-        ])
-        stream_ts = pd.Series([
-            pd.Timestamp("2024-01-01 01:00:00"),  # 3600s away (> 1800s tolerance)
-        ])
-        stream_val = pd.Series([10.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert pd.isna(result["values"].iloc[0])
-        assert result["quality"].iloc[0] == "MISSING"
-        assert pd.isna(result["jitter"].iloc[0])
+        grid = ts("2024-01-01T00:00:00")
+        stream_ts = ts("2024-01-01T01:00:00")  # 3600s away (> 1800s tolerance)
+
+        values, qualities, distances, stats = align_stream_to_grid(
+            stream_ts, np.array([10.0]), grid, tolerance_seconds=1800
+        )
+
+        assert np.isnan(values[0])
+        assert qualities[0] == "MISSING"
+        assert np.isnan(distances[0])
+        assert stats == {'mean_align_distance_s': 0.0, 'max_align_distance_s': 0.0}
 
     def test_sparse_stream(self):
         """Test sparse stream with gaps"""
-        grid = pd.Series([
-            pd.Timestamp("2024-01-01 00:00:00"),
-            pd.Timestamp("2024-01-01 00:15:00"),
-            pd.Timestamp("2024-01-01 00:30:00"),
-            pd.Timestamp("2024-01-01 00:45:00"),
-        ])
-        stream_ts = pd.Series([
-            pd.Timestamp("2024-01-01 00:00:00"),
-            pd.Timestamp("2024-01-01 00:45:00"),  # Missing 00:15, 00:30
-        ])
-        stream_val = pd.Series([10.0, 40.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert result["values"].iloc[0] == 10.0
-        assert pd.isna(result["values"].iloc[1])
-        assert pd.isna(result["values"].iloc[2])
-        assert result["values"].iloc[3] == 40.0
-        
-        assert result["quality"].tolist() == ["EXACT", "MISSING", "MISSING", "EXACT"]
+        grid = ts(
+            "2024-01-01T00:00:00", "2024-01-01T00:15:00",
+            "2024-01-01T00:30:00", "2024-01-01T00:45:00",
+        )
+        stream_ts = ts("2024-01-01T00:00:00", "2024-01-01T00:45:00")
+
+        values, qualities, _, _ = align_stream_to_grid(
+            stream_ts, np.array([10.0, 40.0]), grid, tolerance_seconds=600
+        )
+
+        assert values[0] == 10.0
+        assert np.isnan(values[1])
+        assert np.isnan(values[2])
+        assert values[3] == 40.0
+        assert list(qualities) == ["EXACT", "MISSING", "MISSING", "EXACT"]
 
     def test_dense_stream_multiple_candidates(self):
         """Test dense stream where multiple samples compete for same grid point"""
-        grid = pd.Series([
-            pd.Timestamp("2024-01-01 00:00:00"),
-        ])
-        stream_ts = pd.Series([
-            pd.Timestamp("2023-12-31 23:59:00"),  # 60s before
-            pd.Timestamp("2024-01-01 00:01:00"),  # 60s after
-        ])
-        stream_val = pd.Series([10.0, 20.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        # Should pick nearest (both 60s away, picks first)
-        assert result["values"].iloc[0] == 10.0
-        assert result["quality"].iloc[0] == "CLOSE"
+        grid = ts("2024-01-01T00:00:00")
+        stream_ts = ts("2023-12-31T23:59:00", "2024-01-01T00:01:00")  # 60s either side
+
+        values, qualities, _, _ = align_stream_to_grid(
+            stream_ts, np.array([10.0, 20.0]), grid, tolerance_seconds=1800
+        )
+
+        # Should pick nearest (both 60s away, ties go left)
+        assert values[0] == 10.0
+        assert qualities[0] == "CLOSE"
 
     def test_empty_stream(self):
         """Test empty stream"""
-        grid = pd.Series([
-            pd.Timestamp("2024-01-01 00:00:00"),
-            pd.Timestamp("2024-01-01 00:15:00"),
-        ])
-        stream_ts = pd.Series([], dtype="datetime64[ns]")
-        stream_val = pd.Series([], dtype=float)
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert len(result) == 2
-        assert pd.isna(result["values"]).all()
-        assert (result["quality"] == "MISSING").all()
-
-    def test_single_grid_point(self):
-        """Test with single grid point"""
-        grid = pd.Series([pd.Timestamp("2024-01-01 00:00:00")])
-        stream_ts = pd.Series([pd.Timestamp("2024-01-01 00:00:30")])
-        stream_val = pd.Series([42.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert len(result) == 1
-        assert result["values"].iloc[0] == 42.0
-        assert result["quality"].iloc[0] == "EXACT"
-
-    def test_returns_dataframe_with_correct_columns(self):
-        """Test output schema"""
-        grid = pd.Series([pd.Timestamp("2024-01-01 00:00:00")])
-        stream_ts = pd.Series([pd.Timestamp("2024-01-01 00:00:00")])
-        stream_val = pd.Series([10.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert isinstance(result, pd.DataFrame)
-        assert "values" in result.columns
-        assert "quality" in result.columns
-        assert "jitter" in result.columns
-        assert len(result.columns) == 3
-
-    def test_exact_quality_threshold(self):
-        """Test EXACT boundary (<60s)"""
-        grid = pd.Series([pd.Timestamp("2024-01-01 00:00:00")])
-        stream_ts = pd.Series([pd.Timestamp("2024-01-01 00:00:59")])  # 59s
-        stream_val = pd.Series([10.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert result["quality"].iloc[0] == "EXACT"
-        assert result["jitter"].iloc[0] == 59
-
-    def test_close_quality_lower_boundary(self):
-        """Test CLOSE lower boundary (60s)"""
-        grid = pd.Series([pd.Timestamp("2024-01-01 00:00:00")])
-        stream_ts = pd.Series([pd.Timestamp("2024-01-01 00:01:00")])  # 60s exactly
-        stream_val = pd.Series([10.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert result["quality"].iloc[0] == "CLOSE"
-        assert result["jitter"].iloc[0] == 60
-
-    def test_interp_quality_lower_boundary(self):
-        """Test INTERP lower boundary (300s)"""
-        grid = pd.Series([pd.Timestamp("2024-01-01 00:00:00")])
-        stream_ts = pd.Series([pd.Timestamp("2024-01-01 00:05:00")])  # 300s exactly
-        stream_val = pd.Series([10.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert result["quality"].iloc[0] == "INTERP"
-        assert result["jitter"].iloc[0] == 300
-
-    def test_tolerance_boundary(self):
-        """Test exactly at tolerance boundary"""
-        grid = pd.Series([pd.Timestamp("2024-01-01 00:00:00")])
-        stream_ts = pd.Series([pd.Timestamp("2024-01-01 00:30:00")])  # 1800s exactly
-        stream_val = pd.Series([10.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        # At boundary should be INTERP (≤ tolerance)
-        assert result["quality"].iloc[0] == "INTERP"
-        assert result["jitter"].iloc[0] == 1800
+        grid = ts("2024-01-01T00:00:00", "2024-01-01T00:15:00")
+        stream_ts = np.array([], dtype="datetime64[ns]")
+
+        values, qualities, distances, stats = align_stream_to_grid(
+            stream_ts, np.array([], dtype=float), grid, tolerance_seconds=1800
+        )
+
+        assert len(values) == 2
+        assert np.isnan(values).all()
+        assert list(qualities) == ["MISSING", "MISSING"]
+        assert np.isnan(distances).all()
+        assert stats == {'mean_align_distance_s': 0.0, 'max_align_distance_s': 0.0}
+
+    def test_returns_tuple_with_correct_types(self):
+        """Test output contract"""
+        grid = ts("2024-01-01T00:00:00")
+        stream_ts = ts("2024-01-01T00:00:00")
+
+        values, qualities, distances, stats = align_stream_to_grid(
+            stream_ts, np.array([10.0]), grid, tolerance_seconds=1800
+        )
+
+        assert values.dtype == np.float64
+        assert distances.dtype == np.float64
+        assert isinstance(qualities, pd.Categorical)
+        assert qualities.ordered
+        assert list(qualities.categories) == ["MISSING", "INTERP", "CLOSE", "EXACT"]
+        assert qualities.codes.dtype == np.int8
+        assert set(stats) == {'mean_align_distance_s', 'max_align_distance_s'}
+
+    @pytest.mark.parametrize("offset, expected", [
+        ("00:00:59", "EXACT"),   # < 60s
+        ("00:01:00", "CLOSE"),   # 60s exactly
+        ("00:05:00", "INTERP"),  # 300s exactly
+        ("00:30:00", "INTERP"),  # 1800s exactly: at tolerance (≤)
+    ])
+    def test_quality_boundaries(self, offset, expected):
+        """Test EXACT/CLOSE/INTERP boundaries and the tolerance edge"""
+        grid = ts("2024-01-01T00:00:00")
+        stream_ts = ts(f"2024-01-01T{offset}")
+
+        values, qualities, distances, _ = align_stream_to_grid(
+            stream_ts, np.array([10.0]), grid, tolerance_seconds=1800
+        )
+
+        assert values[0] == 10.0
+        assert qualities[0] == expected
+        assert distances[0] == pd.Timedelta(offset).total_seconds()
 
     def test_negative_jitter_handled(self):
         """Test that timestamps before grid point work correctly"""
-        grid = pd.Series([pd.Timestamp("2024-01-01 00:15:00")])
-        stream_ts = pd.Series([pd.Timestamp("2024-01-01 00:14:00")])  # 60s before
-        stream_val = pd.Series([10.0])
-        
-        result = align_stream_to_grid(grid, stream_ts, stream_val, tolerance_seconds=1800)
-        
-        assert result["values"].iloc[0] == 10.0
-        assert result["jitter"].iloc[0] == 60  # Absolute value
+        grid = ts("2024-01-01T00:15:00")
+        stream_ts = ts("2024-01-01T00:14:00")  # 60s before
+
+        values, _, distances, _ = align_stream_to_grid(
+            stream_ts, np.array([10.0]), grid, tolerance_seconds=1800
+        )
+
+        assert values[0] == 10.0
+        assert distances[0] == 60.0  # Absolute value
+
+
+class TestAlignStreamToGridPaths:
+    """Uniform vs binary-search paths, tiling, and timestamp units"""
+
+    @staticmethod
+    def _irregular_stream(n_grid, step_s=900, seed=0):
+        """Jittered raw stream with dropouts around a uniform grid"""
+        rng = np.random.default_rng(seed)
+        grid = np.datetime64("2024-01-01T00:00:00", "ns") + np.arange(n_grid) * np.timedelta64(step_s, "s")
+        jitter_s = rng.integers(-700, 700, size=n_grid)
+        keep = rng.random(n_grid) > 0.2
+        raw = np.sort(grid[keep] + jitter_s[keep].astype("timedelta64[s]"))
+        return grid, raw, rng.normal(size=raw.size)
+
+    def test_uniform_path_matches_binary_search(self):
+        """step_seconds (bincount) path gives the same result as searchsorted"""
+        grid, raw, vals = self._irregular_stream(2_000)
+
+        uniform = align_stream_to_grid(raw, vals, grid, 1800, step_seconds=900)
+        search = align_stream_to_grid(raw, vals, grid, 1800)
+
+        np.testing.assert_array_equal(uniform[0], search[0])
+        np.testing.assert_array_equal(uniform[1].codes, search[1].codes)
+        np.testing.assert_array_equal(uniform[2], search[2])
+        assert uniform[3] == search[3]
+        assert set(search[1]) == {"EXACT", "CLOSE", "INTERP", "MISSING"}
+
+    def test_non_uniform_grid(self):
+        """Irregular grid spacing uses the binary-search path"""
+        grid = ts("2024-01-01T00:00:00", "2024-01-01T00:07:00", "2024-01-01T01:00:00")
+        stream_ts = ts("2024-01-01T00:00:30", "2024-01-01T00:09:00", "2024-01-01T00:59:00")
+
+        values, qualities, distances, _ = align_stream_to_grid(
+            stream_ts, np.array([1.0, 2.0, 3.0]), grid, tolerance_seconds=1800
+        )
+
+        assert values.tolist() == [1.0, 2.0, 3.0]
+        assert list(qualities) == ["EXACT", "CLOSE", "CLOSE"]
+        assert distances.tolist() == [30.0, 120.0, 60.0]
+
+    @pytest.mark.parametrize("step_seconds", [None, 900])
+    def test_grid_longer_than_one_tile(self, step_seconds):
+        """Results across tile boundaries match a single nearest-neighbor pass"""
+        n_grid = _TILE_ROWS + 5_000
+        grid, raw, vals = self._irregular_stream(n_grid, seed=1)
+
+        values, qualities, distances, stats = align_stream_to_grid(
+            raw, vals, grid, 1800, step_seconds=step_seconds
+        )
+
+        # Reference: nearest raw point per grid row, ties to the left
+        g = grid.astype(np.int64)
+        r = raw.astype(np.int64)
+        j = np.searchsorted(r, g, side="right")
+        dl = np.where(j > 0, g - r[np.maximum(j - 1, 0)], np.iinfo(np.int64).max)
+        dr = np.where(j < r.size, r[np.minimum(j, r.size - 1)] - g, np.iinfo(np.int64).max)
+        best = np.where(dl <= dr, np.maximum(j - 1, 0), np.minimum(j, r.size - 1))
+        dist = np.minimum(dl, dr)
+        ok = dist <= 1800 * 10**9
+
+        assert len(values) == n_grid
+        np.testing.assert_array_equal(values, np.where(ok, vals[best], np.nan))
+        np.testing.assert_array_equal(distances, np.where(ok, dist / 1e9, np.nan))
+        assert (qualities == "MISSING").sum() == (~ok).sum()
+        assert stats['max_align_distance_s'] == dist[ok].max() / 1e9
+        assert stats['mean_align_distance_s'] == pytest.approx(dist[ok].mean() / 1e9)
+
+    @pytest.mark.parametrize("raw_unit, grid_unit", [
+        ("s", "ns"), ("us", "ns"), ("ns", "s"), ("s", "us"), ("s", "s"),
+    ])
+    @pytest.mark.parametrize("step_seconds", [None, 900])
+    def test_non_ns_timestamp_units(self, raw_unit, grid_unit, step_seconds):
+        """datetime64[s]/[us] inputs align the same as datetime64[ns]"""
+        grid = ts("2024-01-01T00:00:00", "2024-01-01T00:15:00", "2024-01-01T00:30:00")
+        stream_ts = ts("2024-01-01T00:00:30", "2024-01-01T00:17:00", "2024-01-01T00:40:00")
+        stream_val = np.array([1.0, 2.0, 3.0])
+
+        expected = align_stream_to_grid(stream_ts, stream_val, grid, 1800, step_seconds)
+        result = align_stream_to_grid(
+            stream_ts.astype(f"datetime64[{raw_unit}]"), stream_val,
+            grid.astype(f"datetime64[{grid_unit}]"), 1800, step_seconds
+        )
+
+        assert list(expected[1]) == ["EXACT", "CLOSE", "INTERP"]
+        np.testing.assert_array_equal(result[0], expected[0])
+        assert list(result[1]) == list(expected[1])
+        np.testing.assert_array_equal(result[2], expected[2])
+        assert result[3] == expected[3]
@@ -3,13 +3,18 @@ Unit tests for Stage 3 helper functions:
 - getAlignmentConfidence.py
 - computeCoveragePenalty.py
 - deriveRowGapTypeAndConfidence.py
+- deriveRowGapTypesAndConfidences.py
+- lookupStage2Semantics.py
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 from src.domain.htdam.stage3.getAlignmentConfidence import get_alignment_confidence
 from src.domain.htdam.stage3.computeCoveragePenalty import compute_coverage_penalty
 from src.domain.htdam.stage3.deriveRowGapTypeAndConfidence import derive_row_gap_type_and_confidence
+from src.domain.htdam.stage3.deriveRowGapTypesAndConfidences import derive_row_gap_types_and_confidences
+from src.domain.htdam.stage3.lookupStage2Semantics import lookup_stage2_semantics
 
 
 class TestGetAlignmentConfidence:
@@ -269,3 +274,129 @@ class TestDeriveRowGapTypeAndConfidence:
         # Exclusion takes priority
         assert result["gap_type"] == "EXCLUDED"
         assert result["row_confidence"] == 0.0
+
+
+class TestDeriveRowGapTypesAndConfidences:
+    """Test suite for derive_row_gap_types_and_confidences()"""
+
+    def test_valid_rows_take_minimum_confidence(self):
+        """Test VALID rows use the worst mandatory stream quality"""
+        gap_types, confidences = derive_row_gap_types_and_confidences(
+            {
+                'CHWST': np.array(['EXACT', 'EXACT']),
+                'CHWRT': np.array(['EXACT', 'INTERP']),
+                'CDWRT': np.array(['EXACT', 'CLOSE']),
+            },
+            np.array([None, None], dtype=object)
+        )
+
+        assert list(gap_types) == ['VALID', 'VALID']
+        assert list(confidences) == [0.95, 0.85]
+
+    def test_missing_mandatory_uses_stage2_semantic(self):
+        """Test missing mandatory rows pick up Stage 2 semantic, else GAP"""
+        gap_types, confidences = derive_row_gap_types_and_confidences(
+            {
+                'CHWST': np.array(['MISSING', 'MISSING', 'EXACT']),
+                'CHWRT': np.array(['EXACT', 'EXACT', 'EXACT']),
+                'CDWRT': np.array(['EXACT', 'EXACT', 'EXACT']),
+            },
+            np.array([None, None, None], dtype=object),
+            np.array(['COV_CONSTANT', None, 'SENSOR_ANOMALY'], dtype=object)
+        )
+
+        assert list(gap_types) == ['COV_CONSTANT', 'GAP', 'VALID']
+        assert list(confidences) == [0.0, 0.0, 0.95]
+
+    def test_absent_mandatory_stream_is_missing(self):
+        """Test a mandatory stream absent from the dict counts as MISSING"""
+        gap_types, confidences = derive_row_gap_types_and_confidences(
+            {
+                'CHWST': np.array(['EXACT']),
+                'CHWRT': np.array(['EXACT']),
+                'FLOW': np.array(['EXACT']),
+            },
+            np.array([None], dtype=object)
+        )
+
+        assert list(gap_types) == ['GAP']
+        assert list(confidences) == [0.0]
+
+    def test_exclusion_overrides_everything(self):
+        """Test exclusion takes priority over missing and VALID rows"""
+        gap_types, confidences = derive_row_gap_types_and_confidences(
+            {
+                'CHWST': np.array(['EXACT', 'MISSING']),
+                'CHWRT': np.array(['EXACT', 'EXACT']),
+                'CDWRT': np.array(['EXACT', 'EXACT']),
+            },
+            np.array(['EXW_001', 'EXW_001'], dtype=object),
+            np.array([None, 'COV_MINOR'], dtype=object)
+        )
+
+        assert list(gap_types) == ['EXCLUDED', 'EXCLUDED']
+        assert list(confidences) == [0.0, 0.0]
+
+    def test_matches_scalar_function(self):
+        """Test vectorized result agrees with the per-row function"""
+        qualities = ['EXACT', 'CLOSE', 'INTERP', 'MISSING']
+        semantics = [None, 'COV_CONSTANT', 'COV_MINOR', 'SENSOR_ANOMALY']
+        rows = [
+            (a, b, c, excl, sem)
+            for a in qualities for b in qualities for c in qualities
+            for excl in (None, 'EXW_001') for sem in semantics
+        ]
+        align_qualities = {
+            'CHWST': np.array([r[0] for r in rows]),
+            'CHWRT': np.array([r[1] for r in rows]),
+            'CDWRT': np.array([r[2] for r in rows]),
+        }
+        exclusion_ids = np.array([r[3] for r in rows], dtype=object)
+        stage2_semantics = np.array([r[4] for r in rows], dtype=object)
+
+        gap_types, confidences = derive_row_gap_types_and_confidences(
+            align_qualities, exclusion_ids, stage2_semantics
+        )
+
+        for k, (a, b, c, excl, sem) in enumerate(rows):
+            expected = derive_row_gap_type_and_confidence(
+                {'CHWST': a, 'CHWRT': b, 'CDWRT': c}, excl, sem
+            )
+            assert (gap_types[k], confidences[k]) == expected
+
+
+class TestLookupStage2Semantics:
+    """Test suite for lookup_stage2_semantics()"""
+
+    def test_grid_inside_gap_takes_semantic_of_next_record(self):
+        """Test grid points inside a gap get the gap_before_semantic after it"""
+        grid = pd.date_range('2024-01-01 00:00', periods=5, freq='15min')
+        timestamps = pd.to_datetime(['2024-01-01 00:00', '2024-01-01 01:00']).to_numpy()
+        semantics = np.array(['N/A', 'COV_CONSTANT'], dtype=object)
+
+        result = lookup_stage2_semantics(grid, timestamps, semantics)
+
+        assert list(result) == ['N/A', 'COV_CONSTANT', 'COV_CONSTANT', 'COV_CONSTANT', 'COV_CONSTANT']
+
+    def test_grid_after_last_record_is_none(self):
+        """Test grid points past the last raw record have no semantic"""
+        grid = pd.date_range('2024-01-01 00:00', periods=3, freq='15min')
+        timestamps = pd.to_datetime(['2024-01-01 00:00']).to_numpy()
+        semantics = np.array([None], dtype=object)
+
+        result = lookup_stage2_semantics(grid, timestamps, semantics)
+
+        assert list(result) == [None, None, None]
+
+    @pytest.mark.parametrize("raw_unit", ["s", "us", "ns"])
+    def test_mixed_timestamp_units(self, raw_unit):
+        """Test datetime64[s]/[us] raw timestamps join against an ns grid"""
+        grid = pd.date_range('2024-01-01 00:00', periods=4, freq='15min')
+        timestamps = np.array(
+            ['2024-01-01T00:10', '2024-01-01T00:40'], dtype=f'datetime64[{raw_unit}]'
+        )
+        semantics = np.array(['GAP_A', 'GAP_B'], dtype=object)
+
+        result = lookup_stage2_semantics(grid, timestamps, semantics)
+
+        assert list(result) == ['GAP_A', 'GAP_B', 'GAP_B', None]